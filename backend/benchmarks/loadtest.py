@@ -0,0 +1,386 @@
+# benchmarks/loadtest.py
+"""
+Load test ispitnog roka nad FastAPI aplikacijom iz main.py (bez mreže, httpx ASGITransport)
+Pravi skup podataka (profesori, predmeti, ispiti, studenti, ranije prijave), pa
+pokreće scenarije: login storm, nalet prijava ispita, masovni unos ocena i
+osvežavanje stranica sa ocenama. Za svaki scenario: propusnost, p50/p95/p99 i
+broj SQL naredbi po zahtevu (iz query profiler-a).
+
+Baza: privremeni SQLite. Druga baza samo preko --database-url (skripta je briše i
+puni!) - DATABASE_URL iz okruženja se namerno ne koristi.
+Pokreni iz backend/ sa:
+    python benchmarks/loadtest.py --students 2000 --save benchmarks/baselines/local.json
+    python benchmarks/loadtest.py --compare benchmarks/baselines/local.json
+Izlazni kod 1 ako je neki scenario lošiji od baseline-a preko --tolerance.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def database_url() -> str:
+    """Baza za load test: --database-url ili privremeni SQLite (čita se pre importa config-a)"""
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--database-url")
+    known, _ = pre.parse_known_args()
+    return known.database_url or f"sqlite:///{tempfile.gettempdir()}/school_loadtest.db"
+
+
+os.environ["DATABASE_URL"] = database_url()
+# Svi zahtevi dolaze sa iste adrese - rate limit po IP-u bi merio limiter, a ne aplikaciju
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Aplikacija radi u ovom procesu - verzije u memoriji važe, pa je uslovni GET (304) uključen
+os.environ.setdefault("SINGLE_PROCESS", "true")
+
+import httpx
+from sqlalchemy import insert, select, delete
+from alembic import command
+from alembic.config import Config
+from main import app
+from database import engine, SessionLocal, Base
+from models import Professor, Student, Subject, Exam, ExamRegistration
+from models.enums import ExamType, ExamStatus
+from services import hash_password, rebuild_transcripts
+from services.catalog_cache import catalog_cache
+from middleware import query_stats
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+DEPARTMENTS = ["IT", "EE", "ME"]
+PASSWORD = "password123"
+
+
+def generate_dataset(args, rng: random.Random) -> dict:
+    """Briše i puni bazu; vraća podatke potrebne scenarijima"""
+    command.upgrade(Config(ALEMBIC_INI), "head")
+    with SessionLocal() as db:
+        for table in reversed(Base.metadata.sorted_tables):
+            db.execute(delete(table))
+        db.commit()
+
+        # Jedan bcrypt hash za sve profesore - generisanje ne treba da traje kao login storm
+        password_hash = hash_password(PASSWORD)
+        db.execute(insert(Professor), [
+            {"name": f"Profesor {i}", "username": f"prof{i}", "email": f"prof{i}@school.test",
+             "password": password_hash, "subject": f"Predmet {i}"}
+            for i in range(args.professors)
+        ])
+        professor_ids = db.execute(select(Professor.id).order_by(Professor.id)).scalars().all()
+
+        db.execute(insert(Subject), [
+            {"name": f"Predmet {p}-{s}", "espb": rng.choice([4, 6, 8]), "professor_id": professor_id,
+             "year": rng.randint(1, 4), "department": rng.choice(DEPARTMENTS)}
+            for p, professor_id in enumerate(professor_ids)
+            for s in range(args.subjects_per_professor)
+        ])
+        subjects = db.execute(select(Subject.id, Subject.professor_id, Subject.year, Subject.department)).all()
+
+        first_day = date.today() + timedelta(days=30)
+        db.execute(insert(Exam), [
+            {"subject_id": subject.id, "date": first_day + timedelta(days=rng.randint(0, 20)),
+             "type": rng.choice(list(ExamType))}
+            for subject in subjects
+            for _ in range(args.exams_per_subject)
+        ])
+        exams = db.execute(select(Exam.id, Exam.subject_id)).all()
+
+        db.execute(insert(Student), [
+            {"name": f"Student {i}", "username": f"student{i}", "email": f"student{i}@school.test",
+             "index_number": f"IDX-{i:06d}", "age_of_study": rng.randint(1, 4), "department": rng.choice(DEPARTMENTS)}
+            for i in range(args.students)
+        ])
+        students = db.execute(select(Student.id, Student.username, Student.index_number,
+                                     Student.age_of_study, Student.department)).all()
+
+        # Ranije položeni ispiti (istorija za ocene i transkript)
+        exams_by_subject = {}
+        for exam in exams:
+            exams_by_subject.setdefault(exam.subject_id, []).append(exam.id)
+        subject_info = {subject.id: subject for subject in subjects}
+        history, eligible = [], {}
+        for student in students:
+            visible = [
+                s.id for s in subjects
+                if (s.department == student.department) and (s.year is None or s.year <= student.age_of_study)
+            ]
+            rng.shuffle(visible)
+            passed = visible[:args.history_per_student]
+            for subject_id in passed:
+                history.append({
+                    "student_id": student.id, "exam_id": exams_by_subject[subject_id][0], "num_of_applications": 1,
+                    "grade": rng.randint(6, 10), "points": rng.randint(51, 100), "status": ExamStatus.polozio,
+                })
+            eligible[student.id] = [
+                exam_id for subject_id in visible[args.history_per_student:]
+                for exam_id in exams_by_subject[subject_id][1:] or exams_by_subject[subject_id]
+            ]
+        if history:
+            db.execute(insert(ExamRegistration), history)
+        db.commit()
+        rebuild_transcripts(db)
+
+    catalog_cache.invalidate()
+    return {
+        "professors": [f"prof{i}" for i in range(args.professors)],
+        "students": students,
+        "eligible": eligible,
+        "exams_by_professor": {
+            professor_id: [e.id for e in exams if subject_info[e.subject_id].professor_id == professor_id]
+            for professor_id in professor_ids
+        },
+        "professor_ids": professor_ids,
+    }
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Scenario:
+    """Rezultati jednog scenarija: latencije, statusi i SQL naredbe po ruti"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: list[float] = []
+        self.statuses: dict[int, int] = {}
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies.append(time.perf_counter() - started)
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+    def report(self, query_snapshot: dict) -> dict:
+        requests = sum(stats["requests"] for stats in query_snapshot.values())
+        statements = sum(stats["statements"] for stats in query_snapshot.values())
+        return {
+            "requests": len(self.latencies),
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "seconds": round(self.elapsed, 3),
+            "throughput_rps": round(len(self.latencies) / self.elapsed, 1) if self.elapsed else 0.0,
+            "p50_ms": round(percentile(self.latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 0.99) * 1000, 2),
+            "statements_per_request": round(statements / requests, 2) if requests else 0.0,
+            "statements_by_route": {route: stats["avg_statements"] for route, stats in query_snapshot.items()},
+        }
+
+
+async def run_all(client, tasks, concurrency: int) -> None:
+    """Pokreće korutine sa ograničenim brojem istovremenih"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(task):
+        async with semaphore:
+            return await task
+
+    await asyncio.gather(*(limited(task) for task in tasks))
+
+
+async def login_storm(client, data, args, scenario: Scenario, state: dict) -> None:
+    async def professor(username):
+        response = await scenario.request(client, "POST", "/login", json={"username": username, "password": PASSWORD})
+        if response.status_code == 200:
+            state["professor_tokens"][response.json()["user_id"]] = response.json()["access_token"]
+
+    async def student(row):
+        response = await scenario.request(
+            client, "POST", "/students/login", json={"username": row.username, "index_number": row.index_number}
+        )
+        if response.status_code == 200:
+            state["student_tokens"][row.id] = response.json()["access_token"]
+
+    tasks = [professor(username) for username in data["professors"]]
+    tasks += [student(row) for row in data["students"]]
+    await run_all(client, tasks, args.concurrency)
+
+
+async def registration_burst(client, data, args, scenario: Scenario, state: dict) -> None:
+    rng = random.Random(args.seed + 1)
+
+    async def register(student_id, exam_id):
+        token = state["student_tokens"][student_id]
+        await scenario.request(
+            client, "POST", "/exam-registrations/student",
+            json={"exam_id": exam_id}, headers={"Authorization": f"Bearer {token}"}
+        )
+
+    tasks = []
+    for student_id, exams in data["eligible"].items():
+        if student_id in state["student_tokens"] and exams:
+            for exam_id in rng.sample(exams, min(args.registrations_per_student, len(exams))):
+                tasks.append(register(student_id, exam_id))
+    rng.shuffle(tasks)
+    await run_all(client, tasks, args.concurrency)
+
+
+async def bulk_grading(client, data, args, scenario: Scenario, state: dict) -> None:
+    rng = random.Random(args.seed + 2)
+
+    async def grade(professor_id, exam_id):
+        headers = {"Authorization": f"Bearer {state['professor_tokens'][professor_id]}"}
+        response = await scenario.request(client, "GET", f"/exam-registrations/exam/{exam_id}", headers=headers)
+        pending = [r["id"] for r in response.json() if r["status"] == ExamStatus.prijavljen.value]
+        if not pending:
+            return
+        grades = {}
+        for registration_id in pending:
+            points = rng.randint(20, 100)
+            passed = points > 50
+            grades[registration_id] = {
+                "grade": min(10, 5 + (points - 41) // 10) if passed else 5,
+                "points": points,
+                "status": (ExamStatus.polozio if passed else ExamStatus.pao).value,
+            }
+        await scenario.request(client, "PUT", f"/exam-registrations/exam/{exam_id}/grades", json=grades, headers=headers)
+
+    tasks = [
+        grade(professor_id, exam_id)
+        for professor_id, exams in data["exams_by_professor"].items()
+        if professor_id in state["professor_tokens"]
+        for exam_id in exams
+    ]
+    await run_all(client, tasks, args.concurrency)
+
+
+async def grade_refresh(client, data, args, scenario: Scenario, state: dict) -> None:
+    """Studenti osvežavaju dashboard; drugi put šalju If-None-Match kao browser"""
+    urls = ["/students/grades", "/students/transcript", "/exam-registrations/student", "/exams/student"]
+
+    async def refresh(token):
+        headers = {"Authorization": f"Bearer {token}"}
+        etags = {}
+        for _ in range(args.refreshes):
+            for url in urls:
+                conditional = {**headers, "If-None-Match": etags[url]} if url in etags else headers
+                response = await scenario.request(client, "GET", url, headers=conditional)
+                if "etag" in response.headers:
+                    etags[url] = response.headers["etag"]
+
+    await run_all(client, [refresh(token) for token in state["student_tokens"].values()], args.concurrency)
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "registration_burst": registration_burst,
+    "bulk_grading": bulk_grading,
+    "grade_refresh": grade_refresh,
+}
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    data = generate_dataset(args, rng)
+    print(f"📦 Podaci: {args.students} studenata, {args.professors} profesora "
+          f"({time.perf_counter() - started:.1f}s)")
+
+    state = {"professor_tokens": {}, "student_tokens": {}}
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        for name in args.scenarios:
+            scenario = Scenario(name)
+            query_stats.reset()
+            scenario.started = time.perf_counter()
+            await SCENARIOS[name](client, data, args, scenario, state)
+            scenario.elapsed = time.perf_counter() - scenario.started
+            results[name] = scenario.report(query_stats.snapshot())
+            r = results[name]
+            print(f"  {name:<20} {r['requests']:>6} req  {r['throughput_rps']:>8} req/s  "
+                  f"p50 {r['p50_ms']:>7} ms  p95 {r['p95_ms']:>7} ms  p99 {r['p99_ms']:>7} ms  "
+                  f"{r['statements_per_request']:>5} SQL/req  {r['statuses']}")
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Lista regresija: sporiji p95, manja propusnost ili više SQL naredbi po zahtevu"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        # Broj naredbi ne zavisi od mašine, ali konkurentnost (keš promašaji) daje mali šum
+        if current["statements_per_request"] > previous["statements_per_request"] * 1.05 + 0.01:
+            regressions.append(
+                f"{name}: SQL/req {previous['statements_per_request']} -> {current['statements_per_request']}"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test ispitnog roka")
+    parser.add_argument("--database-url", help="Posebna baza koju skripta BRIŠE i puni (podrazumevano privremeni SQLite)")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--professors", type=int, default=20)
+    parser.add_argument("--subjects-per-professor", type=int, default=3)
+    parser.add_argument("--exams-per-subject", type=int, default=2)
+    parser.add_argument("--history-per-student", type=int, default=3)
+    parser.add_argument("--registrations-per-student", type=int, default=3)
+    parser.add_argument("--refreshes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--save", help="Sačuvaj rezultate kao JSON baseline")
+    parser.add_argument("--compare", help="Uporedi sa JSON baseline-om")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Dozvoljeno pogoršanje (0.25 = 25%%)")
+    args = parser.parse_args()
+    if "login_storm" not in args.scenarios:
+        parser.error("login_storm je obavezan - ostali scenariji koriste njegove tokene")
+
+    print(f"🗄️  Baza: {engine.url.render_as_string(hide_password=True)}")
+    results = asyncio.run(run(args))
+    output = {
+        "commit": git_commit(),
+        "database": engine.dialect.name,
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("save", "compare", "tolerance")},
+        "scenarios": results,
+    }
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"💾 Baseline sačuvan: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("parameters") != output["parameters"] or baseline.get("database") != output["database"]:
+            print("⚠️  Parametri ili baza se razlikuju od baseline-a - poređenje nije pouzdano")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            return 1
+        print(f"✅ Bez regresija u odnosu na {args.compare} ({baseline.get('commit') or '?'})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# benchmarks/metrics_overhead.py
+"""
+Cena MetricsMiddleware-a po zahtevu (mikrosekunde)
+Poredi prazan ASGI app sa i bez middleware-a, bez mreže i bez FastAPI-ja,
+pa razlika je čisto trošak merenja (perf_counter, histogram, brojači, gauge).
+Pokreni iz backend/ sa: python benchmarks/metrics_overhead.py [broj_zahteva]
+"""
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# config zahteva DATABASE_URL; benchmark ne otvara bazu
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/metrics_bench.db")
+
+from middleware.metrics import MetricsMiddleware, http_latency
+
+
+class _Route:
+    path = "/exams/{exam_id}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    return None
+
+
+async def run(app, count: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/exams/1"}
+    started = time.perf_counter()
+    for _ in range(count):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - started
+
+
+def main(count: int) -> None:
+    instrumented = MetricsMiddleware(bare_app)
+    # Zagrevanje (prvi zapis labela pravi bucket-e)
+    asyncio.run(run(instrumented, 1000))
+
+    bare = min(asyncio.run(run(bare_app, count)) for _ in range(3))
+    measured = min(asyncio.run(run(instrumented, count)) for _ in range(3))
+    overhead_us = (measured - bare) / count * 1e6
+    print(f"zahteva:             {count}")
+    print(f"bez middleware-a:    {bare / count * 1e6:.2f} µs/zahtev")
+    print(f"sa MetricsMiddleware: {measured / count * 1e6:.2f} µs/zahtev")
+    print(f"trošak merenja:      {overhead_us:.2f} µs/zahtev")
+
+    started = time.perf_counter()
+    for _ in range(count):
+        http_latency.observe(0.012, "GET", "/exams/{exam_id}")
+    print(f"Histogram.observe:   {(time.perf_counter() - started) / count * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,118 @@
+# check_indexes.py
+"""
+EXPLAIN provera da vrući upiti ruta koriste indekse
+Radi nad PostgreSQL-om (EXPLAIN FORMAT JSON, enable_seqscan=off) ili SQLite-om
+(EXPLAIN QUERY PLAN). Baza mora biti migrirana: alembic upgrade head
+Pokreni sa: python check_indexes.py   (izlazni kod 1 ako neki upit ne koristi indeks)
+"""
+import sys
+import json
+from sqlalchemy import select, text
+from database import engine
+from models import Subject, Exam, ExamRegistration, TranscriptEntry
+from services.principal_cache import StudentPrincipal
+from services.validation import student_subject_filters
+from services.registration import REGISTRATION_COLUMNS
+
+# Student za katalog upite (vrednosti nisu bitne, bitan je oblik upita)
+SAMPLE_STUDENT = StudentPrincipal(
+    id=1, name="", username="", email="", index_number="", age_of_study=2, department="IT"
+)
+
+# (naziv, upit, indeksi koje plan mora da koristi)
+HOT_QUERIES = [
+    (
+        "GET /exam-registrations/student",
+        select(ExamRegistration).where(ExamRegistration.student_id == 1),
+        {"ux_exams_registrations_student_exam"},
+    ),
+    (
+        "GET /exam-registrations/exam/{id}",
+        select(ExamRegistration).where(ExamRegistration.exam_id == 1),
+        {"ix_exams_registrations_exam_id"},
+    ),
+    (
+        "GET /exams (profesor)",
+        select(Exam.id, Exam.subject_id, Exam.date, Exam.type)
+        .join(Subject, Exam.subject_id == Subject.id)
+        .where(Subject.professor_id == 1),
+        {"ix_subjects_professor_id", "ix_exams_subject_id_date"},
+    ),
+    (
+        "GET /exam-registrations (profesor)",
+        select(*REGISTRATION_COLUMNS)
+        .join(Exam, ExamRegistration.exam_id == Exam.id)
+        .join(Subject, Exam.subject_id == Subject.id)
+        .where(Subject.professor_id == 1),
+        {"ix_subjects_professor_id", "ix_exams_subject_id_date", "ix_exams_registrations_exam_id"},
+    ),
+    (
+        "GET /subjects/student",
+        select(Subject).where(*student_subject_filters(SAMPLE_STUDENT)),
+        {"ix_subjects_department_year"},
+    ),
+    (
+        "POST /exam-registrations/student (preduslovi)",
+        select(TranscriptEntry.subject_id).where(TranscriptEntry.student_id == 1),
+        {"ux_transcript_entries_student_subject"},
+    ),
+]
+
+
+def _sql(connection, statement) -> str:
+    return str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _postgres_indexes(connection, statement) -> set:
+    """Imena indeksa iz EXPLAIN (FORMAT JSON) plana"""
+    # Na malim tabelama planer bira seq scan; ovde proveravamo da indeks MOŽE da posluži upit
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = connection.execute(text("EXPLAIN (FORMAT JSON) " + _sql(connection, statement))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    found = set()
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            found.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def _sqlite_indexes(connection, statement) -> set:
+    """Imena indeksa iz EXPLAIN QUERY PLAN izlaza"""
+    rows = connection.execute(text("EXPLAIN QUERY PLAN " + _sql(connection, statement))).all()
+    found = set()
+    for row in rows:
+        detail = row[-1]
+        for marker in ("USING INDEX ", "USING COVERING INDEX "):
+            if marker in detail:
+                found.add(detail.split(marker, 1)[1].split(" ", 1)[0])
+    return found
+
+
+def check_indexes(bind=engine) -> list:
+    """Vraća listu (naziv, indeksi koji nedostaju u planu) za upite koji ne koriste indekse"""
+    failures = []
+    with bind.connect() as connection:
+        explain = _postgres_indexes if connection.dialect.name == "postgresql" else _sqlite_indexes
+        for name, statement, expected in HOT_QUERIES:
+            with connection.begin():
+                used = explain(connection, statement)
+            missing = expected - used
+            if missing:
+                failures.append((name, missing))
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_indexes()
+    for name, _statement, expected in HOT_QUERIES:
+        missing = dict(failures).get(name)
+        if missing:
+            print(f"❌ {name:<40} ne koristi: {', '.join(sorted(missing))}")
+        else:
+            print(f"✅ {name:<40} {', '.join(sorted(expected))}")
+    sys.exit(1 if failures else 0)
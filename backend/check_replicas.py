@@ -0,0 +1,117 @@
+# check_replicas.py
+"""
+Provera rutiranja čitanja na read repliku nad dve lokalne SQLite baze
+Primarna baza se migrira i puni, replika je njena kopija sa jednim predmetom
+viška (tako se vidi odakle je čitanje došlo). Svaki scenario radi u novom
+procesu (DATABASE_REPLICA_URLS se čita pri importu):
+- zdrava replika: čitanja idu na repliku, GET rute vraćaju 200,
+- nedostupna replika: već prvi GET vraća 200 sa primarne baze, replika je isključena.
+Pokreni sa: python check_replicas.py   (izlazni kod 1 ako neka provera ne prođe)
+"""
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+REPLICA_ONLY = "Samo na replici"
+
+SETUP = """
+from alembic import command
+from alembic.config import Config
+from database import SessionLocal
+from models import Professor, Subject, Exam, Student, ExamRegistration
+from models.enums import ExamType
+from datetime import date
+command.upgrade(Config("alembic.ini"), "head")
+with SessionLocal() as db:
+    db.add(Professor(name="Profesor", username="prof", email="prof@school.test", password="-", subject="Baze"))
+    db.add(Subject(name="Baze podataka", espb=6, professor_id=1, year=1, department="IT"))
+    db.add(Exam(subject_id=1, date=date(2026, 6, 1), type=ExamType.pismeni))
+    db.add(Student(name="Student", username="stud", email="stud@school.test", index_number="IT-1",
+                   age_of_study=1, department="IT"))
+    db.flush()
+    db.add(ExamRegistration(student_id=1, exam_id=1))
+    db.commit()
+"""
+
+PROBE = """
+import sys, json
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from main import app
+from database import SessionLocal, replica_router
+from models import Subject
+from services import create_access_token
+
+token = create_access_token(data={"sub": "prof", "id": 1, "role": "professor"})
+client = TestClient(app)
+statuses = [
+    client.get("/exam-registrations", headers={"Authorization": f"Bearer {token}"}).status_code
+    for _ in range(3)
+]
+with SessionLocal() as db:
+    db.info["read_only"] = True
+    names = db.execute(select(Subject.name).order_by(Subject.id)).scalars().all()
+json.dump({"statuses": statuses, "names": names, **replica_router.snapshot()}, sys.stderr)
+"""
+
+
+def run(code: str, env: dict) -> str:
+    """Kod u novom procesu; vraća stderr (poslednja linija proba je JSON rezultat)"""
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env={**os.environ, **env}, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        print(completed.stderr)
+        sys.exit(1)
+    return completed.stderr
+
+
+def probe(env: dict) -> dict:
+    return json.loads(run(PROBE, env).strip().splitlines()[-1])
+
+
+def main() -> int:
+    workdir = tempfile.mkdtemp(prefix="replicas_")
+    primary = os.path.join(workdir, "primary.db")
+    replica = os.path.join(workdir, "replica.db")
+    env = {"DATABASE_URL": f"sqlite:///{primary}", "PASSWORD_POOL_WORKERS": "0", "RATE_LIMIT_ENABLED": "false"}
+    try:
+        run(SETUP, env)
+        shutil.copy(primary, replica)
+        with sqlite3.connect(replica) as connection:
+            connection.execute(
+                'INSERT INTO "Subjects" (name, espb, professor_id) VALUES (?, 6, 1)', (REPLICA_ONLY,)
+            )
+
+        failures = []
+        healthy = probe({**env, "DATABASE_REPLICA_URLS": f"sqlite:///{replica}"})
+        print(f"zdrava replika: {healthy}")
+        if healthy["statuses"] != [200, 200, 200]:
+            failures.append(f"GET sa replike: {healthy['statuses']}")
+        if REPLICA_ONLY not in healthy["names"]:
+            failures.append("čitanje nije otišlo na repliku")
+
+        missing = os.path.join(workdir, "nema", "replica.db")
+        down = probe({**env, "DATABASE_REPLICA_URLS": f"sqlite:///{missing}"})
+        print(f"nedostupna replika: {down}")
+        if down["statuses"] != [200, 200, 200]:
+            failures.append(f"GET sa nedostupnom replikom: {down['statuses']}")
+        if REPLICA_ONLY in down["names"] or down["unhealthy"] != [0]:
+            failures.append("nedostupna replika nije isključena")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Rutiranje na replike radi (i kada replika nije dostupna)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
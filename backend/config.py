@@ -15,15 +15,92 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("❌ DATABASE_URL nije definisan u .env fajlu!")
 
+# Read replike (zarez između URL-ova) - bezbedni GET upiti idu na repliku, upisi na primarnu bazu
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Korisnik posle izmene ovoliko sekundi čita sa primarne baze (read-your-writes)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+# Očekivano maksimalno kašnjenje replike - tabela izmenjena skorije se čita sa primarne baze
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+# Replika koja je pala se ne koristi ovoliko sekundi, pa se ponovo proverava
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", 10))
+
+# Async mod (AsyncEngine + async rute) - uključuje se sa DB_ASYNC_MODE=true
+DB_ASYNC_MODE = os.getenv("DB_ASYNC_MODE", "false").lower() in ("1", "true", "yes")
+# Ako nije zadat, izvodi se iz DATABASE_URL (asyncpg / aiosqlite drajver)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
 # JWT konfiguracija
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback_secret_key_for_dev")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Bcrypt - promena BCRYPT_ROUNDS pokreće rehash lozinke pri sledećem loginu
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# Pool procesa za hash/verify (0 = inline, bez pool-a)
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", 2))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", 32))
+PASSWORD_POOL_RETRY_AFTER = int(os.getenv("PASSWORD_POOL_RETRY_AFTER", 2))
+
+# Keš verifikovanih tokena (principal cache)
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", 10000))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 300))
+
+# Keš kataloga (predmeti/ispiti) - CACHE_REDIS_URL deli verzije između worker-a
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+CATALOG_VERSION_CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", 1))
+# Bez CACHE_REDIS_URL svaki worker ne vidi izmene drugih - katalog se tada ponovo učitava posle ovoliko sekundi
+CATALOG_MAX_AGE_SECONDS = float(os.getenv("CATALOG_MAX_AGE_SECONDS", 30))
+# Aplikacija radi kao jedan proces (jedan uvicorn worker) - verzije u memoriji procesa su tada pouzdane
+SINGLE_PROCESS = os.getenv("SINGLE_PROCESS", "false").lower() in ("1", "true", "yes")
+
+# Keš analitike (raspodela ocena) - broj zapamćenih rezultata po procesu
+ANALYTICS_CACHE_MAX_SIZE = int(os.getenv("ANALYTICS_CACHE_MAX_SIZE", 512))
+# Bez CACHE_REDIS_URL (verzije po procesu) rezultat važi najviše ovoliko sekundi
+ANALYTICS_CACHE_MAX_AGE_SECONDS = float(os.getenv("ANALYTICS_CACHE_MAX_AGE_SECONDS", 30))
+
+# Raspored ispita - broj termina (slotova) u danu, numerisani od 1
+EXAM_SLOTS_PER_DAY = int(os.getenv("EXAM_SLOTS_PER_DAY", 3))
+
+# Red prijava (POST /exam-registrations/tickets) - worker u lifespan-u obrađuje tikete u grupama
+REGISTRATION_QUEUE_ENABLED = os.getenv("REGISTRATION_QUEUE_ENABLED", "false").lower() in ("1", "true", "yes")
+REGISTRATION_QUEUE_BATCH_SIZE = int(os.getenv("REGISTRATION_QUEUE_BATCH_SIZE", 200))
+# Pauza worker-a kada je red prazan (novi tiket u istom procesu ga budi odmah)
+REGISTRATION_QUEUE_POLL_SECONDS = float(os.getenv("REGISTRATION_QUEUE_POLL_SECONDS", 1))
+
+# Rate limiting (token bucket, N zahteva po minutu po ključu i ruti) - 0 isključuje limit
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# Zajednički brojači za sve worker-e (podrazumevano isti Redis kao keš)
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", CACHE_REDIS_URL)
+# Po IP adresi limiti su veći - ceo fakultet može biti iza jedne NAT adrese
+RATE_LIMIT_LOGIN_IP_PER_MINUTE = int(os.getenv("RATE_LIMIT_LOGIN_IP_PER_MINUTE", 300))
+RATE_LIMIT_LOGIN_USER_PER_MINUTE = int(os.getenv("RATE_LIMIT_LOGIN_USER_PER_MINUTE", 10))
+RATE_LIMIT_REGISTRATION_IP_PER_MINUTE = int(os.getenv("RATE_LIMIT_REGISTRATION_IP_PER_MINUTE", 600))
+RATE_LIMIT_REGISTRATION_USER_PER_MINUTE = int(os.getenv("RATE_LIMIT_REGISTRATION_USER_PER_MINUTE", 30))
+# IP klijenta iz X-Forwarded-For (samo iza proxy-ja koji taj header postavlja)
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() in ("1", "true", "yes")
+
+# DB pool (primarna baza, replike i async engine)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
+# Admission control - najviše ovoliko zahteva u obradi (podrazumevano kapacitet DB pool-a),
+# ostali čekaju u redu do ADMISSION_QUEUE_TIMEOUT_SECONDS; pun red -> 503
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", DB_POOL_SIZE + DB_MAX_OVERFLOW))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 100))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 2))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+
+# Profiler upita - naredba ponovljena ovoliko puta u jednom zahtevu se prijavljuje kao N+1
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 5))
+
+# Readiness probe - rezultat se pamti ovoliko sekundi; minimum slobodnih konekcija u pool-u
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", 5))
+HEALTH_POOL_MIN_FREE = int(os.getenv("HEALTH_POOL_MIN_FREE", 1))
+
 # Server konfiguracija
 PORT = int(os.getenv("PORT", 8000))
 HOST = os.getenv("HOST", "0.0.0.0")
-print(f"🔗 Database URL: {DATABASE_URL}")
+
 # CORS konfiguracija
 CORS_ORIGINS = [
     "http://localhost:3000",
@@ -37,11 +114,17 @@ CORS_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_METHODS = ["*"]
 CORS_ALLOW_HEADERS = ["*"]
+# Headeri koje frontend sme da čita (paginacija, rate limit)
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "Retry-After"]
+
+# Masovni uvoz studenata
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 1000))
+
+# Paginacija i streaming listi
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 1000))
+NDJSON_BATCH_SIZE = int(os.getenv("NDJSON_BATCH_SIZE", 500))
 
 # Environment
 ENV = os.getenv("ENV", "development")
 DEBUG = ENV == "development"
-
-# Info
-print(f"🔧 Environment: {ENV}")
-print(f"🗄️  Database: {'Connected' if DATABASE_URL else 'Not configured'}")
\ No newline at end of file
@@ -1,8 +1,35 @@
 # create_tables.py
-from database import Base, engine
-from models.academic import Subject, Exam, ExamRegistration
-from models.user import Student, Professor
+"""
+Primena migracija baze (isto kao: alembic upgrade head)
+Aplikacija pri startu ne proverava niti menja šemu - to radi ova komanda (deploy korak).
+Pokreni sa: python create_tables.py
+            python create_tables.py --check   (izlazni kod 1 ako baza nije na head reviziji)
+"""
+import os
+import sys
+from alembic import command
+from alembic.config import Config
 
-print("Creating tables...")
-Base.metadata.create_all(bind=engine)
-print("✅ Tables created successfully!")
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+if "--check" in sys.argv:
+    from sqlalchemy import text
+    from database import get_engine
+    from services.health import migration_head
+
+    head = migration_head()
+    try:
+        with get_engine().connect() as connection:
+            current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception as e:
+        current = None
+        print(f"❌ Nije moguće pročitati alembic_version: {type(e).__name__}")
+    if current != head:
+        print(f"❌ Šema nije ažurna: baza={current}, head={head}")
+        sys.exit(1)
+    print(f"✅ Šema je ažurna ({head})")
+    sys.exit(0)
+
+print("Applying migrations...")
+command.upgrade(Config(ALEMBIC_INI), "head")
+print("✅ Database schema is up to date!")
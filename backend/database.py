@@ -1,22 +1,274 @@
 # database.py
 """
 Database konekcija i session management
+Engine-i se ne prave pri importu: init_engines() ih pravi na startu aplikacije
+(lifespan), a skripte ih dobijaju na prvo korišćenje (get_engine, `database.engine`).
+Import ovog modula ne učitava DB drajver i ne otvara konekcije.
 """
-from sqlalchemy import create_engine
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import time
+import itertools
+import threading
+from typing import Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError, OperationalError, InterfaceError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
-
-# Kreiraj SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Provera konekcije pre korišćenja
-    pool_size=10,        # Broj konekcija u pool-u
-    max_overflow=20      # Dodatne konekcije ako je potrebno
+from sqlalchemy.orm import sessionmaker, Session
+from config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DB_ASYNC_MODE,
+    DATABASE_REPLICA_URLS, REPLICA_RETRY_SECONDS, DB_POOL_SIZE, DB_MAX_OVERFLOW
 )
+from middleware.query_profiler import install_query_profiler
+from middleware.metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool, register_pool_metrics
+
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Engine primarne baze - pravi se jednom, pri prvom pozivu"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    DATABASE_URL,
+                    poolclass=TimedQueuePool,  # QueuePool + merenje čekanja na konekciju
+                    pool_pre_ping=True,  # Provera konekcije pre korišćenja
+                    pool_size=DB_POOL_SIZE,          # Broj konekcija u pool-u
+                    max_overflow=DB_MAX_OVERFLOW     # Dodatne konekcije ako je potrebno
+                )
+                # Broj naredbi i vreme u bazi po HTTP zahtevu (middleware/query_profiler.py)
+                install_query_profiler(engine)
+                register_pool_metrics(engine, "primary")
+                _engine = engine
+    return _engine
+
+
+class ReplicaRouter:
+    """
+    Engine-i read replika: round-robin među zdravim replikama.
+    Replika koja baci grešku konekcije se isključuje na REPLICA_RETRY_SECONDS;
+    posle toga se pre prvog korišćenja proverava jednim SELECT 1.
+    """
+
+    def __init__(self, urls: list):
+        self.urls = list(urls)
+        self._engines: Optional[list] = None
+        self._unhealthy_until: dict[int, float] = {}
+        self._order = itertools.cycle(range(len(self.urls)))
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    @property
+    def engines(self) -> list:
+        """Engine-i replika - prave se pri prvom korišćenju"""
+        if self._engines is None:
+            with self._lock:
+                if self._engines is None:
+                    engines = []
+                    for index, url in enumerate(self.urls):
+                        replica = create_engine(
+                            url, poolclass=TimedQueuePool, pool_pre_ping=True,
+                            pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW
+                        )
+                        install_query_profiler(replica)
+                        register_pool_metrics(replica, f"replica{index}")
+                        event.listen(replica, "handle_error", self._on_error)
+                        engines.append(replica)
+                    self._engines = engines
+        return self._engines
+
+    def dispose(self) -> None:
+        for replica in self._engines or ():
+            replica.dispose()
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect or context.connection is None or context.is_pre_ping:
+            self.mark_unhealthy(context.engine)
+
+    def mark_unhealthy(self, replica) -> None:
+        for index, candidate in enumerate(self.engines):
+            if candidate is replica:
+                self._unhealthy_until[index] = time.monotonic() + REPLICA_RETRY_SECONDS
+
+    def _usable(self, index: int) -> bool:
+        until = self._unhealthy_until.get(index)
+        if until is None:
+            return True
+        if time.monotonic() < until:
+            return False
+        # Period isključenja je prošao - jedan ping odlučuje da li se replika vraća
+        try:
+            with self.engines[index].connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception:
+            self._unhealthy_until[index] = time.monotonic() + REPLICA_RETRY_SECONDS
+            return False
+        self._unhealthy_until.pop(index, None)
+        return True
+
+    def pick(self):
+        """Zdrava replika ili None (čita se sa primarne baze)"""
+        engines = self.engines
+        with self._lock:
+            candidates = [next(self._order) for _ in engines]
+        for index in candidates:
+            if self._usable(index):
+                return self.engines[index]
+        self.fallbacks += 1
+        return None
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "replicas": len(self.urls),
+            "unhealthy": sorted(i for i, until in self._unhealthy_until.items() if until > now),
+            "fallbacks": self.fallbacks,
+        }
+
+
+replica_router = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+
+class RoutingSession(Session):
+    """
+    Session koja čitanja može da pošalje na repliku.
+    Samo sesije sa info["read_only"] (get_read_db) čitaju sa replike; flush i
+    insert/update/delete uvek idu na primarnu bazu. Izbor se pravi pri prvom
+    upitu: info["needs_primary"]() (read-your-writes, skorašnje izmene) ga može
+    vratiti na primarnu bazu, i važi do kraja sesije.
+    Greška konekcije replike (replika pala, a još nije označena kao nezdrava)
+    isključuje repliku, a ista naredba se ponavlja na primarnoj bazi.
+    """
+
+    def _read(self, method, *args, **kw):
+        try:
+            return method(*args, **kw)
+        except DBAPIError as e:
+            replica = self.info.get("read_bind")
+            if replica is None or not (e.connection_invalidated or isinstance(e, (OperationalError, InterfaceError))):
+                raise
+            replica_router.mark_unhealthy(replica)
+            replica_router.fallbacks += 1
+            # Sesija samo čita - rollback oslobađa konekciju replike, ostatak sesije ide na primarnu bazu
+            self.rollback()
+            self.info["read_bind"] = None
+            return method(*args, **kw)
+
+    def execute(self, *args, **kw):
+        return self._read(super().execute, *args, **kw)
+
+    def scalar(self, *args, **kw):
+        return self._read(super().scalar, *args, **kw)
+
+    def scalars(self, *args, **kw):
+        return self._read(super().scalars, *args, **kw)
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("read_only")
+            and replica_router.enabled
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            if "read_bind" not in self.info:
+                needs_primary = self.info.get("needs_primary")
+                replica = None if needs_primary and needs_primary() else replica_router.pick()
+                self.info["read_bind"] = replica
+            if self.info["read_bind"] is not None:
+                return self.info["read_bind"]
+        if self.bind is None:
+            # SessionLocal nema bind pri importu - primarni engine se vezuje na prvi upit
+            self.bind = get_engine()
+        return super().get_bind(mapper, clause=clause, **kw)
+
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+
+def make_async_url(url: str) -> str:
+    """
+    Pretvara sinhroni DATABASE_URL u URL za async drajver.
+    postgresql(+psycopg2):// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://
+    asyncpg ne razume libpq parametre (sslmode, channel_binding) pa se prevode/izbacuju.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.split("+")[0]
+    if scheme in ("postgres", "postgresql"):
+        query = []
+        for key, value in parse_qsl(parts.query):
+            if key == "sslmode":
+                query.append(("ssl", value))
+            elif key != "channel_binding":
+                query.append((key, value))
+        return urlunsplit(("postgresql+asyncpg", parts.netloc, parts.path, urlencode(query), parts.fragment))
+    if scheme == "sqlite":
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    return url
+
+
+# Async session factory (samo u async modu); engine se vezuje u get_async_engine
+AsyncSessionLocal = None
+
+if DB_ASYNC_MODE:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    # expire_on_commit=False - objekti ostaju čitljivi posle commit-a bez lazy load-a
+    AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine():
+    """AsyncEngine (samo u async modu) - pravi se jednom, pri prvom pozivu"""
+    global _async_engine
+    if _async_engine is None and DB_ASYNC_MODE:
+        with _engine_lock:
+            if _async_engine is None:
+                from sqlalchemy.ext.asyncio import create_async_engine
+
+                async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL or make_async_url(DATABASE_URL),
+                    poolclass=TimedAsyncAdaptedQueuePool,
+                    pool_pre_ping=True,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW
+                )
+                install_query_profiler(async_engine.sync_engine)
+                register_pool_metrics(async_engine.sync_engine, "async")
+                AsyncSessionLocal.configure(bind=async_engine)
+                _async_engine = async_engine
+    return _async_engine
+
+
+def init_engines() -> None:
+    """Startup (lifespan): pravi sve engine-e pre prvog zahteva - bez konekcija ka bazi"""
+    get_engine()
+    replica_router.engines  # property pravi engine-e replika
+    get_async_engine()
+
+
+async def dispose_engines() -> None:
+    """Shutdown (lifespan): zatvara konekcije svih pool-ova"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    replica_router.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+def __getattr__(name):
+    # `from database import engine` (skripte, benchmark-i) - engine se pravi pri prvom pristupu
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Base klasa za sve modele
 Base = declarative_base()
@@ -39,8 +291,7 @@ def test_connection():
     Testira database konekciju
     """
     try:
-        from sqlalchemy import text
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             result = connection.execute(text("SELECT version();"))
             version = result.fetchone()
             print(f"✅ Database konekcija uspešna!")
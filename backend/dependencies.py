@@ -2,66 +2,169 @@
 """
 FastAPI dependency funkcije
 """
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import SessionLocal, AsyncSessionLocal, get_async_engine, replica_router
 from models import Student, Professor
-from config import SECRET_KEY, ALGORITHM
+from config import MAX_PAGE_SIZE
+from middleware.metrics import auth_failures
+from services.auth import decode_access_token, InvalidTokenError
+from services.read_routing import needs_primary
+from services.principal_cache import (
+    principal_cache, student_snapshot, professor_snapshot,
+    StudentPrincipal, ProfessorPrincipal
+)
 
 security = HTTPBearer()
 
-def get_db():
-    """Database session dependency"""
+class PageParams:
+    """
+    Query parametri za liste: keyset paginacija po id-u i NDJSON stream.
+    Bez `limit`-a lista se vraća cela (kompatibilno sa postojećim frontend-om).
+    """
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Broj redova po stranici"),
+        cursor: Optional[int] = Query(None, ge=0, description="Vrednost X-Next-Cursor headera prethodne stranice"),
+        format: str = Query("json", pattern="^(json|ndjson)$", description="json ili ndjson (stream)")
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.format = format
+
+def get_db(request: Request):
+    """Database session dependency (primarna baza)"""
     db = SessionLocal()
+    # Autor izmene - posle commit-a čita sa primarne baze (services/read_routing.py)
+    db.info["writer"] = request.headers.get("authorization")
     try:
         yield db
     finally:
         db.close()
 
-def get_current_student(
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
-    db: Session = Depends(get_db)
-) -> Student:
-    """Dependency za dobijanje trenutno ulogovanog studenta"""
-    token = credentials.credentials
+def get_read_db(request: Request, primary_db: Session = Depends(get_db)):
+    """
+    Session za bezbedna čitanja - ide na read repliku ako je konfigurisana,
+    osim kada korisnik upravo piše ili je tabela skoro menjana
+    """
+    if not replica_router.enabled:
+        # Bez replika - ista sesija (i konekcija) kao auth dependency-ji zahteva
+        yield primary_db
+        return
+    db = SessionLocal()
+    db.info["read_only"] = True
+    db.info["needs_primary"] = lambda: needs_primary(request)
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """Async database session dependency (samo u async modu)"""
+    # Bez lifespan-a (npr. TestClient bez `with`) engine se pravi ovde
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _decode_token(token: str, role: str) -> tuple[str, Optional[int]]:
+    """Dekodira JWT i proverava ulogu; vraća (username, exp)"""
+    try:
+        payload = decode_access_token(token)
         username = payload.get("sub")
         user_role = payload.get("role")
         
-        if username is None or user_role != "student":
-            raise HTTPException(status_code=401, detail="Invalid token or not a student")
-    except JWTError:
+        if username is None or user_role != role:
+            auth_failures.inc("wrong_role")
+            raise HTTPException(status_code=401, detail=f"Invalid token or not a {role}")
+    except InvalidTokenError:
+        auth_failures.inc("invalid_token")
         raise HTTPException(status_code=401, detail="Invalid token")
+    return username, payload.get("exp")
 
+def get_current_student(
+    credentials: HTTPAuthorizationCredentials = Depends(security), 
+    db: Session = Depends(get_db)
+) -> StudentPrincipal:
+    """Dependency za dobijanje trenutno ulogovanog studenta (read-only snapshot)"""
+    token = credentials.credentials
+    cached = principal_cache.get(token, "student")
+    if cached is not None:
+        return cached
+
+    username, exp = _decode_token(token, "student")
     student = db.query(Student).filter(Student.username == username).first()
 
     if not student:
+        auth_failures.inc("unknown_user")
         raise HTTPException(status_code=404, detail="Student not found")
 
-    return student
+    principal = student_snapshot(student)
+    principal_cache.put(token, principal, exp)
+    return principal
 
 def get_current_professor(
     credentials: HTTPAuthorizationCredentials = Depends(security), 
     db: Session = Depends(get_db)
-) -> Professor:
-    """Dependency za dobijanje trenutno ulogovanog profesora"""
+) -> ProfessorPrincipal:
+    """Dependency za dobijanje trenutno ulogovanog profesora (read-only snapshot)"""
     token = credentials.credentials
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
-        user_role = payload.get("role")
-        
-        if username is None or user_role != "professor":
-            raise HTTPException(status_code=401, detail="Invalid token or not a professor")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    cached = principal_cache.get(token, "professor")
+    if cached is not None:
+        return cached
 
+    username, exp = _decode_token(token, "professor")
     professor = db.query(Professor).filter(Professor.username == username).first()
 
     if not professor:
+        auth_failures.inc("unknown_user")
+        raise HTTPException(status_code=404, detail="Professor not found")
+
+    principal = professor_snapshot(professor)
+    principal_cache.put(token, principal, exp)
+    return principal
+
+async def get_current_student_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> StudentPrincipal:
+    """Async varijanta get_current_student (AsyncSession)"""
+    token = credentials.credentials
+    cached = principal_cache.get(token, "student")
+    if cached is not None:
+        return cached
+
+    username, exp = _decode_token(token, "student")
+    student = (await db.execute(select(Student).where(Student.username == username))).scalars().first()
+
+    if not student:
+        auth_failures.inc("unknown_user")
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    principal = student_snapshot(student)
+    principal_cache.put(token, principal, exp)
+    return principal
+
+async def get_current_professor_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> ProfessorPrincipal:
+    """Async varijanta get_current_professor (AsyncSession)"""
+    token = credentials.credentials
+    cached = principal_cache.get(token, "professor")
+    if cached is not None:
+        return cached
+
+    username, exp = _decode_token(token, "professor")
+    professor = (await db.execute(select(Professor).where(Professor.username == username))).scalars().first()
+
+    if not professor:
+        auth_failures.inc("unknown_user")
         raise HTTPException(status_code=404, detail="Professor not found")
 
-    return professor
\ No newline at end of file
+    principal = professor_snapshot(professor)
+    principal_cache.put(token, principal, exp)
+    return principal
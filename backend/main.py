@@ -1,12 +1,21 @@
 # main.py
 """
 Glavni FastAPI aplikacijski fajl
-Registruje sve rutere i kreira tabele
+Registruje sve rutere
+Šema baze se ne pravi pri importu - koristi se: python create_tables.py (alembic upgrade head)
+Import ne otvara konekcije i ne ispisuje ništa; budžet vremena importa: python check_startup.py
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from database import engine, Base
-from config import CORS_ORIGINS, CORS_ALLOW_CREDENTIALS, CORS_ALLOW_METHODS, CORS_ALLOW_HEADERS
+from config import CORS_ORIGINS, CORS_ALLOW_CREDENTIALS, CORS_ALLOW_METHODS, CORS_ALLOW_HEADERS, CORS_EXPOSE_HEADERS, DB_ASYNC_MODE
+from database import replica_router, init_engines, dispose_engines
+from services import principal_cache, catalog_cache
+from services.password_pool import password_pool
+from services.analytics import analytics_cache
+from services.registration_queue import registration_queue
+from middleware import QueryProfilerMiddleware, MetricsMiddleware, AdmissionControlMiddleware, query_stats, metrics
 
 # Import rutera
 from routes import (
@@ -15,37 +24,29 @@ from routes import (
     students_router,
     subjects_router,
     exams_router,
-    registrations_router
+    registrations_router,
+    async_router,
+    health_router,
+    analytics_router
 )
 
-# Kreiranje tabela u bazi
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown resursi aplikacije"""
+    # Engine-i (bez konekcija) i procesi za bcrypt se podižu pre prvog zahteva
+    init_engines()
+    password_pool.start()
+    # Worker reda prijava (samo sa REGISTRATION_QUEUE_ENABLED=true)
+    registration_queue.start()
+    yield
+    await registration_queue.stop()
+    password_pool.shutdown()
+    await dispose_engines()
 
-# Kreiranje FastAPI aplikacije
-app = FastAPI(
-    title="School Management System API",
-    description="API za upravljanje školskim sistemom - studenti, profesori, predmeti, ispiti",
-    version="1.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS,
-    allow_credentials=CORS_ALLOW_CREDENTIALS,
-    allow_methods=CORS_ALLOW_METHODS,
-    allow_headers=CORS_ALLOW_HEADERS,
-)
+# Root, health i metrike
+system_router = APIRouter()
 
-# Registracija rutera
-app.include_router(auth_router)
-app.include_router(professors_router)
-app.include_router(students_router)
-app.include_router(subjects_router)
-app.include_router(exams_router)
-app.include_router(registrations_router)
-
-@app.get("/")
+@system_router.get("/")
 def root():
     """Root endpoint - provera da li API radi"""
     return {
@@ -54,7 +55,95 @@ def root():
         "version": "1.0.0"
     }
 
-@app.get("/health")
+@system_router.get("/health")
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (statički - za load balancer koristiti /health/ready)"""
     return {"status": "healthy"}
+
+@system_router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Metrike u Prometheus text formatu (async - threadpool statistika se čita iz event loop-a)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@system_router.get("/metrics/auth-cache")
+def auth_cache_metrics():
+    """Brojači keša verifikovanih tokena (hits, misses, size)"""
+    return principal_cache.stats()
+
+@system_router.get("/metrics/catalog-cache")
+def catalog_cache_metrics():
+    """Verzija i veličina keša kataloga, broj učitavanja iz baze"""
+    return catalog_cache.stats()
+
+@system_router.get("/metrics/analytics-cache")
+def analytics_cache_metrics():
+    """Pogoci i promašaji keša analitike"""
+    return analytics_cache.stats()
+
+@system_router.get("/metrics/replicas")
+def replica_metrics():
+    """Stanje read replika: nedostupne i broj fallback-ova na primarnu bazu"""
+    return replica_router.snapshot()
+
+@system_router.get("/metrics/queries")
+def query_metrics():
+    """SQL naredbe po ruti: broj, vreme u bazi, N+1 otisci"""
+    return query_stats.snapshot()
+
+@system_router.get("/metrics/registration-queue")
+def registration_queue_metrics():
+    """Worker reda prijava: obrađene grupe i tiketi, trajanje poslednje grupe"""
+    return registration_queue.snapshot()
+
+@system_router.get("/metrics/passwords")
+def password_pool_metrics():
+    """Stanje bcrypt pool-a i trajanja (login, verify, hash)"""
+    return password_pool.snapshot()
+
+def create_app() -> FastAPI:
+    """
+    Application factory - uvicorn main:app ili uvicorn main:create_app --factory
+    Pravljenje aplikacije ne otvara konekcije; resursi se podižu u lifespan-u
+    """
+    app = FastAPI(
+        title="School Management System API",
+        description="API za upravljanje školskim sistemom - studenti, profesori, predmeti, ispiti",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # Admission control - višak zahteva dobija 503 pre nego što se DB pool iscrpi
+    # (unutar CORS-a, da bi frontend mogao da pročita 503 i Retry-After)
+    app.add_middleware(AdmissionControlMiddleware)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=CORS_ALLOW_CREDENTIALS,
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
+        expose_headers=CORS_EXPOSE_HEADERS,
+    )
+
+    # Profiler SQL upita po zahtevu (Server-Timing header u development modu)
+    app.add_middleware(QueryProfilerMiddleware)
+    # Latencija po ruti i zahtevi u obradi (GET /metrics) - spoljni sloj, meri i ostale middleware-e
+    app.add_middleware(MetricsMiddleware)
+
+    # Registracija rutera
+    # U async modu async rute se registruju prve, pa imaju prednost nad sinhronim sa istim URL-om
+    if DB_ASYNC_MODE:
+        app.include_router(async_router)
+    app.include_router(auth_router)
+    app.include_router(professors_router)
+    app.include_router(students_router)
+    app.include_router(subjects_router)
+    app.include_router(exams_router)
+    app.include_router(registrations_router)
+    app.include_router(analytics_router)
+    app.include_router(health_router)
+    app.include_router(system_router)
+    return app
+
+app = create_app()
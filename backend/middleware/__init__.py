@@ -0,0 +1,16 @@
+# middleware/__init__.py
+"""
+Export middleware-a
+"""
+from middleware.query_profiler import QueryProfilerMiddleware, install_query_profiler, query_stats
+from middleware.metrics import MetricsMiddleware, metrics
+from middleware.admission import AdmissionControlMiddleware
+
+__all__ = [
+    "QueryProfilerMiddleware",
+    "install_query_profiler",
+    "query_stats",
+    "MetricsMiddleware",
+    "metrics",
+    "AdmissionControlMiddleware"
+]
@@ -0,0 +1,97 @@
+# middleware/admission.py
+"""
+Admission control - globalni limit zahteva u obradi
+Najviše ADMISSION_MAX_IN_FLIGHT zahteva se obrađuje istovremeno (podrazumevano
+pool_size + max_overflow), pa zahtevi ne čekaju na konekciju u pool-u dok ne
+istekne pool_timeout. Višak čeka u redu najviše ADMISSION_QUEUE_TIMEOUT_SECONDS;
+kada je red pun ili čekanje istekne, odgovor je odmah 503 sa Retry-After.
+Health i metrics rute se ne ograničavaju - probe moraju da prođu i pod opterećenjem.
+SSE stream-ovi (/events) takođe ne: dugo su otvoreni, a bazu koriste samo povremeno.
+"""
+import asyncio
+import json
+from typing import Optional
+from middleware.metrics import metrics, requests_rejected
+from config import (
+    ADMISSION_MAX_IN_FLIGHT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT_SECONDS, ADMISSION_RETRY_AFTER
+)
+
+EXEMPT_PREFIXES = ("/health", "/metrics")
+EXEMPT_SUFFIXES = ("/events",)
+
+admission_requests = metrics.gauge("http_admission_requests", "Admission control: zahtevi u obradi i u redu", ("state",))
+
+OVERLOADED_BODY = json.dumps({"detail": "Server je trenutno preopterećen, pokušajte ponovo"}).encode()
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware; stanje menja samo event loop, pa su brojači bez lock-a"""
+
+    def __init__(
+        self, app, max_in_flight: int = ADMISSION_MAX_IN_FLIGHT, max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS, exempt: tuple = EXEMPT_PREFIXES,
+        exempt_suffixes: tuple = EXEMPT_SUFFIXES
+    ):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.exempt = exempt
+        self.exempt_suffixes = exempt_suffixes
+        self.in_flight = 0
+        self.queued = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        admission_requests.add_function(lambda: {("in_flight",): self.in_flight, ("queued",): self.queued})
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Semaphore je vezan za event loop (TestClient pravi novi loop po klijentu)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._semaphore
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http" or self.max_in_flight <= 0
+            or scope["path"].startswith(self.exempt) or scope["path"].endswith(self.exempt_suffixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        slots = self._slots()
+        if slots.locked():
+            if self.queued >= self.max_queue:
+                await self._reject(send, "admission_queue_full")
+                return
+            self.queued += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                await self._reject(send, "admission_timeout")
+                return
+            finally:
+                self.queued -= 1
+        else:
+            await slots.acquire()
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+    async def _reject(self, send, reason: str) -> None:
+        requests_rejected.inc(reason)
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(OVERLOADED_BODY)).encode()),
+                (b"retry-after", str(ADMISSION_RETRY_AFTER).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": OVERLOADED_BODY})
@@ -0,0 +1,324 @@
+# middleware/metrics.py
+"""
+Metrike u Prometheus text formatu (GET /metrics)
+Mali registar bez spoljnih zavisnosti: Counter, Gauge i Histogram sa
+labelama. Na vrućoj putanji (svaki zahtev) radi se samo nekoliko dict
+operacija i bisect; HTTP metrike menja samo event loop, pa su bez
+lock-a (threadsafe=False). Skupe vrednosti (pool, threadpool) se
+računaju tek pri čitanju /metrics. Metrike su po procesu - sa više worker-a
+svaki worker ima svoje brojače.
+"""
+import time
+import bisect
+import threading
+from typing import Callable, Optional
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _NoLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Metric:
+    """threadsafe=False: metriku menja samo jedan thread (event loop) - izmene bez lock-a"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), threadsafe: bool = True):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.threadsafe = threadsafe
+        self._lock = threading.Lock() if threadsafe else _NoLock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), threadsafe: bool = True):
+        super().__init__(name, documentation, labels, threadsafe)
+        self._values: dict[tuple, float] = {}
+        if not threadsafe:
+            self.inc = self._inc
+
+    def _inc(self, *label_values, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._inc(*label_values, amount=amount)
+
+    def render(self) -> list:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, key)} {_number(value)}" for key, value in values
+        ]
+
+
+class Gauge(Metric):
+    """Gauge sa ručnim set/inc/dec ili funkcijom koja se poziva pri čitanju"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), function: Optional[Callable] = None,
+                 threadsafe: bool = True):
+        super().__init__(name, documentation, labels, threadsafe)
+        self._values: dict[tuple, float] = {}
+        self._functions: list[Callable] = [function] if function else []
+        if not threadsafe:
+            self.inc = self._inc
+
+    def set(self, value: float, *label_values) -> None:
+        self._values[label_values] = value
+
+    def _inc(self, *label_values, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._inc(*label_values, amount=amount)
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def add_function(self, function: Callable) -> None:
+        """function() -> {label_values: vrednost}; poziva se pri svakom čitanju /metrics"""
+        self._functions.append(function)
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        for function in self._functions:
+            try:
+                values.update(function())
+            except Exception:
+                # Metrika koja trenutno ne može da se izračuna se preskače, ne ruši /metrics
+                continue
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, key)} {_number(value)}" for key, value in values.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS,
+                 threadsafe: bool = True):
+        super().__init__(name, documentation, labels, threadsafe)
+        self.buckets = tuple(sorted(buckets))
+        # label_values -> [broj po bucket-u (poslednji je +Inf), suma]
+        self._values: dict[tuple, list] = {}
+        if not threadsafe:
+            self.observe = self._observe
+
+    def _observe(self, value: float, *label_values) -> None:
+        state = self._values.get(label_values)
+        if state is None:
+            state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def observe(self, value: float, *label_values) -> None:
+        with self._lock:
+            self._observe(value, *label_values)
+
+    def render(self) -> list:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = self.header()
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = _labels(self.label_names, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: tuple = (), threadsafe: bool = True) -> Counter:
+        return self._register(Counter(name, documentation, labels, threadsafe))
+
+    def gauge(self, name: str, documentation: str, labels: tuple = (), function: Optional[Callable] = None,
+              threadsafe: bool = True) -> Gauge:
+        return self._register(Gauge(name, documentation, labels, function, threadsafe))
+
+    def histogram(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS,
+                  threadsafe: bool = True) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets, threadsafe))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# HTTP - menja ih samo MetricsMiddleware iz event loop-a
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP zahtevi po ruti i statusu", ("method", "route", "status"), threadsafe=False
+)
+http_latency = metrics.histogram(
+    "http_request_duration_seconds", "Trajanje HTTP zahteva po ruti", ("method", "route"), threadsafe=False
+)
+http_in_flight = metrics.gauge("http_requests_in_flight", "HTTP zahtevi u obradi")
+# Rate limit (iz threadpool-a) i admission control
+requests_rejected = metrics.counter(
+    "http_requests_rejected_total", "Zahtevi odbijeni pre obrade (rate limit, admission control)", ("reason",)
+)
+
+# Autentifikacija i bcrypt
+auth_failures = metrics.counter("auth_failures_total", "Neuspešne autentifikacije po razlogu", ("reason",))
+password_seconds = metrics.histogram(
+    "password_operation_seconds", "Trajanje bcrypt operacija (uključujući čekanje u pool-u)", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# SQL po zahtevu - menja ih samo QueryProfilerMiddleware iz event loop-a
+db_statements = metrics.histogram(
+    "db_statements_per_request", "Broj SQL naredbi po HTTP zahtevu", ("method", "route"),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250), threadsafe=False
+)
+db_time = metrics.histogram(
+    "db_time_per_request_seconds", "Vreme u bazi po HTTP zahtevu", ("method", "route"), threadsafe=False
+)
+db_n_plus_one = metrics.counter(
+    "db_n_plus_one_requests_total", "Zahtevi sa ponovljenom naredbom (N+1)", ("method", "route"), threadsafe=False
+)
+
+# DB pool
+pool_wait = metrics.histogram(
+    "db_pool_wait_seconds", "Čekanje na konekciju iz pool-a", ("pool",),
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+pool_checked_out = metrics.gauge("db_pool_checked_out", "Konekcije uzete iz pool-a", ("pool",))
+pool_overflow = metrics.gauge("db_pool_overflow", "Konekcije preko pool_size (max_overflow)", ("pool",))
+pool_size = metrics.gauge("db_pool_size", "Konfigurisana veličina pool-a", ("pool",))
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool koji meri čekanje na konekciju (pool_wait histogram)"""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - started, self.metrics_name)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Async varijanta TimedQueuePool (AsyncEngine)"""
+
+    metrics_name = "async"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - started, self.metrics_name)
+
+
+def register_pool_metrics(engine, name: str) -> None:
+    """Gauge-ovi pool-a (checked out, overflow, size) za dati engine"""
+    pool = engine.pool
+    if isinstance(pool, (TimedQueuePool, TimedAsyncAdaptedQueuePool)):
+        pool.metrics_name = name
+    if not hasattr(pool, "checkedout"):
+        return
+    pool_checked_out.add_function(lambda: {(name,): pool.checkedout()})
+    pool_overflow.add_function(lambda: {(name,): max(pool.overflow(), 0)})
+    pool_size.add_function(lambda: {(name,): pool.size()})
+
+
+def _threadpool_stats() -> dict:
+    """anyio threadpool (sinhrone rute i dependency-ji) - samo iz event loop-a"""
+    from anyio import to_thread
+
+    stats = to_thread.current_default_thread_limiter().statistics()
+    return {
+        ("busy",): stats.borrowed_tokens,
+        ("capacity",): stats.total_tokens,
+        ("waiting",): stats.tasks_waiting,
+    }
+
+
+metrics.gauge("threadpool_threads", "Anyio threadpool: zauzeti, kapacitet, zadaci u redu", ("state",),
+              function=_threadpool_stats)
+
+
+class MetricsMiddleware:
+    """ASGI middleware - trajanje, status i broj zahteva u obradi po šablonu rute"""
+
+    # Zahtevi u obradi - menja se samo iz event loop-a
+    in_flight = 0
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        MetricsMiddleware.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            MetricsMiddleware.in_flight -= 1
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            http_latency.observe(time.perf_counter() - started, method, route)
+            http_requests.inc(method, route, status)
+
+
+http_in_flight.add_function(lambda: {(): MetricsMiddleware.in_flight})
@@ -0,0 +1,172 @@
+# middleware/query_profiler.py
+"""
+Profiler SQL upita po zahtevu i detekcija N+1 obrazaca
+Engine događaji (before/after_cursor_execute) upisuju svaku naredbu u profil
+tekućeg zahteva (ContextVar). Middleware na kraju zahteva:
+- u DEBUG modu dodaje Server-Timing header (broj naredbi i vreme u bazi),
+- agregira brojače po šablonu rute (/metrics/queries, sa otiscima N+1 naredbi),
+- beleži broj naredbi, vreme u bazi i N+1 zahteve u Prometheus metrike (/metrics),
+- prijavljuje naredbe koje se u jednom zahtevu ponove >= N puta (N+1).
+Naredbe van HTTP zahteva (skripte, migracije) se ne beleže.
+"""
+import re
+import time
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from config import DEBUG, QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+from middleware.metrics import db_statements, db_time, db_n_plus_one
+
+logger = logging.getLogger(__name__)
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("query_profile", default=None)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_LISTS = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """SQL bez literala i sa skraćenim IN (...) listama - isti oblik upita = isti otisak"""
+    statement = _LITERALS.sub("?", statement)
+    statement = _PARAM_LISTS.sub("(...)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+class RequestProfile:
+    """Naredbe jednog HTTP zahteva"""
+
+    __slots__ = ("statements", "db_time", "counts")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.counts: dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.db_time += seconds
+        self.counts[statement] = self.counts.get(statement, 0) + 1
+
+    def repeated(self, threshold: int = QUERY_PROFILER_N_PLUS_ONE_THRESHOLD) -> dict:
+        """{otisak: broj} za naredbe koje se ponavljaju - kandidati za N+1"""
+        # IN liste različite dužine daju različit SQL, ali isti otisak
+        by_fingerprint: dict[str, int] = {}
+        for statement, count in self.counts.items():
+            key = fingerprint(statement)
+            by_fingerprint[key] = by_fingerprint.get(key, 0) + count
+        return {key: count for key, count in by_fingerprint.items() if count >= threshold}
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.statements} SQL"'
+
+
+class QueryStats:
+    """Agregat po šablonu rute (npr. GET /exams/{exam_id}) - po procesu"""
+
+    MAX_FINGERPRINTS = 20
+
+    def __init__(self):
+        self._routes: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, path: str, profile: RequestProfile) -> None:
+        route = f"{method} {path}"
+        repeated = profile.repeated() if profile.statements else {}
+        db_statements.observe(profile.statements, method, path)
+        db_time.observe(profile.db_time, method, path)
+        if repeated:
+            db_n_plus_one.inc(method, path)
+            logger.warning("N+1 na %s: %s", route, repeated)
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    "requests": 0, "statements": 0, "max_statements": 0,
+                    "db_time_seconds": 0.0, "n_plus_one_requests": 0, "n_plus_one": {},
+                }
+            stats["requests"] += 1
+            stats["statements"] += profile.statements
+            stats["max_statements"] = max(stats["max_statements"], profile.statements)
+            stats["db_time_seconds"] += profile.db_time
+            if repeated:
+                stats["n_plus_one_requests"] += 1
+                for key, count in repeated.items():
+                    if key in stats["n_plus_one"] or len(stats["n_plus_one"]) < self.MAX_FINGERPRINTS:
+                        stats["n_plus_one"][key] = max(stats["n_plus_one"].get(key, 0), count)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    **stats,
+                    "db_time_seconds": round(stats["db_time_seconds"], 4),
+                    "n_plus_one": dict(stats["n_plus_one"]),
+                    "avg_statements": round(stats["statements"] / stats["requests"], 2),
+                    "avg_db_time_ms": round(stats["db_time_seconds"] * 1000 / stats["requests"], 2),
+                }
+                for route, stats in sorted(self._routes.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+query_stats = QueryStats()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        profile.record(statement, time.perf_counter() - started.pop())
+
+
+def install_query_profiler(engine) -> None:
+    """Kači profiler na (sinhroni) engine; za AsyncEngine proslediti async_engine.sync_engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_path(scope) -> str:
+    # Ista oznaka kao u MetricsMiddleware (http_requests_total)
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware - profil po zahtevu; radi i sa streaming odgovorima"""
+
+    def __init__(self, app, server_timing: bool = DEBUG):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            query_stats.record(scope.get("method", ""), _route_path(scope), profile)
@@ -0,0 +1,86 @@
+"""initial schema
+
+Polazna šema, ista kao ona koju je pravio Base.metadata.create_all.
+Ako tabele već postoje (baza napravljena pre uvođenja migracija),
+revizija ih ne dira i samo se beleži kao primenjena.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = sa.inspect(op.get_bind()).get_table_names()
+    if "Students" in existing and "Exams_Registrations" in existing:
+        return
+
+    op.create_table(
+        "professors",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("username", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("email", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("password", sa.String(length=255), nullable=False),
+        sa.Column("subject", sa.String(length=100), nullable=False),
+    )
+    op.create_table(
+        "Students",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("username", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("email", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("index_number", sa.String(length=20), nullable=False, unique=True),
+        sa.Column("age_of_study", sa.Integer(), nullable=False),
+        sa.Column("department", sa.String(length=50), nullable=True),
+    )
+    op.create_table(
+        "Subjects",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("espb", sa.Integer(), nullable=False),
+        sa.Column("professor_id", sa.Integer(), sa.ForeignKey("professors.id"), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("department", sa.String(length=50), nullable=True),
+    )
+    op.create_table(
+        "Exams",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("subject_id", sa.Integer(), sa.ForeignKey("Subjects.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("type", sa.Enum("pismeni", "usmeni", name="examtype"), nullable=False),
+    )
+    op.create_table(
+        "Exams_Registrations",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("Students.id"), nullable=False),
+        sa.Column("exam_id", sa.Integer(), sa.ForeignKey("Exams.id"), nullable=False),
+        sa.Column("num_of_applications", sa.Integer(), nullable=True),
+        sa.Column("grade", sa.Integer(), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("status", sa.Enum("prijavljen", "polozio", "pao", name="examstatus"), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("Exams_Registrations")
+    op.drop_table("Exams")
+    op.drop_table("Subjects")
+    op.drop_table("Students")
+    op.drop_table("professors")
+    sa.Enum(name="examstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="examtype").drop(op.get_bind(), checkfirst=True)
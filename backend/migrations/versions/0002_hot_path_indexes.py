@@ -0,0 +1,60 @@
+"""hot path indexes
+
+Sekundarni indeksi za filtere koje rute koriste na svakom zahtevu.
+Na PostgreSQL-u se grade sa CREATE INDEX CONCURRENTLY (van transakcije),
+pa tabele ostaju dostupne za upis tokom izgradnje.
+
+Napomena: jedinstveni indeks (student_id, exam_id) neće proći ako baza već
+ima duple prijave - njih treba očistiti pre upgrade-a. Prekinut CONCURRENTLY
+build ostavlja INVALID indeks koji treba obrisati pre ponovnog pokušaja.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (ime, tabela, kolone, unique) - isto kao __table_args__ u modelima
+INDEXES = [
+    # Prijave studenta (vodeća kolona student_id) + jedna prijava po roku
+    ("ux_exams_registrations_student_exam", "Exams_Registrations", ["student_id", "exam_id"], True),
+    ("ix_exams_registrations_exam_id", "Exams_Registrations", ["exam_id"], False),
+    ("ix_exams_subject_id_date", "Exams", ["subject_id", "date"], False),
+    ("ix_subjects_professor_id", "Subjects", ["professor_id"], False),
+    ("ix_subjects_department_year", "Subjects", ["department", "year"], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                if_not_exists=True,
+                postgresql_concurrently=concurrently,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _unique in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                if_exists=True,
+                postgresql_concurrently=concurrently,
+            )
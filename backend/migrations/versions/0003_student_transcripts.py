@@ -0,0 +1,64 @@
+"""student transcripts
+
+Materijalizovan transkript (Student_Transcripts, Transcript_Entries).
+Posle upgrade-a popuniti postojeće podatke: python rebuild_transcripts.py
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "Student_Transcripts",
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("Students.id"), primary_key=True),
+        sa.Column("passed_count", sa.Integer(), nullable=False),
+        sa.Column("total_espb", sa.Integer(), nullable=False),
+        sa.Column("weighted_grade_sum", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "Transcript_Entries",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("Students.id"), nullable=False),
+        sa.Column("subject_id", sa.Integer(), sa.ForeignKey("Subjects.id"), nullable=False),
+        sa.Column("registration_id", sa.Integer(), sa.ForeignKey("Exams_Registrations.id"), nullable=False),
+        sa.Column("subject_name", sa.String(length=100), nullable=False),
+        sa.Column("espb", sa.Integer(), nullable=False),
+        sa.Column("grade", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("exam_date", sa.Date(), nullable=False),
+        sa.Column(
+            "exam_type",
+            # Tip examtype već postoji (tabela Exams)
+            postgresql.ENUM("pismeni", "usmeni", name="examtype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("professor_name", sa.String(length=100), nullable=False),
+    )
+    op.create_index(
+        "ux_transcript_entries_student_subject", "Transcript_Entries",
+        ["student_id", "subject_id"], unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ux_transcript_entries_student_subject", table_name="Transcript_Entries")
+    op.drop_table("Transcript_Entries")
+    op.drop_table("Student_Transcripts")
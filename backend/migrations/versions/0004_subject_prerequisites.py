@@ -0,0 +1,39 @@
+"""subject prerequisites
+
+Graf preduslova predmeta (Subject_Prerequisites): predmet se prijavljuje
+tek kada su položeni svi njegovi (tranzitivni) preduslovi.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "Subject_Prerequisites",
+        sa.Column("subject_id", sa.Integer(), sa.ForeignKey("Subjects.id"), primary_key=True),
+        sa.Column("prerequisite_id", sa.Integer(), sa.ForeignKey("Subjects.id"), primary_key=True),
+    )
+    op.create_index(
+        "ix_subject_prerequisites_prerequisite_id", "Subject_Prerequisites", ["prerequisite_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_subject_prerequisites_prerequisite_id", table_name="Subject_Prerequisites")
+    op.drop_table("Subject_Prerequisites")
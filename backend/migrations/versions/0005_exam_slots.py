@@ -0,0 +1,43 @@
+"""exam slots
+
+Termin, sala i kapacitet ispita (Exams.slot, room, capacity) i brojač
+zauzetih mesta (Exam_Seats). Postojeći ispiti ostaju bez ograničenja.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("Exams", sa.Column("slot", sa.Integer(), nullable=True))
+    op.add_column("Exams", sa.Column("room", sa.String(length=50), nullable=True))
+    op.add_column("Exams", sa.Column("capacity", sa.Integer(), nullable=True))
+    op.create_index("ix_exams_date", "Exams", ["date"])
+    op.create_table(
+        "Exam_Seats",
+        sa.Column("exam_id", sa.Integer(), sa.ForeignKey("Exams.id"), primary_key=True),
+        sa.Column("seats_taken", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("Exam_Seats")
+    op.drop_index("ix_exams_date", table_name="Exams")
+    op.drop_column("Exams", "capacity")
+    op.drop_column("Exams", "room")
+    op.drop_column("Exams", "slot")
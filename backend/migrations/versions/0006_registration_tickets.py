@@ -0,0 +1,54 @@
+"""registration tickets
+
+Red prijava ispita (Registration_Tickets): prijava u redu dobija tiket,
+worker je obrađuje u grupama; pun ispit stavlja tiket na listu čekanja.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 10:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "Registration_Tickets",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("Students.id"), nullable=False),
+        sa.Column("exam_id", sa.Integer(), sa.ForeignKey("Exams.id"), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("u_redu", "prijavljen", "lista_cekanja", "odbijen", "otkazan", name="ticketstatus"),
+            nullable=False,
+        ),
+        sa.Column("detail", sa.String(length=255), nullable=True),
+        sa.Column("registration_id", sa.Integer(), sa.ForeignKey("Exams_Registrations.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_registration_tickets_exam_status_id", "Registration_Tickets", ["exam_id", "status", "id"]
+    )
+    op.create_index("ix_registration_tickets_status_exam", "Registration_Tickets", ["status", "exam_id"])
+    op.create_index("ix_registration_tickets_student_exam", "Registration_Tickets", ["student_id", "exam_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_registration_tickets_student_exam", table_name="Registration_Tickets")
+    op.drop_index("ix_registration_tickets_status_exam", table_name="Registration_Tickets")
+    op.drop_index("ix_registration_tickets_exam_status_id", table_name="Registration_Tickets")
+    op.drop_table("Registration_Tickets")
+    sa.Enum(name="ticketstatus").drop(op.get_bind(), checkfirst=True)
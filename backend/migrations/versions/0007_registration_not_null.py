@@ -0,0 +1,45 @@
+"""registration not null
+
+Kolone prijave (num_of_applications, grade, points, status) postaju NOT NULL.
+Brza serijalizacija (services/serialization.py) ih kodira bez validacije,
+pa NULL ne sme stići do odgovora. Postojeći NULL-ovi dobijaju podrazumevane vrednosti.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULTS = {
+    "num_of_applications": ("1", sa.Integer()),
+    "grade": ("0", sa.Integer()),
+    "points": ("0", sa.Integer()),
+    "status": ("'prijavljen'", sa.Enum("prijavljen", "polozio", "pao", name="examstatus")),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column, (default, _type) in DEFAULTS.items():
+        op.execute(f'UPDATE "Exams_Registrations" SET {column} = {default} WHERE {column} IS NULL')
+    with op.batch_alter_table("Exams_Registrations") as batch:
+        for column, (_default, column_type) in DEFAULTS.items():
+            batch.alter_column(column, existing_type=column_type, nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("Exams_Registrations") as batch:
+        for column, (_default, column_type) in DEFAULTS.items():
+            batch.alter_column(column, existing_type=column_type, nullable=True)
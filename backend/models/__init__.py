@@ -3,15 +3,22 @@
 Export svih modela
 """
 from models.user import Student, Professor
-from models.academic import Subject, Exam, ExamRegistration
-from models.enums import ExamType, ExamStatus
+from models.academic import Subject, SubjectPrerequisite, Exam, ExamSeats, ExamRegistration, RegistrationTicket
+from models.enums import ExamType, ExamStatus, TicketStatus
+from models.transcript import StudentTranscript, TranscriptEntry
 
 __all__ = [
     "Student",
     "Professor",
     "Subject",
+    "SubjectPrerequisite",
     "Exam",
+    "ExamSeats",
     "ExamRegistration",
+    "RegistrationTicket",
     "ExamType",
-    "ExamStatus"
+    "ExamStatus",
+    "TicketStatus",
+    "StudentTranscript",
+    "TranscriptEntry"
 ]
\ No newline at end of file
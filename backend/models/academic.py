@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Date, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, ForeignKey, Index, func
 from sqlalchemy.orm import relationship  # ← DODAJ IMPORT!
 from database import Base
-from models.enums import ExamType, ExamStatus
+from models.enums import ExamType, ExamStatus, TicketStatus
 
 
 class Subject(Base):
     __tablename__ = "Subjects"
+    __table_args__ = (
+        # Predmeti profesora (profesorske liste ispita i prijava)
+        Index("ix_subjects_professor_id", "professor_id"),
+        # Studentski katalog (departman, godina)
+        Index("ix_subjects_department_year", "department", "year"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False)
@@ -19,30 +25,96 @@ class Subject(Base):
     exams = relationship("Exam", back_populates="subject")
 
 
+class SubjectPrerequisite(Base):
+    """Grana grafa preduslova: subject_id se prijavljuje tek kada je prerequisite_id položen"""
+    __tablename__ = "Subject_Prerequisites"
+    __table_args__ = (
+        # Predmeti kojima je dati predmet preduslov (brisanje predmeta)
+        Index("ix_subject_prerequisites_prerequisite_id", "prerequisite_id"),
+    )
+
+    subject_id = Column(Integer, ForeignKey("Subjects.id"), primary_key=True)
+    prerequisite_id = Column(Integer, ForeignKey("Subjects.id"), primary_key=True)
+
+
 class Exam(Base):
     __tablename__ = "Exams"
+    __table_args__ = (
+        # Rokovi predmeta, sortirani po datumu
+        Index("ix_exams_subject_id_date", "subject_id", "date"),
+        # Konflikti rasporeda (ispiti istog dana)
+        Index("ix_exams_date", "date"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     subject_id = Column(Integer, ForeignKey("Subjects.id"), nullable=False)
     date = Column(Date, nullable=False)
     type = Column(Enum(ExamType), nullable=False)
+    # Termin u danu (1..EXAM_SLOTS_PER_DAY), sala i broj mesta - None znači bez ograničenja
+    slot = Column(Integer, nullable=True)
+    room = Column(String(50), nullable=True)
+    capacity = Column(Integer, nullable=True)
     
     # ✅ RELATIONSHIPS:
     subject = relationship("Subject", back_populates="exams")
     registrations = relationship("ExamRegistration", back_populates="exam")
 
 
+class ExamSeats(Base):
+    """
+    Brojač zauzetih mesta ispita sa kapacitetom.
+    Odvojen od Exams da česti upisi pri prijavi ne menjaju verziju kataloga ispita.
+    """
+    __tablename__ = "Exam_Seats"
+
+    exam_id = Column(Integer, ForeignKey("Exams.id"), primary_key=True)
+    seats_taken = Column(Integer, nullable=False, default=0)
+
+
 class ExamRegistration(Base):
     __tablename__ = "Exams_Registrations"
+    __table_args__ = (
+        # Student može imati najviše jednu prijavu po ispitnom roku;
+        # vodeća kolona student_id služi i za "moje prijave"
+        Index("ux_exams_registrations_student_exam", "student_id", "exam_id", unique=True),
+        # Prijave po ispitu (profesorske liste, unos ocena)
+        Index("ix_exams_registrations_exam_id", "exam_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     student_id = Column(Integer, ForeignKey("Students.id"), nullable=False)
     exam_id = Column(Integer, ForeignKey("Exams.id"), nullable=False)
-    num_of_applications = Column(Integer, default=1)
-    grade = Column(Integer, default=0)
-    points = Column(Integer, default=0)
-    status = Column(Enum(ExamStatus), default=ExamStatus.prijavljen)
+    num_of_applications = Column(Integer, default=1, nullable=False)
+    grade = Column(Integer, default=0, nullable=False)
+    points = Column(Integer, default=0, nullable=False)
+    status = Column(Enum(ExamStatus), default=ExamStatus.prijavljen, nullable=False)
     
     # ✅ RELATIONSHIPS:
     student = relationship("Student", back_populates="exam_registrations")
-    exam = relationship("Exam", back_populates="registrations")
\ No newline at end of file
+    exam = relationship("Exam", back_populates="registrations")
+
+
+class RegistrationTicket(Base):
+    """
+    Prijava u redu (queued registration) - trajni red u bazi.
+    Obrađuje je services/registration_queue.py; lista čekanja je FIFO po id-ju.
+    """
+    __tablename__ = "Registration_Tickets"
+    __table_args__ = (
+        # Worker: tiketi ispita po statusu, redom prijema (i pozicija na listi čekanja)
+        Index("ix_registration_tickets_exam_status_id", "exam_id", "status", "id"),
+        # Worker: ispiti sa tiketima u redu
+        Index("ix_registration_tickets_status_exam", "status", "exam_id"),
+        # Otvoreni tiketi studenta (ponovljen zahtev vraća isti tiket)
+        Index("ix_registration_tickets_student_exam", "student_id", "exam_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_id = Column(Integer, ForeignKey("Students.id"), nullable=False)
+    exam_id = Column(Integer, ForeignKey("Exams.id"), nullable=False)
+    status = Column(Enum(TicketStatus), nullable=False, default=TicketStatus.u_redu)
+    # Poruka za odbijen tiket / listu čekanja
+    detail = Column(String(255), nullable=True)
+    registration_id = Column(Integer, ForeignKey("Exams_Registrations.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    processed_at = Column(DateTime, nullable=True)
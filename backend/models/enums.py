@@ -11,4 +11,12 @@ class ExamType(str, enum.Enum):
 class ExamStatus(str, enum.Enum):
     prijavljen = "prijavljen"
     polozio = "polozio"
-    pao = "pao"
\ No newline at end of file
+    pao = "pao"
+
+class TicketStatus(str, enum.Enum):
+    """Status tiketa u redu prijava (services/registration_queue.py)"""
+    u_redu = "u_redu"
+    prijavljen = "prijavljen"
+    lista_cekanja = "lista_cekanja"
+    odbijen = "odbijen"
+    otkazan = "otkazan"
@@ -0,0 +1,41 @@
+# models/transcript.py
+"""
+Denormalizovan studentski transkript (materijalizovan iz prijava ispita)
+Održava ga services/transcript.py - ne menjati direktno iz ruta.
+"""
+from sqlalchemy import Column, Integer, String, Date, Enum, ForeignKey, Index
+from database import Base
+from models.enums import ExamType
+
+
+class StudentTranscript(Base):
+    """Zbirni podaci po studentu (jedan red po studentu)"""
+    __tablename__ = "Student_Transcripts"
+
+    student_id = Column(Integer, ForeignKey("Students.id"), primary_key=True)
+    passed_count = Column(Integer, nullable=False, default=0)
+    total_espb = Column(Integer, nullable=False, default=0)
+    # Suma ocena ponderisanih ESPB-om - prosek = weighted_grade_sum / total_espb
+    weighted_grade_sum = Column(Integer, nullable=False, default=0)
+    # Ocenjeni izlasci (položio + pao)
+    attempts = Column(Integer, nullable=False, default=0)
+
+
+class TranscriptEntry(Base):
+    """Jedan red po položenom predmetu studenta"""
+    __tablename__ = "Transcript_Entries"
+    __table_args__ = (
+        Index("ux_transcript_entries_student_subject", "student_id", "subject_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_id = Column(Integer, ForeignKey("Students.id"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("Subjects.id"), nullable=False)
+    registration_id = Column(Integer, ForeignKey("Exams_Registrations.id"), nullable=False)
+    subject_name = Column(String(100), nullable=False)
+    espb = Column(Integer, nullable=False)
+    grade = Column(Integer, nullable=False)
+    points = Column(Integer, nullable=True)
+    exam_date = Column(Date, nullable=False)
+    exam_type = Column(Enum(ExamType), nullable=False)
+    professor_name = Column(String(100), nullable=False)
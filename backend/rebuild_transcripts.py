@@ -0,0 +1,17 @@
+# rebuild_transcripts.py
+"""
+Ponovna izgradnja materijalizovanog transkripta iz prijava ispita
+Pokreni sa: python rebuild_transcripts.py (posle migracije ili ručnih izmena u bazi)
+"""
+import time
+from database import SessionLocal
+from services import rebuild_transcripts
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rebuild_transcripts(db)
+    finally:
+        db.close()
+    print(f"✅ Transkripti ponovo izgrađeni za {time.perf_counter() - started:.2f}s")
@@ -8,6 +8,9 @@ from routes.students import router as students_router
 from routes.subjects import router as subjects_router
 from routes.exams import router as exams_router
 from routes.registrations import router as registrations_router
+from routes.async_api import router as async_router
+from routes.health import router as health_router
+from routes.analytics import router as analytics_router
 
 __all__ = [
     "auth_router",
@@ -15,5 +18,8 @@ __all__ = [
     "students_router",
     "subjects_router",
     "exams_router",
-    "registrations_router"
+    "registrations_router",
+    "async_router",
+    "health_router",
+    "analytics_router"
 ]
\ No newline at end of file
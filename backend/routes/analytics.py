@@ -0,0 +1,52 @@
+# routes/analytics.py
+"""
+Analytics endpoints - prolaznost i raspodela ocena (samo profesori)
+Agregacija je na serveru; odgovori se keširaju po verziji tabela i imaju ETag.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from dependencies import get_read_db, get_current_professor
+from models import Professor, ExamRegistration, Exam, Subject
+from schemas import ExamAnalytics, SubjectAnalytics, DepartmentAnalytics
+from services import conditional_get
+from services.analytics import exam_analytics, subject_analytics, department_analytics, AnalyticsError
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+@router.get("/exams/{exam_id}", response_model=ExamAnalytics)
+def get_exam_analytics(
+    exam_id: int,
+    db: Session = Depends(get_read_db),
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(ExamRegistration, Exam, Subject))
+):
+    """Prolaznost, raspodela ocena i poena za jedan ispitni rok"""
+    try:
+        return exam_analytics(db, exam_id, current_professor.id)
+    except AnalyticsError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.get("/subjects/{subject_id}", response_model=SubjectAnalytics)
+def get_subject_analytics(
+    subject_id: int,
+    db: Session = Depends(get_read_db),
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(ExamRegistration, Exam, Subject))
+):
+    """Predmet kroz sve ispitne rokove: ukupno i po roku"""
+    try:
+        return subject_analytics(db, subject_id, current_professor.id)
+    except AnalyticsError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.get("/departments", response_model=DepartmentAnalytics)
+def get_department_analytics(
+    department: Optional[str] = Query(None, max_length=50),
+    year: Optional[int] = Query(None, ge=1, le=4),
+    db: Session = Depends(get_read_db),
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(ExamRegistration, Exam, Subject))
+):
+    """Predmeti departmana i godine sa zbirnom statistikom (bez podataka o studentima)"""
+    return department_analytics(db, department, year)
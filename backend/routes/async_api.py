@@ -0,0 +1,134 @@
+# routes/async_api.py
+"""
+Async varijante endpoint-a za ispitni rok - login i studentske rute (DB_ASYNC_MODE=true)
+Isti URL-ovi i odgovori kao sinhrone rute, ali bez thread-a po zahtevu:
+upiti idu preko AsyncSession-a, a postojeća sinhrona logika se
+poziva kroz AsyncSession.run_sync umesto da se duplira.
+"""
+import time
+from typing import List
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from dependencies import get_async_db, get_current_student_async
+from models import Student, Subject, Exam, ExamRegistration, Professor
+from schemas import (
+    StudentResponse, StudentGradeResponse, SubjectResponse,
+    ExamResponse, ExamRegistrationResponse, StudentExamRegistrationCreate,
+    LoginData, Token
+)
+from services import get_student_grades_service, create_access_token, catalog_cache, conditional_get
+from services.principal_cache import StudentPrincipal
+from services.password_pool import password_pool, PasswordPoolSaturated
+from services.rate_limit import rate_limit
+from routes.auth import password_pool_busy, check_login_limit, login_ip_limit, login_user_limit
+from routes.registrations import student_create_exam_registration, registration_ip_limit, registration_user_limit
+from middleware.metrics import auth_failures
+from config import ACCESS_TOKEN_EXPIRE_MINUTES
+
+# Rute nisu u OpenAPI šemi - dokumentovane su kroz sinhrone rute sa istim ugovorom
+router = APIRouter(tags=["Async"], include_in_schema=False)
+
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit(login_ip_limit))])
+async def login_async(data: LoginData, db: AsyncSession = Depends(get_async_db)):
+    """Login profesora - bcrypt se čeka (await) u pool-u procesa, bez blokiranja thread-a"""
+    started = time.perf_counter()
+    try:
+        # Store limita može biti Redis (blokirajući poziv) - van event loop-a
+        await run_in_threadpool(check_login_limit, login_user_limit, data.username)
+        professor = (
+            await db.execute(select(Professor).where(Professor.username == data.username))
+        ).scalars().first()
+        if not professor:
+            auth_failures.inc("bad_credentials")
+            raise HTTPException(status_code=401, detail="Pogrešni kredencijali")
+
+        try:
+            is_valid, new_hash = await password_pool.verify_async(data.password, professor.password)
+        except PasswordPoolSaturated as e:
+            raise password_pool_busy(e)
+
+        if not is_valid:
+            auth_failures.inc("bad_credentials")
+            raise HTTPException(status_code=401, detail="Pogrešni kredencijali")
+
+        # Cost faktor je promenjen u konfiguraciji - sačuvaj novi hash
+        if new_hash:
+            professor.password = new_hash
+            await db.commit()
+
+        access_token = create_access_token(
+            data={"sub": professor.username, "id": professor.id, "role": "professor"},
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "user_id": professor.id,
+            "user_role": "professor"
+        }
+    finally:
+        password_pool.stats.record("login", time.perf_counter() - started)
+
+@router.get("/students/me", response_model=StudentResponse)
+async def get_student_me_async(
+    current_student: StudentPrincipal = Depends(get_current_student_async),
+    etag: str = Depends(conditional_get(Student))
+):
+    """Dobijanje podataka o trenutno ulogovanom studentu"""
+    return current_student
+
+@router.get("/students/grades", response_model=List[StudentGradeResponse])
+async def get_student_grades_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_student: StudentPrincipal = Depends(get_current_student_async),
+    etag: str = Depends(conditional_get(ExamRegistration, Exam, Subject, Professor))
+):
+    """Ocene trenutno ulogovanog studenta"""
+    return await db.run_sync(get_student_grades_service, current_student.id)
+
+@router.get("/subjects/student", response_model=list[SubjectResponse])
+async def get_all_subjects_student_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_student: StudentPrincipal = Depends(get_current_student_async),
+    etag: str = Depends(conditional_get(Subject, Student, catalog=True))
+):
+    """Lista predmeta relevantnih za studenta - iz keša kataloga (baza samo pri promeni verzije)"""
+    return await db.run_sync(catalog_cache.subjects_for_student, current_student)
+
+@router.get("/exams/student", response_model=list[ExamResponse])
+async def get_all_exams_student_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_student: StudentPrincipal = Depends(get_current_student_async),
+    etag: str = Depends(conditional_get(Exam, Subject, Student, catalog=True))
+):
+    """Lista ispita relevantnih za studenta - iz keša kataloga (baza samo pri promeni verzije)"""
+    return await db.run_sync(catalog_cache.exams_for_student, current_student)
+
+@router.get("/exam-registrations/student", response_model=list[ExamRegistrationResponse])
+async def get_my_exam_registrations_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_student: StudentPrincipal = Depends(get_current_student_async),
+    etag: str = Depends(conditional_get(ExamRegistration))
+):
+    """Lista prijava ispita trenutno ulogovanog studenta"""
+    result = await db.execute(
+        select(ExamRegistration).where(ExamRegistration.student_id == current_student.id)
+    )
+    return result.scalars().all()
+
+@router.post(
+    "/exam-registrations/student", response_model=ExamRegistrationResponse,
+    dependencies=[Depends(rate_limit(registration_ip_limit)), Depends(rate_limit(registration_user_limit, key="user"))]
+)
+async def student_create_exam_registration_async(
+    registration: StudentExamRegistrationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_student: StudentPrincipal = Depends(get_current_student_async)
+):
+    """Prijava ispita od strane studenta - ista validacija kao sinhrona ruta"""
+    return await db.run_sync(
+        lambda session: student_create_exam_registration(registration, session, current_student)
+    )
@@ -2,6 +2,7 @@
 """
 Authentication endpoints
 """
+import time
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -11,11 +12,37 @@ from schemas import (
     ProfessorRegister, ProfessorResponse, 
     LoginData, StudentLoginData, Token
 )
-from services import hash_password, verify_password, create_access_token
-from config import ACCESS_TOKEN_EXPIRE_MINUTES
+from services import create_access_token
+from services.password_pool import password_pool, PasswordPoolSaturated
+from services.rate_limit import RateLimit, RateLimitExceeded, rate_limit, too_many_requests
+from middleware.metrics import auth_failures
+from config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES, RATE_LIMIT_LOGIN_IP_PER_MINUTE, RATE_LIMIT_LOGIN_USER_PER_MINUTE
+)
 
 router = APIRouter(tags=["Authentication"])
 
+# Limiti po ruti: po IP adresi (dependency, pre bcrypt-a) i po korisničkom imenu (telo zahteva)
+login_ip_limit = RateLimit("login:ip", RATE_LIMIT_LOGIN_IP_PER_MINUTE)
+login_user_limit = RateLimit("login:user", RATE_LIMIT_LOGIN_USER_PER_MINUTE)
+student_login_ip_limit = RateLimit("students_login:ip", RATE_LIMIT_LOGIN_IP_PER_MINUTE)
+student_login_user_limit = RateLimit("students_login:user", RATE_LIMIT_LOGIN_USER_PER_MINUTE)
+
+def check_login_limit(limit: RateLimit, username: str) -> None:
+    """429 kada je za korisničko ime bilo previše pokušaja (pogađanje lozinke)"""
+    try:
+        limit.hit(username.strip().lower())
+    except RateLimitExceeded as e:
+        raise too_many_requests(e)
+
+def password_pool_busy(error: PasswordPoolSaturated) -> HTTPException:
+    """503 sa Retry-After kada je bcrypt pool zasićen"""
+    return HTTPException(
+        status_code=503,
+        detail="Server je trenutno preopterećen, pokušajte ponovo",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
 @router.post("/register", response_model=ProfessorResponse, status_code=status.HTTP_201_CREATED)
 def register_professor(professor: ProfessorRegister, db: Session = Depends(get_db)):
     """Registracija profesora"""
@@ -24,7 +51,10 @@ def register_professor(professor: ProfessorRegister, db: Session = Depends(get_d
     if db.query(Professor).filter(Professor.username == professor.username).first():
         raise HTTPException(status_code=400, detail="Username već postoji")
 
-    hashed_pw = hash_password(professor.password)
+    try:
+        hashed_pw = password_pool.hash(professor.password)
+    except PasswordPoolSaturated as e:
+        raise password_pool_busy(e)
     db_professor = Professor(
         name=professor.name,
         username=professor.username,
@@ -39,14 +69,37 @@ def register_professor(professor: ProfessorRegister, db: Session = Depends(get_d
     
     return db_professor
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit(login_ip_limit))])
 def login(data: LoginData, db: Session = Depends(get_db)):
     """Login profesora"""
+    started = time.perf_counter()
+    try:
+        return _login_professor(data, db)
+    finally:
+        password_pool.stats.record("login", time.perf_counter() - started)
+
+def _login_professor(data: LoginData, db: Session) -> dict:
+    """Provera kredencijala (bcrypt u pool-u) i izdavanje tokena"""
+    check_login_limit(login_user_limit, data.username)
     professor = db.query(Professor).filter(Professor.username == data.username).first()
+    if not professor:
+        auth_failures.inc("bad_credentials")
+        raise HTTPException(status_code=401, detail="Pogrešni kredencijali")
 
-    if not professor or not verify_password(data.password, professor.password):
+    try:
+        is_valid, new_hash = password_pool.verify(data.password, professor.password)
+    except PasswordPoolSaturated as e:
+        raise password_pool_busy(e)
+
+    if not is_valid:
+        auth_failures.inc("bad_credentials")
         raise HTTPException(status_code=401, detail="Pogrešni kredencijali")
 
+    # Cost faktor je promenjen u konfiguraciji - sačuvaj novi hash
+    if new_hash:
+        professor.password = new_hash
+        db.commit()
+
     access_token = create_access_token(
         data={"sub": professor.username, "id": professor.id, "role": "professor"},
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -58,15 +111,18 @@ def login(data: LoginData, db: Session = Depends(get_db)):
         "user_role": "professor"
     }
 
-@router.post("/students/login", response_model=Token)
+@router.post("/students/login", response_model=Token, dependencies=[Depends(rate_limit(student_login_ip_limit))])
 def login_student(data: StudentLoginData, db: Session = Depends(get_db)):
     """Login studenta"""
+    check_login_limit(student_login_user_limit, data.username)
     student = db.query(Student).filter(Student.username == data.username).first()
 
     if not student:
+        auth_failures.inc("bad_credentials")
         raise HTTPException(status_code=401, detail="Pogrešni kredencijali: Student ne postoji")
 
     if student.index_number != data.index_number:
+        auth_failures.inc("bad_credentials")
         raise HTTPException(status_code=401, detail="Pogrešni kredencijali: Indeks broj nije tačan")
 
     access_token = create_access_token(
@@ -5,8 +5,13 @@ Exam endpoints
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from dependencies import get_db, get_current_professor, get_current_student
-from models import Exam, Subject, Professor, Student
-from schemas import ExamCreate, ExamResponse
+from models import Exam, ExamSeats, Subject, Professor, Student
+from schemas import ExamCreate, ExamResponse, ExamSeatsResponse, ExamScheduleRequest, ExamScheduleProposal
+from services import catalog_cache, conditional_get
+from services.exam_schedule import (
+    check_exam_conflicts, propose_schedule, add_exam_seats, delete_exam_seats, exam_seats, ScheduleError
+)
+from services.registration_queue import delete_exam_tickets
 
 router = APIRouter(prefix="/exams", tags=["Exams"])
 
@@ -16,7 +21,7 @@ def create_exam(
     db: Session = Depends(get_db), 
     current_professor: Professor = Depends(get_current_professor)
 ):
-    """Kreiranje ispita (samo profesor koji predaje predmet)"""
+    """Kreiranje ispita (samo profesor koji predaje predmet) - konflikt kohorte ili sale je 409"""
     subject = db.query(Subject).filter(Subject.id == exam.subject_id).first()
     
     if not subject:
@@ -28,54 +33,71 @@ def create_exam(
             detail=f"Nemate dozvolu da kreirate ispite za predmet '{subject.name}'. Samo profesor {subject.professor_id} može kreirati ispite."
         )
     
+    try:
+        check_exam_conflicts(db, subject, exam.date, exam.slot, exam.room)
+    except ScheduleError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
     db_exam = Exam(**exam.dict())
     db.add(db_exam)
+    db.flush()
+    add_exam_seats(db, db_exam)
     db.commit()
     db.refresh(db_exam)
+    catalog_cache.invalidate()
     return db_exam
 
 @router.get("", response_model=list[ExamResponse])
 def get_all_exams_professor(
     db: Session = Depends(get_db), 
-    current_professor: Professor = Depends(get_current_professor)
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(Exam, Subject, catalog=True))
 ):
-    """Lista ispita profesora (samo ispiti za predmete koje profesor predaje)"""
-    professor_subjects = db.query(Subject).filter(Subject.professor_id == current_professor.id).all()
-    professor_subject_ids = [s.id for s in professor_subjects]
-    
-    exams = db.query(Exam).filter(Exam.subject_id.in_(professor_subject_ids)).all()
-    return exams
+    """Lista ispita profesora (samo ispiti za predmete koje profesor predaje) - iz keša kataloga"""
+    return catalog_cache.exams_for_professor(db, current_professor.id)
 
 @router.get("/student", response_model=list[ExamResponse])
 def get_all_exams_student(
     db: Session = Depends(get_db), 
-    current_student: Student = Depends(get_current_student)
+    current_student: Student = Depends(get_current_student),
+    etag: str = Depends(conditional_get(Exam, Subject, Student, catalog=True))
 ):
-    """Lista ispita relevantnih za studenta (filtrirano po departmanu i godini)"""
-    # Prvo dohvati predmete koji su relevantni za studenta
-    subject_query = db.query(Subject)
-    
-    if current_student.department:
-        subject_query = subject_query.filter(
-            (Subject.department == current_student.department) | (Subject.department == None)
+    """Lista ispita relevantnih za studenta (filtrirano po departmanu i godini) - iz keša kataloga"""
+    return catalog_cache.exams_for_student(db, current_student)
+
+@router.post("/schedule", response_model=ExamScheduleProposal)
+def schedule_exams(
+    request: ExamScheduleRequest,
+    db: Session = Depends(get_db),
+    current_professor: Professor = Depends(get_current_professor)
+):
+    """Predlog rasporeda ispitnog roka bez konflikata kohorti i sala (ništa se ne upisuje)"""
+    try:
+        return propose_schedule(
+            db, request.start, request.end, request.subject_ids, request.rooms, request.skip_weekends
         )
-    
-    subject_query = subject_query.filter(
-        (Subject.year <= current_student.age_of_study) | (Subject.year == None)
-    )
-    
-    relevant_subjects = subject_query.all()
-    relevant_subject_ids = [s.id for s in relevant_subjects]
-    
-    # Vrati samo ispite za te predmete
-    exams = db.query(Exam).filter(Exam.subject_id.in_(relevant_subject_ids)).all()
-    return exams
+    except ScheduleError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.get("/{exam_id}/seats", response_model=ExamSeatsResponse)
+def get_exam_seats(
+    exam_id: int,
+    db: Session = Depends(get_db),
+    current_student: Student = Depends(get_current_student),
+    etag: str = Depends(conditional_get(Exam, ExamSeats))
+):
+    """Kapacitet i slobodna mesta ispitnog roka"""
+    try:
+        return exam_seats(db, exam_id)
+    except ScheduleError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.get("/{exam_id}", response_model=ExamResponse)
 def get_exam(
     exam_id: int, 
     db: Session = Depends(get_db), 
-    current_professor: Professor = Depends(get_current_professor)
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(Exam))
 ):
     """Dobijanje ispita po ID-u (samo profesori)"""
     exam = db.query(Exam).filter(Exam.id == exam_id).first()
@@ -101,6 +123,9 @@ def delete_exam(
     if subject.professor_id != professor.id:
         raise HTTPException(status_code=403, detail="Nemate pravo da obrišete ovaj ispit")
     
+    delete_exam_seats(db, exam_id)
+    delete_exam_tickets(db, exam_id)
     db.delete(exam)
     db.commit()
+    catalog_cache.invalidate()
     return {"success": True}
\ No newline at end of file
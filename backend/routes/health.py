@@ -0,0 +1,29 @@
+# routes/health.py
+"""
+Liveness i readiness probe za load balancer
+/health/live  - proces radi i event loop odgovara (bez baze)
+/health/ready - baza dostupna, pool ima slobodnih konekcija, migracije na head-u
+"""
+import time
+from fastapi import APIRouter, Response, status
+from database import get_engine
+from services.health import ReadinessProbe
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+STARTED_AT = time.time()
+readiness = ReadinessProbe(get_engine)
+
+@router.get("/live")
+async def liveness():
+    """Liveness - async, ne zauzima thread ni konekciju"""
+    return {"status": "alive", "uptime_seconds": round(time.time() - STARTED_AT, 1)}
+
+@router.get("/ready")
+def readiness_check(response: Response):
+    """Readiness - 503 kada worker ne treba da prima saobraćaj"""
+    result = readiness.check()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    response.headers["Cache-Control"] = "no-store"
+    return {"status": "ready" if result["ready"] else "not ready", **result}
@@ -2,11 +2,12 @@
 """
 Professor endpoints
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_professor
+from dependencies import get_db, get_current_professor, PageParams
 from models import Professor
 from schemas import ProfessorResponse
+from services import list_response
 
 router = APIRouter(prefix="/professors", tags=["Professors"])
 
@@ -17,9 +18,10 @@ def get_me(current_professor: Professor = Depends(get_current_professor)):
 
 @router.get("", response_model=list[ProfessorResponse])
 def get_all_professors(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db), 
     current_professor: Professor = Depends(get_current_professor)
 ):
-    """Lista svih profesora (samo za profesore)"""
-    professors = db.query(Professor).all()
-    return professors
\ No newline at end of file
+    """Lista svih profesora (samo za profesore) - paginacija: limit/cursor, format=ndjson"""
+    return list_response(db.query(Professor), Professor.id, page, response, ProfessorResponse)
\ No newline at end of file
@@ -2,78 +2,140 @@
 """
 Exam Registration endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+import io
+import csv
+import time
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_professor, get_current_student
+from dependencies import get_db, get_read_db, get_current_professor, get_current_student, PageParams
 from models import ExamRegistration, Exam, Subject, Student, Professor
-from models.enums import ExamStatus
 from schemas import (
     ExamRegistrationCreate, 
     StudentExamRegistrationCreate,
     ExamRegistrationUpdate, 
-    ExamRegistrationResponse
+    ExamRegistrationResponse,
+    RegistrationTicketResponse
 )
-from services import can_student_register_for_exam
+from services import register_student_for_exam, RegistrationError, list_response, conditional_get
+from services.registration import REGISTRATION_COLUMNS
+from services import sync_transcript
+from services.grading import apply_exam_grades, GradingError
+from services.exam_schedule import take_seat
+from services.registration_queue import registration_queue, TicketError, FINAL_STATUSES
+from services.serialization import RowSerializer
+from services.rate_limit import RateLimit, rate_limit
+from config import RATE_LIMIT_REGISTRATION_IP_PER_MINUTE, RATE_LIMIT_REGISTRATION_USER_PER_MINUTE
 
 router = APIRouter(prefix="/exam-registrations", tags=["Exam Registrations"])
 
-@router.post("/student", response_model=ExamRegistrationResponse)
+# Velike liste prijava - kodiranje Row tuple-ova bez validacije po redu
+REGISTRATION_ROWS = RowSerializer(ExamRegistrationResponse, REGISTRATION_COLUMNS)
+
+# Prijava ispita: po studentu (token) i po IP adresi
+registration_ip_limit = RateLimit("registration:ip", RATE_LIMIT_REGISTRATION_IP_PER_MINUTE)
+registration_user_limit = RateLimit("registration:user", RATE_LIMIT_REGISTRATION_USER_PER_MINUTE)
+
+@router.post(
+    "/student", response_model=ExamRegistrationResponse,
+    dependencies=[Depends(rate_limit(registration_ip_limit)), Depends(rate_limit(registration_user_limit, key="user"))]
+)
 def student_create_exam_registration(
     registration: StudentExamRegistrationCreate,
     db: Session = Depends(get_db),
     current_student: Student = Depends(get_current_student)
 ):
     """Prijava ispita od strane studenta (sa validacijom departmana i godine)"""
-    
-    # 1. Proveri da li ispit postoji
-    exam = db.query(Exam).filter(Exam.id == registration.exam_id).first()
-    if not exam:
-        raise HTTPException(status_code=404, detail="Ispit ne postoji")
-    
-    # 2. NOVA VALIDACIJA - Proveri da li student MOŽE prijaviti ovaj ispit
-    can_register, message = can_student_register_for_exam(current_student, exam, db)
-    if not can_register:
-        raise HTTPException(status_code=403, detail=message)
-    
-    # 3. Dohvati SVE id od ispita za ovaj predmet
-    all_exam_ids_for_subject = [
-        e.id for e in db.query(Exam.id).filter(Exam.subject_id == exam.subject_id).all()
-    ]
-    
-    # 4. Dohvati SVE prijave studenta za ovaj predmet
-    all_registrations = db.query(ExamRegistration).filter(
-        ExamRegistration.student_id == current_student.id,
-        ExamRegistration.exam_id.in_(all_exam_ids_for_subject)
-    ).all()
-    
-    # 5. Provere na osnovu već dohvaćenih podataka
-    for reg in all_registrations:
-        if reg.exam_id == registration.exam_id:
-            if reg.status == ExamStatus.prijavljen:
-                raise HTTPException(status_code=400, detail="Već ste prijavljeni na ovaj ispitni rok")
-            elif reg.status == ExamStatus.pao:
-                raise HTTPException(status_code=400, detail="Već ste pali na ovom roku. Sačekajte novi rok.")
-        
-        if reg.status == ExamStatus.prijavljen:
-            raise HTTPException(
-                status_code=400,
-                detail="Već ste prijavljeni na drugi ispitni rok za ovaj predmet"
-            )
-        
-        if reg.status == ExamStatus.polozio:
-            raise HTTPException(status_code=400, detail="Već ste položili ovaj predmet")
-    
-    # 6. Kreiraj novu prijavu
-    db_registration = ExamRegistration(
-        student_id=current_student.id,
-        exam_id=registration.exam_id,
-        num_of_applications=len(all_registrations) + 1
-    )
-    db.add(db_registration)
-    db.commit()
-    db.refresh(db_registration)
-    
-    return db_registration
+    # Provera uslova, duplikata i upis u jednoj transakciji (vidi services/registration.py)
+    try:
+        return register_student_for_exam(db, current_student, registration.exam_id)
+    except RegistrationError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.post(
+    "/tickets", response_model=RegistrationTicketResponse, status_code=202,
+    dependencies=[Depends(rate_limit(registration_ip_limit)), Depends(rate_limit(registration_user_limit, key="user"))]
+)
+def student_enqueue_exam_registration(
+    registration: StudentExamRegistrationCreate,
+    db: Session = Depends(get_db),
+    current_student: Student = Depends(get_current_student)
+):
+    """
+    Prijava ispita kroz red (rush pri otvaranju prijava): odmah vraća tiket,
+    a prijavu obrađuje worker. Status: GET /tickets/{id} ili SSE /tickets/{id}/events
+    """
+    try:
+        return registration_queue.enqueue(db, current_student, registration.exam_id)
+    except TicketError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.get("/tickets/{ticket_id}", response_model=RegistrationTicketResponse)
+def get_registration_ticket(
+    ticket_id: int,
+    db: Session = Depends(get_db),
+    current_student: Student = Depends(get_current_student)
+):
+    """Status tiketa (polling) - u_redu, lista_cekanja (sa pozicijom), prijavljen, odbijen, otkazan"""
+    try:
+        return registration_queue.get_ticket(db, ticket_id, current_student.id)
+    except TicketError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+# SSE: provera statusa, keep-alive komentar i najduže trajanje jednog stream-a
+TICKET_EVENTS_POLL_SECONDS = 0.5
+TICKET_EVENTS_KEEPALIVE_SECONDS = 15
+TICKET_EVENTS_MAX_SECONDS = 120
+
+@router.get("/tickets/{ticket_id}/events")
+async def registration_ticket_events(
+    ticket_id: int,
+    current_student: Student = Depends(get_current_student)
+):
+    """
+    Status tiketa kao Server-Sent Events: događaj pri svakoj promeni,
+    stream se zatvara na konačnom statusu (klijent se ponovo povezuje posle isteka)
+    """
+    student_id = current_student.id
+    try:
+        first = await run_in_threadpool(registration_queue.read_ticket, ticket_id, student_id)
+    except TicketError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    async def events():
+        ticket = first
+        last = None
+        started = last_sent = time.monotonic()
+        while True:
+            body = RegistrationTicketResponse(**ticket).model_dump_json()
+            if body != last:
+                yield f"event: ticket\ndata: {body}\n\n"
+                last = body
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= TICKET_EVENTS_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            if ticket["status"] in FINAL_STATUSES or time.monotonic() - started >= TICKET_EVENTS_MAX_SECONDS:
+                return
+            await asyncio.sleep(TICKET_EVENTS_POLL_SECONDS)
+            ticket = await run_in_threadpool(registration_queue.read_ticket, ticket_id, student_id)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.delete("/tickets/{ticket_id}", response_model=RegistrationTicketResponse)
+def withdraw_registration_ticket(
+    ticket_id: int,
+    db: Session = Depends(get_db),
+    current_student: Student = Depends(get_current_student)
+):
+    """Otkazivanje tiketa; neocenjena prijava iz reda se briše, a mesto preuzima lista čekanja"""
+    try:
+        return registration_queue.withdraw(db, ticket_id, current_student.id)
+    except TicketError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.post("", response_model=ExamRegistrationResponse)
 def create_exam_registration(
@@ -100,6 +162,9 @@ def create_exam_registration(
     
     db_registration = ExamRegistration(**registration.dict())
     db.add(db_registration)
+    if not take_seat(db, exam.id, exam.capacity):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Nema slobodnih mesta na ovom ispitnom roku")
     db.commit()
     db.refresh(db_registration)
     
@@ -107,26 +172,28 @@ def create_exam_registration(
 
 @router.get("", response_model=list[ExamRegistrationResponse])
 def get_all_exam_registrations(
-    db: Session = Depends(get_db), 
-    current_professor: Professor = Depends(get_current_professor)
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db), 
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(ExamRegistration, Exam, Subject))
 ):
-    """Lista svih prijava za ispite profesora"""
-    professor_subjects = db.query(Subject).filter(Subject.professor_id == current_professor.id).all()
-    professor_subject_ids = [s.id for s in professor_subjects]
-    
-    professor_exams = db.query(Exam).filter(Exam.subject_id.in_(professor_subject_ids)).all()
-    professor_exam_ids = [e.id for e in professor_exams]
-    
-    registrations = db.query(ExamRegistration).filter(
-        ExamRegistration.exam_id.in_(professor_exam_ids)
-    ).all()
+    """Lista svih prijava za ispite profesora - paginacija: limit/cursor, format=ndjson"""
+    # Jedan JOIN upit umesto IN (...) listi, samo kolone iz ExamRegistrationResponse
+    query = (
+        db.query(*REGISTRATION_COLUMNS)
+        .join(Exam, ExamRegistration.exam_id == Exam.id)
+        .join(Subject, Exam.subject_id == Subject.id)
+        .filter(Subject.professor_id == current_professor.id)
+    )
     
-    return registrations
+    return list_response(query, ExamRegistration.id, page, response, ExamRegistrationResponse, REGISTRATION_ROWS)
 
 @router.get("/student", response_model=list[ExamRegistrationResponse])
 def get_my_exam_registrations(
-    db: Session = Depends(get_db), 
-    current_student: Student = Depends(get_current_student)
+    db: Session = Depends(get_read_db), 
+    current_student: Student = Depends(get_current_student),
+    etag: str = Depends(conditional_get(ExamRegistration))
 ):
     """Lista prijava ispita trenutno ulogovanog studenta"""
     registrations = db.query(ExamRegistration).filter(
@@ -137,12 +204,58 @@ def get_my_exam_registrations(
 @router.get("/exam/{exam_id}", response_model=list[ExamRegistrationResponse])
 def get_exam_registrations_by_exam(
     exam_id: int, 
-    db: Session = Depends(get_db), 
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db), 
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(ExamRegistration))
+):
+    """Lista prijava za određeni ispit - paginacija: limit/cursor, format=ndjson"""
+    query = db.query(*REGISTRATION_COLUMNS).filter(ExamRegistration.exam_id == exam_id)
+    return list_response(query, ExamRegistration.id, page, response, ExamRegistrationResponse, REGISTRATION_ROWS)
+
+@router.put("/exam/{exam_id}/grades", response_model=list[ExamRegistrationResponse])
+def grade_exam(
+    exam_id: int,
+    grades: dict[int, ExamRegistrationUpdate],
+    db: Session = Depends(get_db),
     current_professor: Professor = Depends(get_current_professor)
 ):
-    """Lista prijava za određeni ispit"""
-    registrations = db.query(ExamRegistration).filter(ExamRegistration.exam_id == exam_id).all()
-    return registrations
+    """
+    Masovni unos ocena za jedan ispit: {registration_id: {grade, points, status}}.
+    Sve izmene u jednoj transakciji; vraća izmenjene prijave.
+    """
+    try:
+        return apply_exam_grades(db, exam_id, current_professor.id, grades)
+    except GradingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.post("/exam/{exam_id}/grades/csv", response_model=list[ExamRegistrationResponse])
+def grade_exam_csv(
+    exam_id: int,
+    file: UploadFile = File(..., description="CSV sa kolonama registration_id,grade,points,status"),
+    db: Session = Depends(get_db),
+    current_professor: Professor = Depends(get_current_professor)
+):
+    """Masovni unos ocena iz CSV fajla (prazno polje = bez izmene)"""
+    reader = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig"))
+    grades = {}
+    errors = []
+    for row_number, row in enumerate(reader, start=1):
+        try:
+            registration_id = int(row.get("registration_id") or "")
+            grades[registration_id] = ExamRegistrationUpdate(**{
+                key: row[key] for key in ("grade", "points", "status") if row.get(key)
+            })
+        except (ValueError, ValidationError) as e:
+            errors.append({"row": row_number, "error": str(e)})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    try:
+        return apply_exam_grades(db, exam_id, current_professor.id, grades)
+    except GradingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.put("/{registration_id}", response_model=ExamRegistrationResponse)
 def update_exam_registration(
@@ -170,9 +283,13 @@ def update_exam_registration(
             detail=f"Nemate dozvolu da menjate ocene za predmet '{subject.name}'. Samo profesor {subject.professor_id} može menjati ocene."
         )
     
-    for key, value in update_data.dict(exclude_unset=True).items():
+    # Eksplicitni null ne briše vrednost - kolone su NOT NULL
+    for key, value in update_data.dict(exclude_unset=True, exclude_none=True).items():
         setattr(registration, key, value)
     
+    # Transkript se ažurira u istoj transakciji (samo ovaj student i predmet)
+    db.flush()
+    sync_transcript(db, [registration.student_id], subject.id)
     db.commit()
     db.refresh(registration)
     return registration
\ No newline at end of file
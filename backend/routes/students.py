@@ -2,26 +2,42 @@
 """
 Student endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_professor, get_current_student
-from models import Student, Professor
+from dependencies import get_db, get_read_db, get_current_professor, get_current_student, PageParams
+from models import Student, Professor, Exam, Subject, ExamRegistration
+from models import StudentTranscript, TranscriptEntry
 from schemas import StudentCreate, StudentResponse
 from typing import List
-from schemas import StudentGradeResponse
-from services import get_student_grades_service
+from schemas import StudentGradeResponse, TranscriptResponse, StudentImportReport
+from typing import Optional
+from services import get_student_grades_service, principal_cache, list_response, conditional_get
+from services import get_student_transcript, delete_student_transcript
+from services.student_import import StudentImporter, iter_lines, iter_records
+from services.serialization import RowSerializer
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
+# Velika lista - kolone iz StudentResponse, kodiranje bez validacije po redu
+STUDENT_ROWS = RowSerializer(StudentResponse, [
+    Student.id, Student.name, Student.username, Student.email,
+    Student.index_number, Student.age_of_study, Student.department
+])
+
 @router.get("/me", response_model=StudentResponse)
-def get_student_me(current_student: Student = Depends(get_current_student)):
+def get_student_me(
+    current_student: Student = Depends(get_current_student),
+    etag: str = Depends(conditional_get(Student))
+):
     """Dobijanje podataka o trenutno ulogovanom studentu"""
     return current_student
 
 @router.get("/grades", response_model=List[StudentGradeResponse])
 def get_student_grades(
-    db: Session = Depends(get_db),
-    current_student = Depends(get_current_student)
+    db: Session = Depends(get_read_db),
+    current_student = Depends(get_current_student),
+    etag: str = Depends(conditional_get(ExamRegistration, Exam, Subject, Professor))
 ):
     """
     Endpoint za dobijanje svih ocena trenutno ulogovanog studenta
@@ -36,6 +52,18 @@ def get_student_grades(
         )
 
 
+@router.get("/transcript", response_model=TranscriptResponse)
+def get_student_transcript_route(
+    db: Session = Depends(get_read_db),
+    current_student = Depends(get_current_student),
+    etag: str = Depends(conditional_get(StudentTranscript, TranscriptEntry))
+):
+    """
+    Transkript trenutno ulogovanog studenta: položeni predmeti, prosek (ponderisan ESPB-om),
+    ukupno ESPB i broj izlazaka - čita se iz materijalizovanog transkripta
+    """
+    return get_student_transcript(db, current_student.id)
+
 @router.post("", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
 def create_student(
     student: StudentCreate, 
@@ -57,20 +85,61 @@ def create_student(
     
     return db_student
 
+@router.post("/import", response_model=StudentImportReport)
+async def import_students(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Podrazumevano po Content-Type"),
+    db: Session = Depends(get_db),
+    current_professor: Professor = Depends(get_current_professor)
+):
+    """
+    Masovni uvoz studenata (samo profesori) - CSV sa headerom ili NDJSON u telu zahteva.
+    Telo se čita kao stream i obrađuje u batch-evima; vraća izveštaj sa greškama po redu.
+    """
+    fmt = format
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            fmt = "csv"
+        elif "ndjson" in content_type or "jsonl" in content_type:
+            fmt = "ndjson"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Podržani formati: text/csv i application/x-ndjson"
+            )
+
+    importer = StudentImporter(db)
+    batch = []
+    async for record in iter_records(iter_lines(request.stream()), fmt):
+        batch.append(record)
+        if len(batch) >= importer.batch_size:
+            await run_in_threadpool(importer.process_batch, batch)
+            batch = []
+    if batch:
+        await run_in_threadpool(importer.process_batch, batch)
+
+    return importer.report()
+
 @router.get("", response_model=list[StudentResponse])
 def get_all_students(
-    db: Session = Depends(get_db), 
-    current_professor: Professor = Depends(get_current_professor)
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db), 
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(Student))
 ):
-    """Lista svih studenata (samo profesori)"""
-    students = db.query(Student).all()
-    return students
+    """Lista svih studenata (samo profesori) - paginacija: limit/cursor, format=ndjson"""
+    return list_response(
+        db.query(*STUDENT_ROWS.columns), Student.id, page, response, StudentResponse, STUDENT_ROWS
+    )
 
 @router.get("/{student_id}", response_model=StudentResponse)
 def get_student(
     student_id: int, 
-    db: Session = Depends(get_db), 
-    current_professor: Professor = Depends(get_current_professor)
+    db: Session = Depends(get_read_db), 
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(Student))
 ):
     """Dobijanje studenta po ID-u (samo profesori)"""
     student = db.query(Student).filter(Student.id == student_id).first()
@@ -90,11 +159,14 @@ def update_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student ne postoji")
     
+    old_username = student.username
     for key, value in student_data.dict().items():
         setattr(student, key, value)
     
     db.commit()
     db.refresh(student)
+    # Keširani tokeni studenta više ne odgovaraju podacima u bazi
+    principal_cache.invalidate_user("student", old_username)
     return student
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -108,8 +180,11 @@ def delete_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student ne postoji")
     
+    username = student.username
+    delete_student_transcript(db, student.id)
     db.delete(student)
     db.commit()
+    principal_cache.invalidate_user("student", username)
     return None
 
 
@@ -2,11 +2,15 @@
 """
 Subject endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_professor, get_current_student
-from models import Subject, Professor, Student
-from schemas import SubjectCreate, SubjectResponse
+from dependencies import get_db, get_current_professor, get_current_student, PageParams
+from models import Subject, SubjectPrerequisite, Professor, Student
+from schemas import SubjectCreate, SubjectResponse, SubjectPrerequisiteCreate, SubjectPrerequisitesResponse
+from services import list_response, catalog_cache, conditional_get
+from services.prerequisites import (
+    add_prerequisite, remove_prerequisite, delete_subject_prerequisites, PrerequisiteError
+)
 
 router = APIRouter(prefix="/subjects", tags=["Subjects"])
 
@@ -21,44 +25,28 @@ def create_subject(
     db.add(db_subject)
     db.commit()
     db.refresh(db_subject)
+    catalog_cache.invalidate()
     return db_subject
 
 @router.get("", response_model=list[SubjectResponse])
 def get_all_subjects(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db), 
-    current_professor: Professor = Depends(get_current_professor)
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(Subject))
 ):
-    """Lista svih predmeta (samo profesori)"""
-    subjects = db.query(Subject).all()
-    
-    print(f"🔍 PROFESOR ID: {current_professor.id}")
-    print(f"📚 PRONAĐENO PREDMETA: {len(subjects)}")
-    for subject in subjects:
-        print(f"   - {subject.name} (ID: {subject.id}, Profesor: {subject.professor_id})")
-    
-    return subjects
+    """Lista svih predmeta (samo profesori) - paginacija: limit/cursor, format=ndjson"""
+    return list_response(db.query(Subject), Subject.id, page, response, SubjectResponse)
+
 @router.get("/student", response_model=list[SubjectResponse])
 def get_all_subjects_student(
     db: Session = Depends(get_db), 
     current_student: Student = Depends(get_current_student),
-
+    etag: str = Depends(conditional_get(Subject, Student, catalog=True))
 ):
-    """Lista predmeta relevantnih za studenta (filtrirano po departmanu i godini)"""
-    query = db.query(Subject)
-    
-    # Filtriraj po departmanu ako student ima definisan departman
-    if current_student.department:
-        query = query.filter(
-            (Subject.department == current_student.department) | (Subject.department == None)
-        )
-    
-    # Filtriraj po godini - student vidi samo predmete svoje ili nižih godina
-    query = query.filter(
-        (Subject.year <= current_student.age_of_study) | (Subject.year == None)
-    )
-    
-    subjects = query.all()
-    return subjects
+    """Lista predmeta relevantnih za studenta (filtrirano po departmanu i godini) - iz keša kataloga"""
+    return catalog_cache.subjects_for_student(db, current_student)
 
 @router.delete("/delete/{subject_id}")
 def delete_subject(
@@ -76,7 +64,56 @@ def delete_subject(
             status_code=403,
             detail="Nemate dozvolu jer ovo nije vas predmet"
         )
+    delete_subject_prerequisites(db, subject_id)
     db.delete(subject)
     db.commit()
+    catalog_cache.invalidate()
+
+    return {"success": True, "message": f"Predmet '{subject.name}' je uspesno obrisan"}
+
+@router.get("/{subject_id}/prerequisites", response_model=SubjectPrerequisitesResponse)
+def get_subject_prerequisites(
+    subject_id: int,
+    db: Session = Depends(get_db),
+    current_professor: Professor = Depends(get_current_professor),
+    etag: str = Depends(conditional_get(Subject, SubjectPrerequisite, catalog=True))
+):
+    """Direktni i svi (tranzitivni) preduslovi predmeta - iz keša kataloga"""
+    # Izmene grafa podižu samo verziju kataloga - proverava se odmah
+    catalog = catalog_cache.get(db, force=True)
+    if subject_id not in catalog.subjects:
+        raise HTTPException(status_code=404, detail="Predmet ne postoji")
+    graph = catalog.prerequisites
+    return {
+        "subject_id": subject_id,
+        "direct": [catalog.subjects[i] for i in sorted(graph.direct(subject_id)) if i in catalog.subjects],
+        "transitive": [catalog.subjects[i] for i in sorted(graph.closure(subject_id)) if i in catalog.subjects],
+    }
+
+@router.post("/{subject_id}/prerequisites", status_code=201)
+def create_subject_prerequisite(
+    subject_id: int,
+    data: SubjectPrerequisiteCreate,
+    db: Session = Depends(get_db),
+    current_professor: Professor = Depends(get_current_professor)
+):
+    """Dodavanje preduslova predmetu (samo profesor koji ga predaje) - ciklus u grafu je 409"""
+    try:
+        add_prerequisite(db, subject_id, data.prerequisite_id, current_professor.id)
+    except PrerequisiteError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return {"subject_id": subject_id, "prerequisite_id": data.prerequisite_id}
 
-    return {"success": True, "message": f"Predmet '{subject.name}' je uspesno obrisan"}
\ No newline at end of file
+@router.delete("/{subject_id}/prerequisites/{prerequisite_id}")
+def delete_subject_prerequisite(
+    subject_id: int,
+    prerequisite_id: int,
+    db: Session = Depends(get_db),
+    current_professor: Professor = Depends(get_current_professor)
+):
+    """Uklanjanje preduslova predmeta (samo profesor koji ga predaje)"""
+    try:
+        remove_prerequisite(db, subject_id, prerequisite_id, current_professor.id)
+    except PrerequisiteError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return {"success": True}
@@ -4,11 +4,19 @@ Export svih šema
 """
 from schemas.auth import LoginData, StudentLoginData, Token, ProfessorRegister
 from schemas.user import StudentCreate, StudentResponse, ProfessorResponse,StudentGradeResponse
+from schemas.user import TranscriptEntryResponse, TranscriptResponse
+from schemas.user import StudentImportError, StudentImportReport
 from schemas.academic import (
     SubjectCreate, SubjectResponse,
-    ExamCreate, ExamResponse,
+    SubjectPrerequisiteCreate, SubjectPrerequisitesResponse,
+    ExamCreate, ExamResponse, ExamSeatsResponse,
+    ExamRoom, ExamScheduleRequest, ScheduledExam, UnscheduledSubject, ExamScheduleProposal,
     ExamRegistrationCreate, StudentExamRegistrationCreate,
-    ExamRegistrationUpdate, ExamRegistrationResponse
+    ExamRegistrationUpdate, ExamRegistrationResponse, RegistrationTicketResponse
+)
+from schemas.analytics import (
+    PointsSummary, GradeCurvePoint, DistributionStats,
+    ExamAnalytics, SubjectAnalytics, SubjectSummary, DepartmentAnalytics
 )
 
 __all__ = [
@@ -22,13 +30,34 @@ __all__ = [
     "StudentResponse",
     "ProfessorResponse",
     "StudentGradeResponse",
+    "TranscriptEntryResponse",
+    "TranscriptResponse",
+    "StudentImportError",
+    "StudentImportReport",
     # Academic
     "SubjectCreate",
     "SubjectResponse",
+    "SubjectPrerequisiteCreate",
+    "SubjectPrerequisitesResponse",
     "ExamCreate",
     "ExamResponse",
+    "ExamSeatsResponse",
+    "ExamRoom",
+    "ExamScheduleRequest",
+    "ScheduledExam",
+    "UnscheduledSubject",
+    "ExamScheduleProposal",
     "ExamRegistrationCreate",
     "StudentExamRegistrationCreate",
     "ExamRegistrationUpdate",
-    "ExamRegistrationResponse"
+    "ExamRegistrationResponse",
+    "RegistrationTicketResponse",
+    # Analytics
+    "PointsSummary",
+    "GradeCurvePoint",
+    "DistributionStats",
+    "ExamAnalytics",
+    "SubjectAnalytics",
+    "SubjectSummary",
+    "DepartmentAnalytics"
 ]
\ No newline at end of file
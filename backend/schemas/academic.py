@@ -5,7 +5,7 @@ Academic Pydantic šeme
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import date
-from models.enums import ExamType, ExamStatus
+from models.enums import ExamType, ExamStatus, TicketStatus
 from datetime import datetime
 class SubjectCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
@@ -25,20 +25,69 @@ class SubjectResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SubjectPrerequisiteCreate(BaseModel):
+    prerequisite_id: int
+
+class SubjectPrerequisitesResponse(BaseModel):
+    subject_id: int
+    # Direktni preduslovi i svi preduslovi (tranzitivno zatvorenje)
+    direct: list[SubjectResponse]
+    transitive: list[SubjectResponse]
+
 class ExamCreate(BaseModel):
     subject_id: int
     date: date
     type: ExamType
+    slot: Optional[int] = Field(None, ge=1)
+    room: Optional[str] = Field(None, max_length=50)
+    capacity: Optional[int] = Field(None, ge=1)
 
 class ExamResponse(BaseModel):
     id: int
     subject_id: int
     date: date
     type: ExamType
+    slot: Optional[int] = None
+    room: Optional[str] = None
+    capacity: Optional[int] = None
 
     class Config:
         from_attributes = True
 
+class ExamSeatsResponse(BaseModel):
+    exam_id: int
+    capacity: Optional[int] = None
+    seats_taken: int
+    # None - ispit nema ograničen broj mesta
+    seats_left: Optional[int] = None
+
+class ExamRoom(BaseModel):
+    name: str = Field(..., max_length=50)
+    capacity: int = Field(..., ge=1)
+
+class ExamScheduleRequest(BaseModel):
+    start: date
+    end: date
+    subject_ids: list[int] = Field(..., min_length=1)
+    rooms: list[ExamRoom] = []
+    skip_weekends: bool = True
+
+class ScheduledExam(BaseModel):
+    subject_id: int
+    date: date
+    slot: Optional[int] = None
+    room: Optional[str] = None
+    capacity: Optional[int] = None
+    expected_students: int
+
+class UnscheduledSubject(BaseModel):
+    subject_id: int
+    reason: str
+
+class ExamScheduleProposal(BaseModel):
+    scheduled: list[ScheduledExam]
+    unscheduled: list[UnscheduledSubject]
+
 class ExamRegistrationCreate(BaseModel):
     student_id: int
     exam_id: int
@@ -64,3 +113,13 @@ class ExamRegistrationResponse(BaseModel):
         from_attributes = True
     
 
+class RegistrationTicketResponse(BaseModel):
+    id: int
+    exam_id: int
+    status: TicketStatus
+    detail: Optional[str] = None
+    registration_id: Optional[int] = None
+    # Samo za status lista_cekanja (1 = sledeći na redu)
+    waitlist_position: Optional[int] = None
+    created_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
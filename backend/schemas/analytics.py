@@ -0,0 +1,77 @@
+# schemas/analytics.py
+"""
+Analytics Pydantic šeme (raspodela ocena i prolaznost)
+"""
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import date
+from models.enums import ExamType
+
+
+class PointsSummary(BaseModel):
+    """Poeni ocenjenih prijava: min/max, prosek i percentili"""
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+
+
+class GradeCurvePoint(BaseModel):
+    """Raspon poena za jednu ocenu (5 = nije položio)"""
+    grade: int
+    count: int
+    min_points: float
+    median_points: float
+    max_points: float
+
+
+class DistributionStats(BaseModel):
+    """Prolaznost i raspodela ocena/poena za skup prijava"""
+    registered: int
+    graded: int
+    passed: int
+    failed: int
+    pass_rate: Optional[float] = None
+    average_grade: Optional[float] = None
+    # ocena -> broj prijava (5 = pao)
+    grades: Dict[int, int]
+    # 10 grupa po 10 poena: 0-9, 10-19, ..., 90-100
+    points_histogram: List[int]
+    points: PointsSummary
+    # udeo ocenjenih sa bar 0, 10, ..., 100 poena
+    points_share_at_least: List[float]
+    grade_curve: List[GradeCurvePoint]
+
+
+class ExamAnalytics(DistributionStats):
+    """Statistika jednog ispitnog roka"""
+    exam_id: int
+    subject_id: int
+    date: date
+    type: ExamType
+
+
+class SubjectAnalytics(BaseModel):
+    """Predmet kroz sve ispitne rokove"""
+    subject_id: int
+    name: str
+    overall: DistributionStats
+    sittings: List[ExamAnalytics]
+
+
+class SubjectSummary(DistributionStats):
+    """Jedan predmet u pregledu departmana"""
+    subject_id: int
+    name: str
+    year: Optional[int] = None
+
+
+class DepartmentAnalytics(BaseModel):
+    """Predmeti departmana (i godine) sa zbirnom statistikom"""
+    department: Optional[str] = None
+    year: Optional[int] = None
+    overall: DistributionStats
+    subjects: List[SubjectSummary]
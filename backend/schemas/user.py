@@ -3,8 +3,9 @@
 User Pydantic šeme
 """
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
-from datetime import datetime
+from typing import Optional, List
+from datetime import datetime, date
+from models.enums import ExamType
 
 class StudentCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
@@ -48,3 +49,43 @@ class StudentGradeResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class TranscriptEntryResponse(BaseModel):
+    """Šema za položeni predmet u transkriptu"""
+    subject_id: int
+    subject_name: str
+    espb: int
+    grade: int
+    points: Optional[int] = None
+    exam_date: date
+    exam_type: ExamType
+    professor_name: str
+
+    class Config:
+        from_attributes = True
+
+
+class TranscriptResponse(BaseModel):
+    """Šema za transkript studenta (prosek ponderisan ESPB-om)"""
+    average_grade: Optional[float] = None
+    total_espb: int
+    passed_count: int
+    attempts: int
+    subjects: List[TranscriptEntryResponse]
+
+
+class StudentImportError(BaseModel):
+    """Greška jednog reda pri masovnom uvozu"""
+    row: int
+    error: str
+
+
+class StudentImportReport(BaseModel):
+    """Izveštaj masovnog uvoza studenata"""
+    received: int
+    imported: int
+    failed: int
+    errors: List[StudentImportError]
+    elapsed_seconds: float
+    rows_per_second: float
@@ -3,13 +3,35 @@
 Export servisa
 """
 from services.auth import verify_password, hash_password, create_access_token
-from services.validation import can_student_register_for_exam
+from services.validation import can_student_register_for_exam, student_subject_filters
 from services.grades import get_student_grades_service
+from services.principal_cache import principal_cache
+from services.catalog_cache import catalog_cache
+from services.table_versions import mark_tables_changed, table_versions
+from services.http_cache import conditional_get
+from services.registration import register_student_for_exam, RegistrationError
+from services.pagination import list_response
+from services.transcript import (
+    sync_transcript, rebuild_transcripts, delete_student_transcript, get_student_transcript
+)
 
 __all__ = [
     "verify_password",
     "hash_password",
     "create_access_token",
     "can_student_register_for_exam",
-    "get_student_grades_service"
+    "student_subject_filters",
+    "get_student_grades_service",
+    "principal_cache",
+    "catalog_cache",
+    "mark_tables_changed",
+    "table_versions",
+    "conditional_get",
+    "register_student_for_exam",
+    "RegistrationError",
+    "list_response",
+    "sync_transcript",
+    "rebuild_transcripts",
+    "delete_student_transcript",
+    "get_student_transcript"
 ]
\ No newline at end of file
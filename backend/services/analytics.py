@@ -0,0 +1,303 @@
+# services/analytics.py
+"""
+Analitika ispita: prolaznost, raspodela ocena i poena
+Brojevi (prijavljeni, ocenjeni, položili, ocene 6-10, zbir ocena) računaju se
+u bazi jednim GROUP BY upitom sa FILTER klauzulama. Percentili, histogram
+poena i kriva poeni -> ocena računaju se NumPy-jem nad kolonama poena i ocena
+ocenjenih prijava. Rezultati se keširaju po verziji tabela prijava, ispita i
+predmeta - unos ocene menja verziju, pa keš ne vraća zastarele brojeve.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from sqlalchemy import select, func, and_, case
+from sqlalchemy.orm import Session
+from models import Exam, Subject, ExamRegistration
+from models.enums import ExamStatus
+from services.table_versions import table_versions
+from services.version_store import version_store
+from config import ANALYTICS_CACHE_MAX_SIZE, ANALYTICS_CACHE_MAX_AGE_SECONDS
+
+FAILING_GRADE = 5
+PASSING_GRADES = tuple(range(6, 11))
+PERCENTILES = (25, 50, 75, 90)
+# Pragovi za udeo ocenjenih sa bar toliko poena
+POINT_THRESHOLDS = tuple(range(0, 101, 10))
+ANALYTICS_TABLES = tuple(sorted(model.__tablename__ for model in (ExamRegistration, Exam, Subject)))
+
+GRADED = ExamRegistration.status != ExamStatus.prijavljen
+PASSED = ExamRegistration.status == ExamStatus.polozio
+FAILED = ExamRegistration.status == ExamStatus.pao
+
+
+class AnalyticsError(Exception):
+    """Analitika odbijena - nosi HTTP status i poruku za korisnika"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _count_columns() -> list:
+    """Agregati jedne grupe prijava (FILTER umesto posebnog upita po brojaču)"""
+    return [
+        func.count().label("registered"),
+        func.count().filter(GRADED).label("graded"),
+        func.count().filter(PASSED).label("passed"),
+        func.count().filter(FAILED).label("failed"),
+        func.coalesce(func.sum(ExamRegistration.grade).filter(PASSED), 0).label("grade_sum"),
+        *(
+            func.count().filter(and_(PASSED, ExamRegistration.grade == grade)).label(f"grade_{grade}")
+            for grade in PASSING_GRADES
+        ),
+    ]
+
+
+def _grouped(db: Session, key, conditions: list, join_subject: bool = False) -> tuple[dict, dict]:
+    """
+    ({ključ: agregati}, {ključ: (ocene, poeni, položio)}) za prijave koje
+    zadovoljavaju uslove, grupisane po `key`
+    """
+    import numpy as np
+
+    def scoped(statement):
+        statement = statement.select_from(ExamRegistration).join(Exam, ExamRegistration.exam_id == Exam.id)
+        if join_subject:
+            statement = statement.join(Subject, Exam.subject_id == Subject.id)
+        return statement.where(*conditions)
+
+    counts = {
+        row.key: dict(row._mapping)
+        for row in db.execute(scoped(select(key.label("key"), *_count_columns())).group_by(key))
+    }
+
+    # Jedna kolona poena po ocenjenoj prijavi, sortirano po grupi - deli se bez petlje po redovima
+    rows = db.execute(
+        scoped(select(
+            key,
+            func.coalesce(ExamRegistration.grade, 0),
+            func.coalesce(ExamRegistration.points, 0),
+            case((PASSED, 1), else_=0),
+        )).where(GRADED).order_by(key)
+    ).all()
+    data = np.array(rows, dtype=np.int64).reshape(-1, 4)
+    keys, starts = np.unique(data[:, 0], return_index=True)
+    groups = {
+        int(group_key): (part[:, 1], part[:, 2], part[:, 3].astype(bool))
+        for group_key, part in zip(keys, np.split(data, starts[1:]))
+    }
+    return counts, groups
+
+
+def _points_stats(grades, points, passed) -> dict:
+    """Histogram, percentili, udeo iznad praga i raspon poena po oceni (vektorski)"""
+    import numpy as np
+
+    if points.size == 0:
+        return {
+            "points_histogram": [0] * 10,
+            "points": {},
+            "points_share_at_least": [0.0] * len(POINT_THRESHOLDS),
+            "grade_curve": [],
+        }
+
+    histogram = np.bincount(np.clip(points // 10, 0, 9), minlength=10)
+    percentiles = np.percentile(points, PERCENTILES)
+    ordered = np.sort(points)
+    share = 1.0 - np.searchsorted(ordered, POINT_THRESHOLDS, side="left") / ordered.size
+
+    # Pao = ocena 5, bez obzira na upisanu ocenu
+    effective = np.where(passed, grades, FAILING_GRADE)
+    curve = []
+    for grade in (FAILING_GRADE, *PASSING_GRADES):
+        selected = points[effective == grade]
+        if selected.size:
+            curve.append({
+                "grade": grade,
+                "count": int(selected.size),
+                "min_points": float(selected.min()),
+                "median_points": float(np.median(selected)),
+                "max_points": float(selected.max()),
+            })
+
+    return {
+        "points_histogram": histogram.tolist(),
+        "points": {
+            "min": float(ordered[0]),
+            "max": float(ordered[-1]),
+            "mean": round(float(points.mean()), 2),
+            **{f"p{p}": float(value) for p, value in zip(PERCENTILES, percentiles)},
+        },
+        "points_share_at_least": [round(float(value), 4) for value in share],
+        "grade_curve": curve,
+    }
+
+
+def _distribution(counts, arrays) -> dict:
+    """DistributionStats iz agregata baze i NumPy nizova jedne grupe"""
+    import numpy as np
+
+    if arrays is None:
+        empty = np.empty(0, dtype=np.int64)
+        arrays = (empty, empty, empty.astype(bool))
+    registered = counts["registered"] if counts else 0
+    graded = counts["graded"] if counts else 0
+    passed = counts["passed"] if counts else 0
+    failed = counts["failed"] if counts else 0
+    grades = {FAILING_GRADE: failed}
+    grades.update({grade: counts[f"grade_{grade}"] if counts else 0 for grade in PASSING_GRADES})
+    return {
+        "registered": registered,
+        "graded": graded,
+        "passed": passed,
+        "failed": failed,
+        "pass_rate": round(passed / graded, 4) if graded else None,
+        "average_grade": round(counts["grade_sum"] / passed, 2) if passed else None,
+        "grades": grades,
+        **_points_stats(*arrays),
+    }
+
+
+def _overall(counts: dict, groups: dict) -> dict:
+    """Zbirna statistika svih grupa (brojevi se sabiraju, nizovi spajaju)"""
+    import numpy as np
+
+    total = {}
+    for row in counts.values():
+        for name, value in row.items():
+            if name != "key":
+                total[name] = total.get(name, 0) + (value or 0)
+    if not groups:
+        return _distribution(total or None, None)
+    parts = list(groups.values())
+    arrays = tuple(np.concatenate([part[index] for part in parts]) for index in range(3))
+    return _distribution(total or None, arrays)
+
+
+class AnalyticsCache:
+    """
+    Rezultati analitike po (vrsta, parametri) - važe dok se verzije tabela ne promene.
+    Verzije po procesu (bez CACHE_REDIS_URL) ne vide upise drugih worker-a,
+    pa rezultat tada važi i najviše max_age sekundi.
+    """
+
+    def __init__(self, max_size: int = ANALYTICS_CACHE_MAX_SIZE, max_age: float = ANALYTICS_CACHE_MAX_AGE_SECONDS,
+                 store=version_store):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], dict]) -> dict:
+        # Verzije se čitaju PRE računanja - izmena u međuvremenu samo izaziva novo računanje
+        versions = tuple(table_versions(ANALYTICS_TABLES).values())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions and (self.store.shared or now - entry[2] < self.max_age):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = (versions, result, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+analytics_cache = AnalyticsCache()
+
+
+def _owned_subject(db: Session, subject_id: int, professor_id: int):
+    subject = db.execute(
+        select(Subject.id, Subject.name, Subject.professor_id, Subject.year).where(Subject.id == subject_id)
+    ).first()
+    if subject is None:
+        raise AnalyticsError(404, "Predmet ne postoji")
+    if subject.professor_id != professor_id:
+        raise AnalyticsError(403, "Analitika je dostupna samo profesoru predmeta")
+    return subject
+
+
+def _exam_fields(exam) -> dict:
+    return {"exam_id": exam.id, "subject_id": exam.subject_id, "date": exam.date, "type": exam.type}
+
+
+def exam_analytics(db: Session, exam_id: int, professor_id: int) -> dict:
+    """Statistika jednog ispitnog roka (samo profesor predmeta)"""
+    exam = db.execute(select(Exam.id, Exam.subject_id, Exam.date, Exam.type).where(Exam.id == exam_id)).first()
+    if exam is None:
+        raise AnalyticsError(404, "Ispit ne postoji")
+    _owned_subject(db, exam.subject_id, professor_id)
+
+    def compute():
+        counts, groups = _grouped(db, ExamRegistration.exam_id, [ExamRegistration.exam_id == exam_id])
+        return {**_exam_fields(exam), **_distribution(counts.get(exam_id), groups.get(exam_id))}
+
+    return analytics_cache.get_or_compute(("exam", exam_id), compute)
+
+
+def subject_analytics(db: Session, subject_id: int, professor_id: int) -> dict:
+    """Predmet kroz sve ispitne rokove (samo profesor predmeta)"""
+    subject = _owned_subject(db, subject_id, professor_id)
+
+    def compute():
+        exams = db.execute(
+            select(Exam.id, Exam.subject_id, Exam.date, Exam.type)
+            .where(Exam.subject_id == subject_id).order_by(Exam.date, Exam.id)
+        ).all()
+        counts, groups = _grouped(db, ExamRegistration.exam_id, [Exam.subject_id == subject_id])
+        return {
+            "subject_id": subject.id,
+            "name": subject.name,
+            "overall": _overall(counts, groups),
+            "sittings": [
+                {**_exam_fields(exam), **_distribution(counts.get(exam.id), groups.get(exam.id))}
+                for exam in exams
+            ],
+        }
+
+    return analytics_cache.get_or_compute(("subject", subject_id), compute)
+
+
+def department_analytics(db: Session, department: Optional[str], year: Optional[int]) -> dict:
+    """Predmeti departmana i/ili godine sa zbirnom statistikom (zbirni brojevi, bez podataka o studentima)"""
+    conditions = []
+    if department is not None:
+        conditions.append(Subject.department == department)
+    if year is not None:
+        conditions.append(Subject.year == year)
+
+    def compute():
+        subjects = db.execute(
+            select(Subject.id, Subject.name, Subject.year).where(*conditions).order_by(Subject.id)
+        ).all()
+        counts, groups = _grouped(db, Exam.subject_id, conditions, join_subject=True)
+        return {
+            "department": department,
+            "year": year,
+            "overall": _overall(counts, groups),
+            "subjects": [
+                {
+                    "subject_id": subject.id,
+                    "name": subject.name,
+                    "year": subject.year,
+                    **_distribution(counts.get(subject.id), groups.get(subject.id)),
+                }
+                for subject in subjects
+            ],
+        }
+
+    return analytics_cache.get_or_compute(("department", department, year), compute)
@@ -1,27 +1,57 @@
 # services/auth.py
 """
 Authentication servisi: JWT i password hashing
+passlib i jose se učitavaju pri prvom korišćenju (ne pri importu) - kraći start worker-a
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import jwt
-from passlib.context import CryptContext
-from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, BCRYPT_ROUNDS
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class InvalidTokenError(Exception):
+    """JWT nije validan (potpis, istek ili format)"""
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """CryptContext - min/max rounds = BCRYPT_ROUNDS, pa hash sa drugačijim cost faktorom "needs update" """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=BCRYPT_ROUNDS,
+        bcrypt__min_rounds=BCRYPT_ROUNDS,
+        bcrypt__max_rounds=BCRYPT_ROUNDS,
+    )
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Provera da li se plain password poklapa sa hashed"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Provera passworda; vraća (ok, novi_hash) - novi hash ako se cost faktor promenio"""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 def hash_password(password: str) -> str:
     """Hash-ovanje passworda"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Kreiranje JWT access tokena"""
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def decode_access_token(token: str) -> dict:
+    """Dekodiranje i provera JWT-a; InvalidTokenError ako token nije validan"""
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError as e:
+        raise InvalidTokenError(str(e)) from e
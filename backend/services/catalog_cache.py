@@ -0,0 +1,196 @@
+# services/catalog_cache.py
+"""
+Keš kataloga predmeta i ispita
+Ceo katalog (nekoliko stotina predmeta i ispita) drži se u memoriji kao
+read-only snapshot-i, indeksiran po kohorti (departman, godina) i po profesoru.
+Izmene (create/delete predmeta i ispita) podižu verziju u version store-u;
+svaki worker proverava verziju najviše jednom u CATALOG_VERSION_CHECK_SECONDS
+i ponovo učitava katalog kada se promeni. Bez zajedničkog store-a (CACHE_REDIS_URL)
+izmene drugih worker-a se ne vide u verziji, pa se katalog ponovo učitava i
+kada je stariji od CATALOG_MAX_AGE_SECONDS. Skupovi dozvoljenih predmeta/ispita
+po kohorti (services/eligibility.py) i zatvorenje grafa preduslova
+(services/prerequisites.py) se pri tome samo dopunjuju izmenama.
+"""
+import time
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models import Subject, Exam
+from models.enums import ExamType
+from services.version_store import version_store, CATALOG_VERSION_KEY
+from services.eligibility import eligibility, Cohort, CohortEligibility, cohort_of
+from services.prerequisites import PrerequisiteGraph, PrerequisiteRule, load_edges
+from config import CATALOG_VERSION_CHECK_SECONDS, CATALOG_MAX_AGE_SECONDS
+
+
+@dataclass(frozen=True)
+class SubjectSnapshot:
+    id: int
+    name: str
+    espb: int
+    professor_id: int
+    year: Optional[int] = None
+    department: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ExamSnapshot:
+    id: int
+    subject_id: int
+    date: date
+    type: ExamType
+    slot: Optional[int] = None
+    room: Optional[str] = None
+    capacity: Optional[int] = None
+
+
+class Catalog:
+    """Jedna verzija kataloga sa indeksima"""
+
+    def __init__(self, version: int, subjects: list, exams: list, prerequisites: Optional[list] = None):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.subjects = {s.id: s for s in subjects}
+        self.exams = {e.id: e for e in exams}
+        self.exams_by_subject: dict[int, list] = {}
+        for exam in exams:
+            self.exams_by_subject.setdefault(exam.subject_id, []).append(exam)
+        self.subjects_by_professor: dict[int, list] = {}
+        for subject in subjects:
+            self.subjects_by_professor.setdefault(subject.professor_id, []).append(subject)
+        # Graf preduslova (predmet, preduslov); zatvorenje se puni na prvi upit po predmetu
+        self.prerequisites = PrerequisiteGraph(prerequisites or ())
+        # Kohorta -> dozvoljeni predmeti i ispiti; puni se na prvi zahtev kohorte
+        self._cohorts: dict[Cohort, CohortEligibility] = {}
+
+    def cohort(self, cohort: Cohort) -> CohortEligibility:
+        """Predmeti i ispiti koje kohorta sme da vidi i prijavi"""
+        found = self._cohorts.get(cohort)
+        if found is None:
+            found = self._cohorts[cohort] = eligibility.build(self, cohort)
+        return found
+
+    def inherit(self, previous: "Catalog") -> None:
+        """Kohorte i zatvorenje preduslova prethodne verzije - preračunavaju se samo izmene"""
+        self.prerequisites.inherit(previous.prerequisites)
+        for cohort, eligible in previous._cohorts.items():
+            self._cohorts[cohort] = eligibility.update(eligible, previous, self, cohort)
+
+    def exams_for_professor(self, professor_id: int) -> list:
+        return sorted(
+            (e for s in self.subjects_by_professor.get(professor_id, ()) for e in self.exams_by_subject.get(s.id, ())),
+            key=lambda e: e.id
+        )
+
+
+class CatalogCache:
+    """Keš kataloga sa verzionisanom invalidacijom"""
+
+    def __init__(self, store=version_store, check_interval: float = CATALOG_VERSION_CHECK_SECONDS,
+                 max_age: float = CATALOG_MAX_AGE_SECONDS):
+        self.store = store
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.loads = 0
+        self._catalog: Optional[Catalog] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, force: bool = False) -> Catalog:
+        """
+        Trenutni katalog; učitava se iz baze samo kada se verzija promenila.
+        force=True proverava verziju odmah, bez čekanja na check_interval.
+        """
+        catalog = self._catalog
+        now = time.monotonic()
+        if not force and catalog is not None and now - self._checked_at < self.check_interval:
+            return catalog
+
+        version = self.store.get(CATALOG_VERSION_KEY)
+        if self._current(catalog, version, now):
+            self._checked_at = now
+            return catalog
+
+        with self._lock:
+            catalog = self._catalog
+            if not self._current(catalog, version, now):
+                previous = catalog
+                catalog = self._load(db, version)
+                if previous is not None:
+                    catalog.inherit(previous)
+                self._catalog = catalog
+            self._checked_at = now
+        return catalog
+
+    def expect(self, version: int) -> None:
+        """Sledeći get ne vraća katalog starije verzije (ETag kataloga, services/http_cache.py)"""
+        catalog = self._catalog
+        if catalog is None or catalog.version != version:
+            self._checked_at = 0.0
+
+    def _current(self, catalog: Optional[Catalog], version: int, now: float) -> bool:
+        if catalog is None or catalog.version != version:
+            return False
+        # Verzija u memoriji procesa ne vidi izmene drugih worker-a - katalog ima rok trajanja
+        return self.store.shared or now - catalog.loaded_at < self.max_age
+
+    def _load(self, db: Session, version: int) -> Catalog:
+        # Verzija se čita PRE podataka - izmena u međuvremenu samo izaziva novo učitavanje
+        subjects = [
+            SubjectSnapshot(id=r.id, name=r.name, espb=r.espb, professor_id=r.professor_id,
+                            year=r.year, department=r.department)
+            for r in db.execute(select(
+                Subject.id, Subject.name, Subject.espb, Subject.professor_id, Subject.year, Subject.department
+            ).order_by(Subject.id))
+        ]
+        exams = [
+            ExamSnapshot(id=r.id, subject_id=r.subject_id, date=r.date, type=r.type,
+                         slot=r.slot, room=r.room, capacity=r.capacity)
+            for r in db.execute(select(
+                Exam.id, Exam.subject_id, Exam.date, Exam.type, Exam.slot, Exam.room, Exam.capacity
+            ).order_by(Exam.id))
+        ]
+        self.loads += 1
+        return Catalog(version, subjects, exams, load_edges(db))
+
+    def invalidate(self) -> None:
+        """Poziva se posle commit-a izmene predmeta/ispita"""
+        self.store.bump(CATALOG_VERSION_KEY)
+        # Sopstvene izmene su odmah vidljive, bez čekanja na check_interval
+        self._checked_at = 0.0
+
+    def reset(self) -> None:
+        """Odbacuje katalog i kohorte (npr. posle dodavanja pravila kohorte)"""
+        with self._lock:
+            self._catalog = None
+            self._checked_at = 0.0
+
+    def eligible_for(self, db: Session, student) -> CohortEligibility:
+        return self.get(db).cohort(cohort_of(student))
+
+    def subjects_for_student(self, db: Session, student) -> list:
+        return list(self.eligible_for(db, student).subjects)
+
+    def exams_for_student(self, db: Session, student) -> list:
+        return list(self.eligible_for(db, student).exams)
+
+    def exams_for_professor(self, db: Session, professor_id: int) -> list:
+        return self.get(db).exams_for_professor(professor_id)
+
+    def stats(self) -> dict:
+        catalog = self._catalog
+        return {
+            "version": catalog.version if catalog else None,
+            "subjects": len(catalog.subjects) if catalog else 0,
+            "exams": len(catalog.exams) if catalog else 0,
+            "loads": self.loads,
+        }
+
+
+catalog_cache = CatalogCache()
+
+# Preduslovi se proveravaju pri prijavi, posle pravila kohorte
+eligibility.add_student_rule(PrerequisiteRule(catalog_cache.get))
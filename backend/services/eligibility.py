@@ -0,0 +1,191 @@
+# services/eligibility.py
+"""
+Engine za uslove prijave ispita (eligibility)
+Pravila su dve vrste:
+- pravila kohorte (departman, godina studija) zavise samo od predmeta i
+  kohorte (departman, godina), pa se za svaku kohortu unapred računa skup
+  dozvoljenih predmeta i ispita; provera prijave je članstvo u skupu - O(1),
+- pravila studenta (npr. preduslovi, ESPB limit) zavise od istorije studenta
+  i proveravaju se tek pri prijavi, posle pravila kohorte.
+Skupovi kohorti se pri izmeni kataloga ne prave iznova: ponovo se ocenjuju
+samo izmenjeni predmeti i ispiti (EligibilityEngine.update).
+Pravila se registruju pri startu (add_cohort_rule / add_student_rule);
+novo pravilo kohorte dok proces radi zahteva catalog_cache.reset().
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class Cohort:
+    """Studenti istog departmana i godine studija vide iste predmete"""
+    department: Optional[str]
+    age_of_study: int
+
+
+class CohortRule(Protocol):
+    name: str
+
+    def check(self, subject, cohort: Cohort) -> Optional[str]:
+        """None ako kohorta sme da prijavi predmet, inače poruka za korisnika"""
+
+
+class StudentRule(Protocol):
+    """Pravilo može imati i check_many(db, students, subject) -> {student_id: poruka} za obradu u grupi"""
+    name: str
+
+    def check(self, db: Session, student, subject) -> Optional[str]:
+        """None ako student sme da prijavi predmet, inače poruka za korisnika"""
+
+
+class DepartmentRule:
+    """Predmet sa departmanom je samo za studente tog departmana"""
+
+    name = "department"
+
+    def check(self, subject, cohort: Cohort) -> Optional[str]:
+        if subject.department and cohort.department and subject.department != cohort.department:
+            return f"Ovaj predmet je samo za smer '{subject.department}'. Vi ste na smeru '{cohort.department}'."
+        return None
+
+
+class YearRule:
+    """Student vidi predmete svoje i nižih godina"""
+
+    name = "year"
+
+    def check(self, subject, cohort: Cohort) -> Optional[str]:
+        if subject.year and cohort.age_of_study < subject.year:
+            return f"Ovaj predmet je za {subject.year}. godinu studija. Vi ste na {cohort.age_of_study}. godini."
+        return None
+
+
+@dataclass(frozen=True)
+class CohortEligibility:
+    """Dozvoljeni predmeti i ispiti jedne kohorte (skupovi za proveru, tuple-ovi za liste)"""
+    subject_ids: frozenset
+    exam_ids: frozenset
+    subjects: tuple
+    exams: tuple
+
+
+def cohort_of(student) -> Cohort:
+    return Cohort(student.department, student.age_of_study)
+
+
+class EligibilityEngine:
+    def __init__(self, cohort_rules: Optional[list] = None, student_rules: Optional[list] = None):
+        self.cohort_rules = list(cohort_rules if cohort_rules is not None else (DepartmentRule(), YearRule()))
+        self.student_rules = list(student_rules or ())
+
+    def add_cohort_rule(self, rule: CohortRule) -> None:
+        self.cohort_rules.append(rule)
+
+    def add_student_rule(self, rule: StudentRule) -> None:
+        self.student_rules.append(rule)
+
+    def subject_reason(self, subject, cohort: Cohort) -> Optional[str]:
+        """Prva poruka pravila kohorte koje predmet ne ispunjava (None = dozvoljen)"""
+        for rule in self.cohort_rules:
+            message = rule.check(subject, cohort)
+            if message:
+                return message
+        return None
+
+    def build(self, catalog, cohort: Cohort) -> CohortEligibility:
+        """Skupovi kohorte od nule (prvi zahtev kohorte)"""
+        subject_ids = {s.id for s in catalog.subjects.values() if self.subject_reason(s, cohort) is None}
+        exam_ids = {e.id for e in catalog.exams.values() if e.subject_id in subject_ids}
+        return self._freeze(catalog, subject_ids, exam_ids)
+
+    def update(self, previous: CohortEligibility, old_catalog, new_catalog, cohort: Cohort) -> CohortEligibility:
+        """Skupovi kohorte za novu verziju kataloga - ocenjuju se samo izmenjeni predmeti i ispiti"""
+        changed_subjects = _changed(old_catalog.subjects, new_catalog.subjects)
+        changed_exams = _changed(old_catalog.exams, new_catalog.exams)
+        if not changed_subjects and not changed_exams:
+            return previous
+
+        subject_ids = set(previous.subject_ids)
+        for subject_id in changed_subjects:
+            subject = new_catalog.subjects.get(subject_id)
+            if subject is not None and self.subject_reason(subject, cohort) is None:
+                subject_ids.add(subject_id)
+            else:
+                subject_ids.discard(subject_id)
+
+        exam_ids = set(previous.exam_ids)
+        # Ispiti izmenjenih predmeta (predmet je možda ušao/izašao iz skupa) i izmenjeni ispiti
+        affected = set(changed_exams)
+        for subject_id in changed_subjects:
+            affected.update(e.id for e in old_catalog.exams_by_subject.get(subject_id, ()))
+            affected.update(e.id for e in new_catalog.exams_by_subject.get(subject_id, ()))
+        for exam_id in affected:
+            exam = new_catalog.exams.get(exam_id)
+            if exam is not None and exam.subject_id in subject_ids:
+                exam_ids.add(exam_id)
+            else:
+                exam_ids.discard(exam_id)
+        return self._freeze(new_catalog, subject_ids, exam_ids)
+
+    @staticmethod
+    def _freeze(catalog, subject_ids: set, exam_ids: set) -> CohortEligibility:
+        return CohortEligibility(
+            subject_ids=frozenset(subject_ids),
+            exam_ids=frozenset(exam_ids),
+            subjects=tuple(catalog.subjects[i] for i in sorted(subject_ids)),
+            exams=tuple(catalog.exams[i] for i in sorted(exam_ids)),
+        )
+
+    def registration_reason(self, db: Session, student, exam_id: int, subject,
+                            eligible: Optional[CohortEligibility] = None) -> Optional[str]:
+        """
+        None ako student sme da prijavi ispit, inače poruka.
+        `subject` je sveže pročitan predmet ispita; skup kohorte (O(1)) je brza
+        putanja, a pravila se nad `subject` ocenjuju samo kada ispit nije u skupu
+        (odbijanje ili ispit još nije u kešu kataloga).
+        """
+        if eligible is None or exam_id not in eligible.exam_ids:
+            message = self.subject_reason(subject, cohort_of(student))
+            if message:
+                return message
+        for rule in self.student_rules:
+            message = rule.check(db, student, subject)
+            if message:
+                return message
+        return None
+
+    def registration_reasons(self, db: Session, students: list, exam_id: int, subject,
+                             eligible_for: Callable) -> dict:
+        """
+        registration_reason za više studenata istog ispita (red prijava).
+        Vraća {student_id: poruka} samo za odbijene; pravila sa check_many
+        proveravaju sve studente jednim upitom.
+        """
+        reasons = {}
+        for student in students:
+            eligible = eligible_for(student)
+            if eligible is None or exam_id not in eligible.exam_ids:
+                message = self.subject_reason(subject, cohort_of(student))
+                if message:
+                    reasons[student.id] = message
+        remaining = [student for student in students if student.id not in reasons]
+        for rule in self.student_rules:
+            if not remaining:
+                break
+            check_many = getattr(rule, "check_many", None)
+            if check_many is not None:
+                found = check_many(db, remaining, subject)
+            else:
+                found = {student.id: rule.check(db, student, subject) for student in remaining}
+            reasons.update((key, message) for key, message in found.items() if message)
+            remaining = [student for student in remaining if student.id not in reasons]
+        return reasons
+
+
+def _changed(old: dict, new: dict) -> set:
+    """Ključevi dodati, obrisani ili izmenjeni između dve verzije (snapshot-i su frozen dataclass-e)"""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+eligibility = EligibilityEngine()
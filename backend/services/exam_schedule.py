@@ -0,0 +1,294 @@
+# services/exam_schedule.py
+"""
+Raspored ispita: konflikti, predlog rasporeda za ispitni rok i mesta u sali
+Kohorta predmeta je (departman, godina); None važi za sve departmane/godine.
+Dva ispita su u konfliktu ako su:
+- istog dana, različitih predmeta, a kohorte im se preklapaju (student ne
+  polaže dva predmeta u danu; pismeni i usmeni istog predmeta mogu biti isti dan),
+- u istoj sali, istog dana i u istom terminu (ispit bez termina zauzima salu ceo dan).
+Kohorta je godina predmeta, ne svi koji ga smeju prijaviti: YearRule dozvoljava
+i predmete nižih godina, pa student koji prenosi ispit iz niže godine može imati
+dva ispita istog dana. Raspored štiti redovne studente godine; širi uslov
+(godina <= godina) bi vezao sve godine departmana u jedan blok dana.
+ScheduleIndex drži zauzeća po danu (date -> ispiti), pa provera jednog ispita
+pregleda samo taj dan. Predlog rasporeda boji graf konflikata predmeta
+(DSatur): boje su dani roka, a sala se bira najmanja koja prima kohortu.
+Mesta se zauzimaju uslovnim UPDATE-om brojača (Exam_Seats) u transakciji
+prijave - sala ne može biti prepunjena ni pri istovremenim prijavama.
+Dok ispit ima listu čekanja (red prijava), oslobođeno mesto pripada prvom
+tiketu sa liste, ne direktnoj prijavi.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import select, update, delete, func, exists
+from sqlalchemy.orm import Session
+from models import Subject, Exam, ExamSeats, Student, RegistrationTicket, TicketStatus
+from config import EXAM_SLOTS_PER_DAY, REGISTRATION_QUEUE_ENABLED
+
+# Ključ PostgreSQL advisory lock-a - izmene rasporeda se serijalizuju
+SCHEDULE_LOCK_KEY = 24001
+# Najduži rok za koji se pravi predlog
+MAX_SCHEDULE_DAYS = 366
+
+
+class ScheduleError(Exception):
+    """Raspored odbijen - nosi HTTP status i poruku za korisnika"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Ispit (postojeći ili predložen) u rasporedu"""
+    subject_id: int
+    name: str
+    department: Optional[str]
+    year: Optional[int]
+    date: date
+    slot: Optional[int] = None
+    room: Optional[str] = None
+
+
+def cohorts_overlap(department, year, other_department, other_year) -> bool:
+    """Da li neki student pripada obema kohortama"""
+    return (
+        (department is None or other_department is None or department == other_department)
+        and (year is None or other_year is None or year == other_year)
+    )
+
+
+class ScheduleIndex:
+    """Zauzeća po danu - kohorte i sale"""
+
+    def __init__(self, placements: Iterable[Placement] = ()):
+        self.by_day: dict[date, list] = {}
+        for placement in placements:
+            self.add(placement)
+
+    def add(self, placement: Placement) -> None:
+        self.by_day.setdefault(placement.date, []).append(placement)
+
+    def cohort_conflict(self, department, year, day: date, subject_id: Optional[int] = None) -> Optional[Placement]:
+        for placement in self.by_day.get(day, ()):
+            if placement.subject_id == subject_id:
+                # Drugi ispit istog predmeta (npr. usmeni posle pismenog) - salu čuva room_conflict
+                continue
+            if cohorts_overlap(department, year, placement.department, placement.year):
+                return placement
+        return None
+
+    def room_conflict(self, room: Optional[str], day: date, slot: Optional[int]) -> Optional[Placement]:
+        if room is None:
+            return None
+        for placement in self.by_day.get(day, ()):
+            if placement.room == room and (slot is None or placement.slot is None or placement.slot == slot):
+                return placement
+        return None
+
+    def conflict_reason(self, candidate: Placement) -> Optional[str]:
+        """Poruka za prvi konflikt kandidata (None ako ga nema)"""
+        found = self.cohort_conflict(candidate.department, candidate.year, candidate.date, candidate.subject_id)
+        if found:
+            return f"Studenti ovog predmeta već imaju ispit tog dana: '{found.name}' ({found.date})"
+        found = self.room_conflict(candidate.room, candidate.date, candidate.slot)
+        if found:
+            return f"Sala '{candidate.room}' je zauzeta u tom terminu (ispit '{found.name}')"
+        return None
+
+
+def load_index(db: Session, start: date, end: date) -> ScheduleIndex:
+    """Ispiti između start i end (uključivo) - jedan upit preko ix_exams_date"""
+    rows = db.execute(
+        select(
+            Exam.subject_id, Subject.name, Subject.department, Subject.year, Exam.date, Exam.slot, Exam.room
+        )
+        .join(Subject, Subject.id == Exam.subject_id)
+        .where(Exam.date >= start, Exam.date <= end)
+    ).all()
+    return ScheduleIndex(Placement(*row) for row in rows)
+
+
+def _lock_schedule(db: Session) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # Dva istovremena ispita u konfliktu ne mogu oba proći proveru
+        db.execute(select(func.pg_advisory_xact_lock(SCHEDULE_LOCK_KEY)))
+
+
+def _check_slot(slot: Optional[int]) -> None:
+    if slot is not None and slot > EXAM_SLOTS_PER_DAY:
+        raise ScheduleError(400, f"Termin mora biti između 1 i {EXAM_SLOTS_PER_DAY}")
+
+
+def check_exam_conflicts(db: Session, subject, exam_date: date, slot: Optional[int], room: Optional[str]) -> None:
+    """Provera pre upisa novog ispita; baca ScheduleError (409) za konflikt. Commit radi pozivalac."""
+    _check_slot(slot)
+    _lock_schedule(db)
+    candidate = Placement(subject.id, subject.name, subject.department, subject.year, exam_date, slot, room)
+    message = load_index(db, exam_date, exam_date).conflict_reason(candidate)
+    if message:
+        db.rollback()
+        raise ScheduleError(409, message)
+
+
+def _expected_students(db: Session, subjects: list) -> dict:
+    """Procena broja studenata po predmetu: studenti kohorte (departman, godina)"""
+    groups = db.execute(
+        select(Student.department, Student.age_of_study, func.count()).group_by(
+            Student.department, Student.age_of_study
+        )
+    ).all()
+    return {
+        s.id: sum(count for department, age, count in groups if cohorts_overlap(s.department, s.year, department, age))
+        for s in subjects
+    }
+
+
+def propose_schedule(db: Session, start: date, end: date, subject_ids: list, rooms: list,
+                     skip_weekends: bool = True) -> dict:
+    """
+    Predlog rasporeda za predmete u roku [start, end] - ništa se ne upisuje.
+    DSatur: sledeći predmet je onaj čiji su susedi u grafu konflikata
+    zauzeli najviše različitih dana (pa najveći stepen), i dobija prvi dan
+    bez konflikta sa slobodnom salom dovoljnog kapaciteta.
+    """
+    if end < start:
+        raise ScheduleError(400, "Kraj roka je pre početka")
+    if (end - start).days >= MAX_SCHEDULE_DAYS:
+        raise ScheduleError(400, f"Rok može trajati najviše {MAX_SCHEDULE_DAYS} dana")
+
+    subject_ids = sorted(set(subject_ids))
+    subjects = db.execute(
+        select(Subject.id, Subject.name, Subject.department, Subject.year).where(Subject.id.in_(subject_ids))
+    ).all()
+    missing = set(subject_ids) - {s.id for s in subjects}
+    if missing:
+        raise ScheduleError(404, f"Predmeti ne postoje: {', '.join(map(str, sorted(missing)))}")
+
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    if skip_weekends:
+        days = [day for day in days if day.weekday() < 5]
+    index = load_index(db, start, end)
+    expected = _expected_students(db, subjects)
+    by_id = {s.id: s for s in subjects}
+    neighbors = {
+        s.id: {t.id for t in subjects if t.id != s.id and cohorts_overlap(s.department, s.year, t.department, t.year)}
+        for s in subjects
+    }
+    # Najmanja sala koja prima kohortu ostavlja veće sale za veće kohorte
+    rooms = sorted(rooms, key=lambda r: (r.capacity, r.name))
+    slots = range(1, EXAM_SLOTS_PER_DAY + 1)
+
+    day_of: dict[int, date] = {}
+    scheduled, unscheduled = [], []
+    pending = set(by_id)
+    while pending:
+        subject_id = max(pending, key=lambda i: (
+            len({day_of[n] for n in neighbors[i] if n in day_of}), len(neighbors[i]), -i
+        ))
+        pending.remove(subject_id)
+        subject = by_id[subject_id]
+        needed = expected[subject_id]
+        fitting = [room for room in rooms if room.capacity >= needed]
+        if rooms and not fitting:
+            unscheduled.append({"subject_id": subject_id, "reason": f"Nijedna sala nema {needed} mesta"})
+            continue
+
+        placement = None
+        for day in days:
+            if index.cohort_conflict(subject.department, subject.year, day, subject.id):
+                continue
+            if not rooms:
+                placement = Placement(subject.id, subject.name, subject.department, subject.year, day)
+                break
+            free = next(
+                ((room, slot) for room in fitting for slot in slots if not index.room_conflict(room.name, day, slot)),
+                None
+            )
+            if free:
+                room, slot = free
+                placement = Placement(
+                    subject.id, subject.name, subject.department, subject.year, day, slot, room.name
+                )
+                break
+
+        if placement is None:
+            unscheduled.append({"subject_id": subject_id, "reason": "Nema slobodnog dana bez konflikta u roku"})
+            continue
+        index.add(placement)
+        day_of[subject_id] = placement.date
+        capacity = next((room.capacity for room in rooms if room.name == placement.room), None)
+        scheduled.append({
+            "subject_id": subject_id, "date": placement.date, "slot": placement.slot,
+            "room": placement.room, "capacity": capacity, "expected_students": needed,
+        })
+
+    scheduled.sort(key=lambda p: (p["date"], p["slot"] or 0, p["subject_id"]))
+    unscheduled.sort(key=lambda p: p["subject_id"])
+    return {"scheduled": scheduled, "unscheduled": unscheduled}
+
+
+def add_exam_seats(db: Session, exam) -> None:
+    """Brojač mesta za novi ispit sa kapacitetom (bez commit-a)"""
+    if exam.capacity is not None:
+        db.add(ExamSeats(exam_id=exam.id, seats_taken=0))
+
+
+def delete_exam_seats(db: Session, exam_id: int) -> None:
+    db.execute(delete(ExamSeats).where(ExamSeats.exam_id == exam_id))
+
+
+def take_seat(db: Session, exam_id: int, capacity: Optional[int]) -> bool:
+    """
+    Zauzima mesto u transakciji direktne prijave; False ako je sala puna ili
+    ispit ima listu čekanja (mesto čeka worker reda prijava - FIFO).
+    Jedan uslovni UPDATE - istovremene prijave čekaju na zaključan red brojača
+    i ponovo proveravaju uslov, pa broj prijava ne može preći kapacitet.
+    """
+    if capacity is None:
+        return True
+    conditions = [ExamSeats.exam_id == exam_id, ExamSeats.seats_taken < capacity]
+    if REGISTRATION_QUEUE_ENABLED:
+        # Bez worker-a lista čekanja se ne obrađuje - tada ne blokira direktne prijave
+        conditions.append(~exists().where(
+            RegistrationTicket.exam_id == exam_id, RegistrationTicket.status == TicketStatus.lista_cekanja
+        ))
+    taken = db.execute(
+        update(ExamSeats)
+        .where(*conditions)
+        .values(seats_taken=ExamSeats.seats_taken + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return taken == 1
+
+
+def release_seat(db: Session, exam_id: int, capacity: Optional[int]) -> None:
+    """Oslobađa mesto (otkazana prijava); lista čekanja ga preuzima u redu prijava"""
+    if capacity is None:
+        return
+    db.execute(
+        update(ExamSeats)
+        .where(ExamSeats.exam_id == exam_id, ExamSeats.seats_taken > 0)
+        .values(seats_taken=ExamSeats.seats_taken - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def exam_seats(db: Session, exam_id: int) -> dict:
+    row = db.execute(
+        select(Exam.id, Exam.capacity, ExamSeats.seats_taken)
+        .outerjoin(ExamSeats, ExamSeats.exam_id == Exam.id)
+        .where(Exam.id == exam_id)
+    ).first()
+    if row is None:
+        raise ScheduleError(404, "Ispit ne postoji")
+    taken = row.seats_taken or 0
+    return {
+        "exam_id": row.id,
+        "capacity": row.capacity,
+        "seats_taken": taken,
+        "seats_left": max(row.capacity - taken, 0) if row.capacity is not None else None,
+    }
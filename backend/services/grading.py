@@ -0,0 +1,97 @@
+# services/grading.py
+"""
+Masovni unos ocena za jedan ispitni rok
+Vlasništvo nad predmetom se proverava jednom, sve izmene idu jednom
+naredbom (UPDATE ... FROM (VALUES ...) na PostgreSQL-u, executemany drugde),
+a transkript se ažurira u istoj transakciji.
+"""
+from sqlalchemy import select, update, values, column, cast, func, bindparam, Integer
+from sqlalchemy.orm import Session
+from models import Exam, Subject, ExamRegistration
+from services.registration import REGISTRATION_COLUMNS
+from services.transcript import sync_transcript
+
+
+class GradingError(Exception):
+    """Unos ocena odbijen - nosi HTTP status i poruku za korisnika"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def apply_exam_grades(db: Session, exam_id: int, professor_id: int, grades: dict) -> list:
+    """
+    Primenjuje {registration_id: ExamRegistrationUpdate} na prijave jednog ispita.
+    Izostavljena (ili null) polja ostaju nepromenjena. Sve ili ništa:
+    ako neka prijava ne pripada ispitu, ništa se ne menja.
+    """
+    subject = db.execute(
+        select(Subject.id, Subject.name, Subject.professor_id)
+        .join(Exam, Exam.subject_id == Subject.id)
+        .where(Exam.id == exam_id)
+    ).first()
+    if subject is None:
+        raise GradingError(404, "Ispit ne postoji")
+    if subject.professor_id != professor_id:
+        raise GradingError(
+            403,
+            f"Nemate dozvolu da menjate ocene za predmet '{subject.name}'. Samo profesor {subject.professor_id} može menjati ocene."
+        )
+    if not grades:
+        return []
+
+    rows = [
+        {
+            "id": registration_id,
+            "grade": data.grade,
+            "points": data.points,
+            "status": data.status.value if data.status is not None else None,
+        }
+        for registration_id, data in grades.items()
+    ]
+
+    table = ExamRegistration.__table__
+    if db.get_bind().dialect.name == "postgresql":
+        incoming = values(
+            column("id", Integer), column("grade", Integer), column("points", Integer), column("status"),
+            name="incoming"
+        ).data([(r["id"], r["grade"], r["points"], r["status"]) for r in rows])
+        changed = db.execute(
+            update(table)
+            .where(table.c.id == incoming.c.id, table.c.exam_id == exam_id)
+            .values(
+                grade=func.coalesce(cast(incoming.c.grade, Integer), table.c.grade),
+                points=func.coalesce(cast(incoming.c.points, Integer), table.c.points),
+                status=func.coalesce(cast(incoming.c.status, table.c.status.type), table.c.status),
+            )
+            .returning(*REGISTRATION_COLUMNS)
+        ).all()
+    else:
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.exam_id == exam_id)
+            .values(
+                grade=func.coalesce(bindparam("b_grade", type_=Integer), table.c.grade),
+                points=func.coalesce(bindparam("b_points", type_=Integer), table.c.points),
+                status=func.coalesce(bindparam("b_status", type_=table.c.status.type), table.c.status),
+            ),
+            [{f"b_{key}": value for key, value in r.items()} for r in rows]
+        )
+        changed = db.execute(
+            select(*REGISTRATION_COLUMNS)
+            .where(ExamRegistration.id.in_(grades.keys()), ExamRegistration.exam_id == exam_id)
+        ).all()
+
+    missing = set(grades.keys()) - {row.id for row in changed}
+    if missing:
+        db.rollback()
+        raise GradingError(
+            400,
+            f"Prijave ne pripadaju ispitu {exam_id}: {', '.join(str(i) for i in sorted(missing))}"
+        )
+
+    sync_transcript(db, {row.student_id for row in changed}, subject.id)
+    db.commit()
+    return sorted(changed, key=lambda row: row.id)
@@ -0,0 +1,93 @@
+# services/health.py
+"""
+Readiness provera: DB ping, slobodne konekcije u pool-u i verzija migracija
+Rezultat se pamti HEALTH_CHECK_INTERVAL_SECONDS - bez obzira koliko često
+load balancer pita, baza dobija najviše jedan ping po intervalu (po procesu).
+Dok jedan zahtev radi proveru, ostali dobijaju poslednji poznati rezultat.
+"""
+import os
+import time
+import threading
+from typing import Callable, Optional
+from sqlalchemy import text
+from config import HEALTH_CHECK_INTERVAL_SECONDS, HEALTH_POOL_MIN_FREE
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def migration_head() -> Optional[str]:
+    """Head revizija iz migrations/ (računa se jednom - ne menja se dok proces radi)"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    heads = ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads()
+    return heads[0] if len(heads) == 1 else None
+
+
+def pool_headroom(engine) -> Optional[int]:
+    """Broj konekcija koje se još mogu uzeti (pool_size + max_overflow - zauzete)"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return pool.size() + max(pool._max_overflow, 0) - pool.checkedout()
+
+
+class ReadinessProbe:
+    def __init__(self, get_engine: Callable, interval: float = HEALTH_CHECK_INTERVAL_SECONDS, min_free: int = HEALTH_POOL_MIN_FREE):
+        # Engine se uzima pri proveri - ne pravi se pri importu rute
+        self.get_engine = get_engine
+        self.interval = interval
+        self.min_free = min_free
+        self.pings = 0
+        self._head: Optional[str] = None
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def check(self) -> dict:
+        """Memoizovan rezultat; nova provera najviše jednom u intervalu"""
+        result = self._result
+        if result is not None and time.monotonic() - self._checked_at < self.interval:
+            return result
+        if not self._lock.acquire(blocking=result is None):
+            return result
+        try:
+            if self._result is None or time.monotonic() - self._checked_at >= self.interval:
+                self._result = self._run()
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+    def _run(self) -> dict:
+        checks = {}
+        engine = self.get_engine()
+        headroom = pool_headroom(engine)
+        checks["pool"] = {"free": headroom, "min_free": self.min_free}
+        if headroom is not None and headroom < self.min_free:
+            # Pool je pun - ping bi čekao na konekciju; worker svakako ne može da primi nove zahteve
+            checks["pool"]["ok"] = False
+            return {"ready": False, "checked_at": time.time(), "checks": checks}
+        checks["pool"]["ok"] = True
+
+        started = time.perf_counter()
+        try:
+            self.pings += 1
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                checks["database"] = {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+                checks["migrations"] = self._check_migrations(connection)
+        except Exception as e:
+            checks.setdefault("database", {"ok": False, "error": type(e).__name__})
+        ready = checks["database"]["ok"] and checks.get("migrations", {}).get("ok", False)
+        return {"ready": ready, "checked_at": time.time(), "checks": checks}
+
+    def _check_migrations(self, connection) -> dict:
+        """Verzija u bazi mora biti head - stari worker nad novom šemom (ili obrnuto) ne prima saobraćaj"""
+        if self._head is None:
+            self._head = migration_head()
+        try:
+            current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except Exception:
+            return {"ok": False, "current": None, "head": self._head}
+        return {"ok": self._head is None or current == self._head, "current": current, "head": self._head}
@@ -0,0 +1,69 @@
+# services/http_cache.py
+"""
+Uslovni GET zahtevi (ETag / If-None-Match -> 304)
+ETag se računa iz verzija tabela koje endpoint čita, putanje sa query
+parametrima i tokena - bez upita ka bazi i bez pravljenja tela odgovora.
+Sa više worker-a verzije moraju biti zajedničke (CACHE_REDIS_URL): brojači
+jednog procesa ne vide izmene drugih, pa bi 304 vraćao zastarele podatke.
+Bez zajedničkog store-a (i bez SINGLE_PROCESS=true) uslovni GET je isključen.
+Rute koje odgovaraju iz keša kataloga (catalog=True) u ETag stavljaju verziju
+kataloga, a keš tada ne sme vratiti snapshot stariji od te verzije.
+"""
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, HTTPException
+from services.table_versions import table_versions
+from services.version_store import version_store
+from services.read_routing import require_fresh_tables
+from services.catalog_cache import catalog_cache, CATALOG_VERSION_KEY
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(request: Request, tables: tuple, catalog_version: Optional[int] = None) -> str:
+    versions = table_versions(tables)
+    if catalog_version is not None:
+        versions[CATALOG_VERSION_KEY] = catalog_version
+    parts = [
+        version_store.epoch,
+        request.url.path,
+        request.url.query,
+        request.headers.get("authorization", ""),
+        *(f"{table}={version}" for table, version in versions.items()),
+    ]
+    return '"' + hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest() + '"'
+
+
+def not_modified(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def conditional_get(*models, catalog: bool = False):
+    """
+    Dependency za GET rute: postavlja ETag/Cache-Control i odgovara sa 304
+    ako klijent već ima aktuelnu verziju. Navodi se POSLE auth dependency-ja.
+    catalog=True za rute čije telo dolazi iz keša kataloga.
+    """
+    tables = tuple(sorted(model.__tablename__ for model in models))
+
+    def dependency(request: Request, response: Response) -> str:
+        if not version_store.shared:
+            return ""
+        catalog_version = None
+        if catalog:
+            # Telo se pravi iz keša kataloga koji verziju proverava tek na CATALOG_VERSION_CHECK_SECONDS
+            catalog_version = catalog_cache.store.get(CATALOG_VERSION_KEY)
+            catalog_cache.expect(catalog_version)
+        etag = compute_etag(request, tables, catalog_version)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and not_modified(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        # Telo mora odgovarati verziji iz ETag-a - skoro menjane tabele se ne čitaju sa replike
+        require_fresh_tables(request, tables)
+        return etag
+
+    return dependency
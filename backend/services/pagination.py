@@ -0,0 +1,72 @@
+# services/pagination.py
+"""
+Keyset paginacija i NDJSON streaming za list endpoint-e
+Stranice se seku po `id > cursor ORDER BY id LIMIT n` (bez OFFSET-a),
+a sledeći cursor se vraća u X-Next-Cursor headeru.
+"""
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from config import NDJSON_BATCH_SIZE
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _keyset(query, id_column, page):
+    """Primena cursor-a i redosleda po id-u"""
+    if page.cursor is not None:
+        query = query.filter(id_column > page.cursor)
+    return query.order_by(id_column)
+
+
+def paginate(query, id_column, page, response: Response) -> list:
+    """
+    Vraća jednu stranicu rezultata (ili celu listu ako limit nije zadat).
+    Ako postoji sledeća stranica, postavlja X-Next-Cursor header.
+    """
+    query = _keyset(query, id_column, page)
+    if page.limit is None:
+        return query.all()
+
+    # Jedan red viška govori da li postoji sledeća stranica
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(getattr(rows[-1], id_column.key))
+    return rows
+
+
+def ndjson_response(query, id_column, page, schema, headers=None) -> StreamingResponse:
+    """
+    Stream-uje redove kao NDJSON (jedan JSON objekat po liniji).
+    yield_per koristi server-side cursor, pa memorija ne raste sa veličinom tabele.
+    Sesija iz get_db ostaje otvorena dok se stream ne završi (FastAPI >= 0.118).
+    `headers` (ETag, Cache-Control iz conditional_get) se prenose na stream.
+    """
+    query = _keyset(query, id_column, page)
+    if page.limit is not None:
+        query = query.limit(page.limit)
+
+    def generate():
+        for row in query.yield_per(NDJSON_BATCH_SIZE):
+            yield schema.model_validate(row).model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
+
+
+def list_response(query, id_column, page, response: Response, schema, serializer=None):
+    """
+    JSON stranica ili NDJSON stream, u zavisnosti od page.format.
+    Sa `serializer`-om (RowSerializer) upit mora birati njegove kolone,
+    a redovi se kodiraju direktno u bajtove, bez response_model validacije.
+    """
+    if serializer is None:
+        if page.format == "ndjson":
+            return ndjson_response(query, id_column, page, schema, headers=dict(response.headers))
+        return paginate(query, id_column, page, response)
+
+    if page.format == "ndjson":
+        query = _keyset(query, id_column, page)
+        if page.limit is not None:
+            query = query.limit(page.limit)
+        return serializer.ndjson(query, headers=dict(response.headers))
+    return serializer.response(paginate(query, id_column, page, response), response)
@@ -0,0 +1,144 @@
+# services/password_pool.py
+"""
+Pool procesa za bcrypt hash/verify
+Bcrypt troši ~250ms CPU-a po pozivu i drži GIL, pa se izvršava u posebnim
+procesima. Red čekanja je ograničen: kada je pun, poziv odmah baca
+PasswordPoolSaturated (rute vraćaju 503 sa Retry-After) umesto da gomila zahteve.
+"""
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+from config import PASSWORD_POOL_WORKERS, PASSWORD_POOL_MAX_PENDING, PASSWORD_POOL_RETRY_AFTER
+from services.auth import verify_and_update_password, hash_password
+from middleware.metrics import password_seconds, auth_failures
+
+
+class PasswordPoolSaturated(Exception):
+    """Pool je zasićen - klijent treba da pokuša ponovo posle retry_after sekundi"""
+
+    def __init__(self, retry_after: int = PASSWORD_POOL_RETRY_AFTER):
+        super().__init__("Password pool je zasićen")
+        self.retry_after = retry_after
+
+
+class LatencyStats:
+    """Brojač poziva i trajanja po operaciji (count, total, max)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stat = self._stats.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stat["count"] += 1
+            stat["total_seconds"] += seconds
+            stat["max_seconds"] = max(stat["max_seconds"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: dict(stat, avg_seconds=stat["total_seconds"] / stat["count"])
+                for name, stat in self._stats.items()
+            }
+
+
+def _noop() -> None:
+    return None
+
+
+class PasswordPool:
+    """ProcessPoolExecutor sa ograničenim brojem poslova u letu (queue + izvršavanje)"""
+
+    def __init__(self, workers: int = PASSWORD_POOL_WORKERS, max_pending: int = PASSWORD_POOL_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = LatencyStats()
+        self.rejected = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self._slots_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Pravi pool i podiže sve procese (poziva se na startup-u, pre prvog login-a)"""
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                for future in [self._executor.submit(_noop) for _ in range(self.workers)]:
+                    future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _submit(self, name: str, fn, *args) -> Future:
+        with self._slots_lock:
+            admitted = self.in_flight < self.max_pending
+            if admitted:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+        if not admitted:
+            auth_failures.inc("password_pool_busy")
+            raise PasswordPoolSaturated()
+
+        started = time.perf_counter()
+
+        def done(_future: Future) -> None:
+            with self._slots_lock:
+                self.in_flight -= 1
+            elapsed = time.perf_counter() - started
+            self.stats.record(name, elapsed)
+            password_seconds.observe(elapsed, name)
+
+        if self.workers <= 0:
+            # Inline mod (development) - isti ugovor, bez posebnih procesa
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            future.add_done_callback(done)
+            return future
+
+        if self._executor is None:
+            self.start()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(done)
+        return future
+
+    # Blokirajuće varijante - za sinhrone rute (thread čeka bez GIL-a)
+    def verify(self, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """Vraća (ok, novi_hash); novi_hash je postavljen kada treba uraditi rehash"""
+        return self._submit("verify", verify_and_update_password, plain_password, hashed_password).result()
+
+    def hash(self, password: str) -> str:
+        return self._submit("hash", hash_password, password).result()
+
+    # Async varijante - za async rute
+    async def verify_async(self, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        future = self._submit("verify", verify_and_update_password, plain_password, hashed_password)
+        return await asyncio.wrap_future(future)
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit("hash", hash_password, password))
+
+    def snapshot(self) -> dict:
+        """Stanje pool-a i trajanja operacija (za metrike)"""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "latency": self.stats.snapshot(),
+        }
+
+
+password_pool = PasswordPool()
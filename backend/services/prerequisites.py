@@ -0,0 +1,199 @@
+# services/prerequisites.py
+"""
+Preduslovi predmeta (Subject_Prerequisites)
+Graf se drži u kešu kataloga (services/catalog_cache.py) zajedno sa
+tranzitivnim zatvorenjem: closure(predmet) je skup SVIH predmeta koji moraju
+biti položeni pre prijave. Zatvorenje se računa na prvi upit po predmetu i
+pri izmeni grana se preračunava samo za predmete do kojih izmena stiže.
+Provera prijave je razlika skupova (closure - položeni predmeti) u memoriji,
+bez rekurzivnih upita. Izmene grana podižu verziju kataloga, a pravilo pre
+provere uvek čita verziju (bez čekanja na CATALOG_VERSION_CHECK_SECONDS), pa
+grana dodata na drugom worker-u važi odmah. Graf mora ostati acikličan -
+add_prerequisite odbija granu koja bi napravila ciklus (409).
+"""
+from typing import Callable, Iterable, Optional
+from sqlalchemy import select, delete, or_, text
+from sqlalchemy.orm import Session
+from models import Subject, SubjectPrerequisite, TranscriptEntry
+from services.version_store import version_store, CATALOG_VERSION_KEY
+
+
+class PrerequisiteError(Exception):
+    """Izmena preduslova odbijena - nosi HTTP status i poruku za korisnika"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class PrerequisiteGraph:
+    """Read-only graf preduslova sa keširanim tranzitivnim zatvorenjem"""
+
+    def __init__(self, edges: Iterable[tuple]):
+        direct: dict[int, set] = {}
+        for subject_id, prerequisite_id in edges:
+            direct.setdefault(subject_id, set()).add(prerequisite_id)
+        # predmet -> direktni preduslovi
+        self.edges: dict[int, frozenset] = {key: frozenset(value) for key, value in direct.items()}
+        self._closure: dict[int, frozenset] = {}
+
+    def direct(self, subject_id: int) -> frozenset:
+        return self.edges.get(subject_id, frozenset())
+
+    def closure(self, subject_id: int) -> frozenset:
+        """Svi preduslovi predmeta (direktni i tranzitivni)"""
+        found = self._closure.get(subject_id)
+        if found is not None:
+            return found
+        result = set()
+        stack = list(self.direct(subject_id))
+        while stack:
+            node = stack.pop()
+            if node in result:
+                continue
+            result.add(node)
+            known = self._closure.get(node)
+            if known is not None:
+                # Zatvorenje preduslova je već izračunato - ne obilazi se ponovo
+                result.update(known)
+            else:
+                stack.extend(self.direct(node))
+        found = self._closure[subject_id] = frozenset(result)
+        return found
+
+    def creates_cycle(self, subject_id: int, prerequisite_id: int) -> bool:
+        """Da li grana subject -> prerequisite zatvara ciklus"""
+        return prerequisite_id == subject_id or subject_id in self.closure(prerequisite_id)
+
+    def inherit(self, previous: "PrerequisiteGraph") -> None:
+        """
+        Zatvorenja prethodne verzije grafa. Izmenjena grana (a -> b) menja
+        zatvorenje samo predmeta a i predmeta kojima je a preduslov; ostala
+        izračunata zatvorenja se prenose.
+        """
+        changed = {
+            key for key in previous.edges.keys() | self.edges.keys()
+            if previous.edges.get(key) != self.edges.get(key)
+        }
+        for subject_id, closure in previous._closure.items():
+            if subject_id not in changed and not closure & changed:
+                self._closure.setdefault(subject_id, closure)
+
+
+def load_edges(db: Session) -> list:
+    return [tuple(row) for row in db.execute(
+        select(SubjectPrerequisite.subject_id, SubjectPrerequisite.prerequisite_id)
+    )]
+
+
+def passed_subject_ids(db: Session, student_id: int) -> set:
+    """Položeni predmeti studenta (materijalizovan transkript, jedan indeksiran upit)"""
+    return set(db.execute(
+        select(TranscriptEntry.subject_id).where(TranscriptEntry.student_id == student_id)
+    ).scalars())
+
+
+class PrerequisiteRule:
+    """Pravilo studenta za eligibility engine: svi preduslovi predmeta moraju biti položeni"""
+
+    name = "prerequisites"
+
+    def __init__(self, catalog_source: Callable):
+        # catalog_source(db, force=True) -> Catalog (catalog_cache.get)
+        self.catalog_source = catalog_source
+
+    def check(self, db: Session, student, subject) -> Optional[str]:
+        catalog = self.catalog_source(db, force=True)
+        required = catalog.prerequisites.closure(subject.id)
+        if not required:
+            return None
+        return self._message(catalog, required - passed_subject_ids(db, student.id))
+
+    def check_many(self, db: Session, students: list, subject) -> dict:
+        """Ista provera za više studenata - jedan upit za položene preduslove svih"""
+        catalog = self.catalog_source(db, force=True)
+        required = catalog.prerequisites.closure(subject.id)
+        if not required:
+            return {}
+        passed: dict[int, set] = {}
+        for student_id, subject_id in db.execute(
+            select(TranscriptEntry.student_id, TranscriptEntry.subject_id).where(
+                TranscriptEntry.student_id.in_([student.id for student in students]),
+                TranscriptEntry.subject_id.in_(required)
+            )
+        ):
+            passed.setdefault(student_id, set()).add(subject_id)
+        return {
+            student.id: self._message(catalog, required - passed.get(student.id, set()))
+            for student in students
+        }
+
+    @staticmethod
+    def _message(catalog, missing: set) -> Optional[str]:
+        if not missing:
+            return None
+        names = ", ".join(
+            catalog.subjects[i].name if i in catalog.subjects else str(i) for i in sorted(missing)
+        )
+        return f"Za prijavu ovog ispita prvo morate položiti: {names}"
+
+
+def _owned_subject(db: Session, subject_id: int, professor_id: int) -> Subject:
+    subject = db.query(Subject).filter(Subject.id == subject_id).first()
+    if not subject:
+        raise PrerequisiteError(404, "Predmet ne postoji")
+    if subject.professor_id != professor_id:
+        raise PrerequisiteError(403, "Nemate dozvolu jer ovo nije vas predmet")
+    return subject
+
+
+def add_prerequisite(db: Session, subject_id: int, prerequisite_id: int, professor_id: int) -> None:
+    """Dodaje granu subject -> prerequisite (samo profesor predmeta); ciklus je 409"""
+    _owned_subject(db, subject_id, professor_id)
+    if db.get(Subject, prerequisite_id) is None:
+        raise PrerequisiteError(404, "Predmet preduslov ne postoji")
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Istovremene izmene grafa se serijalizuju - dve grane koje zajedno
+        # prave ciklus ne mogu obe proći proveru nad starim grafom
+        db.execute(text('LOCK TABLE "Subject_Prerequisites" IN SHARE ROW EXCLUSIVE MODE'))
+
+    # Provera ciklusa nad grafom iz baze (keš drugog worker-a može kasniti)
+    graph = PrerequisiteGraph(load_edges(db))
+    if prerequisite_id in graph.direct(subject_id):
+        db.rollback()
+        raise PrerequisiteError(409, "Predmet već ima ovaj preduslov")
+    if graph.creates_cycle(subject_id, prerequisite_id):
+        db.rollback()
+        raise PrerequisiteError(409, "Preduslov bi napravio ciklus u grafu preduslova")
+
+    db.add(SubjectPrerequisite(subject_id=subject_id, prerequisite_id=prerequisite_id))
+    db.commit()
+    # Nova verzija kataloga - pravilo preduslova je vidi na svim worker-ima pri sledećoj prijavi
+    version_store.bump(CATALOG_VERSION_KEY)
+
+
+def remove_prerequisite(db: Session, subject_id: int, prerequisite_id: int, professor_id: int) -> None:
+    """Briše granu subject -> prerequisite (samo profesor predmeta)"""
+    _owned_subject(db, subject_id, professor_id)
+    deleted = db.execute(
+        delete(SubjectPrerequisite).where(
+            SubjectPrerequisite.subject_id == subject_id,
+            SubjectPrerequisite.prerequisite_id == prerequisite_id
+        )
+    ).rowcount
+    if not deleted:
+        db.rollback()
+        raise PrerequisiteError(404, "Predmet nema ovaj preduslov")
+    db.commit()
+    version_store.bump(CATALOG_VERSION_KEY)
+
+
+def delete_subject_prerequisites(db: Session, subject_id: int) -> None:
+    """Grane predmeta koji se briše (u obe uloge) - poziva se pre brisanja predmeta, bez commit-a"""
+    db.execute(
+        delete(SubjectPrerequisite).where(
+            or_(SubjectPrerequisite.subject_id == subject_id, SubjectPrerequisite.prerequisite_id == subject_id)
+        )
+    )
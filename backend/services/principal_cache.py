@@ -0,0 +1,155 @@
+# services/principal_cache.py
+"""
+Keš verifikovanih tokena (principal cache)
+Za svaki token čuva read-only snapshot ulogovanog korisnika do isteka tokena,
+tako da autentifikovani zahtevi ne idu u bazu samo da bi saznali ko je korisnik
+"""
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Union
+from config import PRINCIPAL_CACHE_MAX_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+
+
+@dataclass(frozen=True)
+class StudentPrincipal:
+    """Odvojen (detached) snapshot studenta - nije vezan za DB sesiju"""
+    id: int
+    name: str
+    username: str
+    email: str
+    index_number: str
+    age_of_study: int
+    department: Optional[str] = None
+    role: str = "student"
+
+
+@dataclass(frozen=True)
+class ProfessorPrincipal:
+    """Odvojen (detached) snapshot profesora - bez password hash-a"""
+    id: int
+    name: str
+    username: str
+    email: str
+    subject: str
+    role: str = "professor"
+
+
+Principal = Union[StudentPrincipal, ProfessorPrincipal]
+
+
+def student_snapshot(student) -> StudentPrincipal:
+    """Pravi snapshot od Student ORM objekta"""
+    return StudentPrincipal(
+        id=student.id,
+        name=student.name,
+        username=student.username,
+        email=student.email,
+        index_number=student.index_number,
+        age_of_study=student.age_of_study,
+        department=student.department,
+    )
+
+
+def professor_snapshot(professor) -> ProfessorPrincipal:
+    """Pravi snapshot od Professor ORM objekta"""
+    return ProfessorPrincipal(
+        id=professor.id,
+        name=professor.name,
+        username=professor.username,
+        email=professor.email,
+        subject=professor.subject,
+    )
+
+
+class PrincipalCache:
+    """
+    Ograničen (LRU) keš token -> principal sa TTL-om.
+    Unos ističe u trenutku `exp` claim-a tokena, a najkasnije posle `ttl` sekundi,
+    tako da promene koje nisu eksplicitno invalidirane ne žive predugo.
+    """
+
+    def __init__(self, max_size: int = PRINCIPAL_CACHE_MAX_SIZE, ttl: int = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+        # (role, username) -> skup tokena, za invalidaciju po korisniku
+        self._by_user: dict[tuple[str, str], set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, token: str, role: str) -> Optional[Principal]:
+        """Vraća principal za token ili None (miss, istekao unos ili druga uloga)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= now or principal.role != role:
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, exp: Optional[float]) -> None:
+        """Upisuje principal; `exp` je unix timestamp isteka tokena"""
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, principal)
+            self._by_user.setdefault((principal.role, principal.username), set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, role: str, username: str) -> None:
+        """Briše sve keširane tokene korisnika (posle izmene ili brisanja)"""
+        with self._lock:
+            for token in list(self._by_user.get((role, username), ())):
+                self._remove(token)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        """Brojači za scrape (hits, misses, size...)"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, token: str) -> None:
+        # Poziva se samo pod lock-om
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        principal = entry[1]
+        key = (principal.role, principal.username)
+        tokens = self._by_user.get(key)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[key]
+
+
+principal_cache = PrincipalCache()
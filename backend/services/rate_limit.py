@@ -0,0 +1,188 @@
+# services/rate_limit.py
+"""
+Rate limiting (token bucket) za login i prijavu ispita
+Svaki limit ima kapacitet N zahteva i puni se brzinom N po minutu, posebno za
+svaki ključ (IP adresa, korisnik) i rutu. MemoryRateLimitStore važi za jedan
+proces; sa više worker-a RATE_LIMIT_REDIS_URL (podrazumevano CACHE_REDIS_URL)
+deli brojače između worker-a. Ako Redis nije dostupan, zahtev se propušta -
+rate limiter ne sme da obori login.
+"""
+import time
+import logging
+import threading
+from typing import Callable
+from fastapi import Request, HTTPException
+from middleware.metrics import requests_rejected
+from services.auth import decode_access_token, InvalidTokenError
+from config import RATE_LIMIT_ENABLED, RATE_LIMIT_REDIS_URL, TRUST_PROXY_HEADERS
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Bucket je prazan - retry_after sekundi do sledećeg tokena"""
+
+    status_code = 429
+    detail = "Previše zahteva, pokušajte ponovo kasnije"
+
+    def __init__(self, limit: str, retry_after: float):
+        super().__init__(limit)
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class MemoryRateLimitStore:
+    """Bucket-i u memoriji procesa"""
+
+    # Iznad ovoliko ključeva brišu se puni (neaktivni) bucket-i
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        # ključ -> [tokeni, vreme poslednjeg obračuna, vreme kada je bucket ponovo pun]
+        self._buckets: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        """Uzima jedan token; vraća 0 ili broj sekundi do sledećeg tokena"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._prune(now)
+                bucket = self._buckets[key] = [capacity, now, now]
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            bucket[0], bucket[1], bucket[2] = tokens, now, now + (capacity - tokens) / rate
+            return retry_after
+
+    def _prune(self, now: float) -> None:
+        # Pun bucket je isto što i nepostojeći
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+
+
+class RedisRateLimitStore:
+    """Bucket-i u Redis-u (atomično kroz Lua skriptu)"""
+
+    PREFIX = "school:ratelimit:"
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+    local tokens = tonumber(state[1]) or capacity
+    local at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+    local retry = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        retry = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return tostring(retry)
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        try:
+            return float(self._script(keys=[self.PREFIX + key], args=[rate, capacity, time.time()]))
+        except Exception:
+            logger.warning("Rate limit store nije dostupan - zahtev se propušta", exc_info=True)
+            return 0.0
+
+
+def create_rate_limit_store():
+    """Redis ako je konfigurisan, inače memorija procesa"""
+    if RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitStore(RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitStore()
+
+
+rate_limit_store = create_rate_limit_store()
+
+
+class RateLimit:
+    """Jedan limit: `per_minute` zahteva po ključu, kapacitet bucket-a = per_minute"""
+
+    def __init__(self, name: str, per_minute: int, store=None):
+        self.name = name
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.store = store
+
+    def hit(self, key: str) -> None:
+        """Troši token za ključ; RateLimitExceeded kada je bucket prazan"""
+        if not RATE_LIMIT_ENABLED or self.rate <= 0:
+            return
+        store = self.store or rate_limit_store
+        retry_after = store.take(f"{self.name}:{key}", self.rate, self.capacity)
+        if retry_after > 0:
+            requests_rejected.inc(f"rate_limit:{self.name}")
+            raise RateLimitExceeded(self.name, retry_after)
+
+
+def client_ip(request: Request) -> str:
+    """IP klijenta; iza proxy-ja (TRUST_PROXY_HEADERS) prvi X-Forwarded-For"""
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def user_key(request: Request) -> str:
+    """
+    Ključ korisnika - uloga i korisničko ime iz (proverenog) tokena, ne sam token:
+    novi token istog korisnika troši isti bucket. Bez validnog tokena: IP adresa.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = decode_access_token(token)
+        except InvalidTokenError:
+            payload = {}
+        if payload.get("sub"):
+            return f"user:{payload.get('role')}:{payload['sub']}"
+    return "ip:" + client_ip(request)
+
+
+def too_many_requests(error: RateLimitExceeded) -> HTTPException:
+    """429 sa Retry-After (cele sekunde, najmanje 1)"""
+    return HTTPException(
+        status_code=error.status_code,
+        detail=error.detail,
+        headers={"Retry-After": str(max(int(error.retry_after + 0.999), 1))}
+    )
+
+
+KEY_FUNCTIONS: dict[str, Callable[[Request], str]] = {
+    "ip": lambda request: "ip:" + client_ip(request),
+    "user": user_key,
+}
+
+
+def rate_limit(limit: RateLimit, key: str = "ip"):
+    """
+    Dependency: troši token limita za IP adresu ("ip") ili korisnika ("user").
+    Navodi se PRE dependency-ja koji rade posao (baza, bcrypt).
+    """
+    key_function = KEY_FUNCTIONS[key]
+
+    def dependency(request: Request) -> None:
+        try:
+            limit.hit(key_function(request))
+        except RateLimitExceeded as e:
+            raise too_many_requests(e)
+
+    return dependency
@@ -0,0 +1,46 @@
+# services/read_routing.py
+"""
+Pravila za čitanje sa read replika
+- read-your-writes: korisnik (bearer token) koji je upravo nešto upisao čita
+  sa primarne baze READ_YOUR_WRITES_SECONDS,
+- tabela izmenjena u poslednjih REPLICA_MAX_LAG_SECONDS se čita sa primarne
+  baze (inače bi ETag sa novom verzijom pokrio stare podatke sa replike).
+Markeri su u version store-u, pa važe za sve worker-e kada je CACHE_REDIS_URL postavljen.
+"""
+import hashlib
+from typing import Iterable, Optional
+from fastapi import Request
+from database import replica_router
+from services.version_store import version_store
+from config import READ_YOUR_WRITES_SECONDS, REPLICA_MAX_LAG_SECONDS
+
+
+def writer_key(authorization: str) -> str:
+    return "writer:" + hashlib.blake2b(authorization.encode(), digest_size=12).hexdigest()
+
+
+def fresh_key(table: str) -> str:
+    return f"fresh:{table}"
+
+
+def record_commit(tables: Iterable[str], authorization: Optional[str]) -> None:
+    """Posle commit-a: markeri za autora izmene i izmenjene tabele (samo kada postoje replike)"""
+    if not replica_router.enabled:
+        return
+    for table in tables:
+        version_store.set_marker(fresh_key(table), REPLICA_MAX_LAG_SECONDS)
+    if authorization:
+        version_store.set_marker(writer_key(authorization), READ_YOUR_WRITES_SECONDS)
+
+
+def require_fresh_tables(request: Request, tables: Iterable[str]) -> None:
+    """Zahtev čita sa primarne baze ako je neka od tabela skoro menjana"""
+    if replica_router.enabled and version_store.has_marker(*(fresh_key(table) for table in tables)):
+        request.state.read_primary = True
+
+
+def needs_primary(request: Request) -> bool:
+    if getattr(request.state, "read_primary", False):
+        return True
+    authorization = request.headers.get("authorization")
+    return bool(authorization) and version_store.has_marker(writer_key(authorization))
@@ -0,0 +1,174 @@
+# services/registration.py
+"""
+Registracioni engine za studentsku prijavu ispita
+Provera uslova, provere duplikata/položenog/aktivne prijave i upis
+u jednoj transakciji, bez check-then-insert trke:
+
+1. SELECT ... FOR UPDATE zaključava red studenta i čita predmet ispita
+   (serijalizuje istovremene prijave istog studenta)
+2. INSERT ... SELECT ... WHERE NOT EXISTS ... RETURNING upisuje prijavu sa
+   izračunatim num_of_applications samo ako nema aktivne/položene prijave
+3. Za ispit sa kapacitetom, uslovni UPDATE brojača mesta (Exam_Seats) -
+   puna sala poništava upis
+
+Uspešna prijava košta dva round trip-a (tri za ispit sa kapacitetom); upit
+za poruku se radi samo kada je prijava odbijena.
+"""
+from sqlalchemy import select, insert, func, exists, literal, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from models import Student, Exam, Subject, ExamRegistration
+from models.enums import ExamStatus
+from services.catalog_cache import catalog_cache
+from services.eligibility import eligibility
+from services.exam_schedule import take_seat
+
+
+class RegistrationError(Exception):
+    """Prijava odbijena - nosi HTTP status i poruku za korisnika"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# Kolone koje vraća RETURNING (poklapaju se sa ExamRegistrationResponse)
+REGISTRATION_COLUMNS = (
+    ExamRegistration.id,
+    ExamRegistration.student_id,
+    ExamRegistration.exam_id,
+    ExamRegistration.num_of_applications,
+    ExamRegistration.grade,
+    ExamRegistration.points,
+    ExamRegistration.status,
+)
+
+
+def _subject_registrations(student_id: int, subject_id: int):
+    """Prijave studenta za sve rokove datog predmeta (osnova za podupite)"""
+    subject_exam = aliased(Exam)
+    return (
+        select(ExamRegistration.id)
+        .join(subject_exam, subject_exam.id == ExamRegistration.exam_id)
+        .where(
+            ExamRegistration.student_id == student_id,
+            subject_exam.subject_id == subject_id
+        )
+    )
+
+
+def _blocking_condition(exam_id: int):
+    """Prijava blokira novu ako je aktivna, položena ili pala na istom roku"""
+    return or_(
+        ExamRegistration.status.in_([ExamStatus.prijavljen, ExamStatus.polozio]),
+        and_(ExamRegistration.exam_id == exam_id, ExamRegistration.status == ExamStatus.pao)
+    )
+
+
+def is_blocking(rows, exam_id: int) -> bool:
+    """_blocking_condition nad već pročitanim prijavama predmeta (red prijava)"""
+    return any(
+        r.status in (ExamStatus.prijavljen, ExamStatus.polozio)
+        or (r.exam_id == exam_id and r.status == ExamStatus.pao)
+        for r in rows
+    )
+
+
+def rejection_message(rows, exam_id: int) -> str:
+    """Poruka za odbijenu prijavu iz prijava studenta za isti predmet"""
+    if any(r.exam_id == exam_id and r.status == ExamStatus.prijavljen for r in rows):
+        return "Već ste prijavljeni na ovaj ispitni rok"
+    if any(r.exam_id == exam_id and r.status == ExamStatus.pao for r in rows):
+        return "Već ste pali na ovom roku. Sačekajte novi rok."
+    if any(r.status == ExamStatus.prijavljen for r in rows):
+        return "Već ste prijavljeni na drugi ispitni rok za ovaj predmet"
+    if any(r.status == ExamStatus.polozio for r in rows):
+        return "Već ste položili ovaj predmet"
+    return "Već ste prijavljeni na ovaj ispitni rok"
+
+
+def _rejection_reason(db: Session, student_id: int, exam_id: int, subject_id: int) -> str:
+    """Čita postojeće prijave i vraća poruku (samo na putanji odbijanja)"""
+    rows = db.execute(
+        select(ExamRegistration.exam_id, ExamRegistration.status)
+        .where(ExamRegistration.id.in_(_subject_registrations(student_id, subject_id)))
+    ).all()
+    return rejection_message(rows, exam_id)
+
+
+def register_student_for_exam(db: Session, student, exam_id: int):
+    """
+    Prijavljuje studenta na ispit u jednoj transakciji.
+    Vraća red sa kolonama REGISTRATION_COLUMNS ili baca RegistrationError.
+    """
+    # Dozvoljeni ispiti kohorte studenta (keš kataloga) - provera uslova je O(1)
+    eligible = catalog_cache.eligible_for(db, student)
+
+    # 1. Zaključaj red studenta i učitaj predmet ispita (jedan round trip)
+    target = db.execute(
+        select(Exam.subject_id, Exam.capacity, Subject.id, Subject.department, Subject.year, Subject.espb)
+        .select_from(Student)
+        .join(Exam, Exam.id == exam_id)
+        .join(Subject, Subject.id == Exam.subject_id)
+        .where(Student.id == student.id)
+        .with_for_update(of=Student)
+    ).first()
+
+    if target is None:
+        db.rollback()
+        raise RegistrationError(404, "Ispit ne postoji")
+
+    message = eligibility.registration_reason(db, student, exam_id, target, eligible)
+    if message:
+        db.rollback()
+        raise RegistrationError(403, message)
+
+    # 2. Uslovni upis - novi snapshot posle zaključavanja vidi sve ranije prijave
+    previous = _subject_registrations(student.id, target.subject_id)
+    attempts = (
+        select(func.count())
+        .select_from(previous.subquery())
+        .scalar_subquery()
+    )
+    blocked = exists(
+        select(ExamRegistration.id).where(
+            ExamRegistration.id.in_(previous),
+            _blocking_condition(exam_id)
+        )
+    )
+    statement = (
+        insert(ExamRegistration)
+        .from_select(
+            ["student_id", "exam_id", "num_of_applications", "grade", "points", "status"],
+            select(
+                literal(student.id),
+                literal(exam_id),
+                attempts + 1,
+                literal(0),
+                literal(0),
+                literal(ExamStatus.prijavljen, ExamRegistration.status.type),
+            ).where(~blocked)
+        )
+        .returning(*REGISTRATION_COLUMNS)
+    )
+
+    try:
+        created = db.execute(statement).first()
+    except IntegrityError:
+        # Jedinstveni (student_id, exam_id) - istovremena prijava na isti rok
+        db.rollback()
+        raise RegistrationError(400, "Već ste prijavljeni na ovaj ispitni rok")
+
+    if created is None:
+        message = _rejection_reason(db, student.id, exam_id, target.subject_id)
+        db.rollback()
+        raise RegistrationError(400, message)
+
+    # 3. Mesto u sali - posle upisa, da se red brojača drži zaključan samo do commit-a
+    if not take_seat(db, exam_id, target.capacity):
+        db.rollback()
+        raise RegistrationError(409, "Nema slobodnih mesta na ovom ispitnom roku")
+
+    db.commit()
+    return created
@@ -0,0 +1,394 @@
+# services/registration_queue.py
+"""
+Red prijava ispita (queued registration) sa listom čekanja
+Zahtev samo upisuje tiket (Registration_Tickets) i odmah dobija 202 sa id-jem;
+worker u lifespan-u obrađuje tikete u grupama po ispitu:
+- jedan upit za studente (zaključani, kao u direktnoj prijavi), jedan za
+  njihove prijave istog predmeta, pravila uslova nad svima odjednom
+  (EligibilityEngine.registration_reasons),
+- upis svih prihvaćenih prijava jednim INSERT-om i brojača mesta jednim UPDATE-om,
+- kada je ispit pun, ispravni tiketi idu na listu čekanja; oslobođeno mesto
+  (otkazana prijava) preuzima najstariji tiket sa liste (FIFO po id-ju); dok
+  lista postoji, direktna prijava ne dobija mesto (take_seat).
+Red je u bazi, pa tiketi prežive restart; sa više worker procesa isti ispit
+obrađuje samo jedan (PostgreSQL advisory lock po ispitu).
+"""
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, insert, update, delete, func, bindparam, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models import Student, Exam, ExamSeats, Subject, ExamRegistration, RegistrationTicket
+from models.enums import ExamStatus, TicketStatus
+from services.catalog_cache import catalog_cache
+from services.eligibility import eligibility, cohort_of
+from services.registration import is_blocking, rejection_message
+from services.exam_schedule import release_seat
+from middleware.metrics import metrics
+from config import REGISTRATION_QUEUE_ENABLED, REGISTRATION_QUEUE_BATCH_SIZE, REGISTRATION_QUEUE_POLL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Ključ PostgreSQL advisory lock-a (drugi argument je id ispita)
+QUEUE_LOCK_KEY = 24002
+# Ispita po jednom prolazu worker-a
+EXAMS_PER_PASS = 50
+# Tiket u ovim statusima se više ne menja
+FINAL_STATUSES = (TicketStatus.prijavljen, TicketStatus.odbijen, TicketStatus.otkazan)
+OPEN_STATUSES = (TicketStatus.u_redu, TicketStatus.lista_cekanja)
+
+tickets_processed = metrics.counter(
+    "registration_tickets_total", "Obrađeni tiketi reda prijava po ishodu", ("status",)
+)
+
+
+class TicketError(Exception):
+    """Tiket odbijen - nosi HTTP status i poruku za korisnika"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _ticket_response(db: Session, ticket: RegistrationTicket) -> dict:
+    position = None
+    if ticket.status == TicketStatus.lista_cekanja:
+        # Pozicija na listi čekanja - tiketi istog ispita primljeni ranije
+        position = db.execute(
+            select(func.count()).select_from(RegistrationTicket).where(
+                RegistrationTicket.exam_id == ticket.exam_id,
+                RegistrationTicket.status == TicketStatus.lista_cekanja,
+                RegistrationTicket.id <= ticket.id
+            )
+        ).scalar()
+    return {
+        "id": ticket.id,
+        "exam_id": ticket.exam_id,
+        "status": ticket.status,
+        "detail": ticket.detail,
+        "registration_id": ticket.registration_id,
+        "waitlist_position": position,
+        "created_at": ticket.created_at,
+        "processed_at": ticket.processed_at,
+    }
+
+
+class RegistrationQueue:
+    """Upis tiketa (rute) i worker koji ih obrađuje (asyncio task + threadpool)"""
+
+    def __init__(self, batch_size: int = REGISTRATION_QUEUE_BATCH_SIZE,
+                 poll_seconds: float = REGISTRATION_QUEUE_POLL_SECONDS):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.batches = 0
+        self.processed = 0
+        self.last_batch_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop = None
+        self._stats_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # --- rute ---
+
+    def enqueue(self, db: Session, student, exam_id: int) -> dict:
+        """Upisuje tiket (ili vraća otvoreni/uspešan tiket istog studenta za isti ispit)"""
+        if not self.running:
+            raise TicketError(503, "Red prijava trenutno nije dostupan, koristite direktnu prijavu")
+        existing = db.execute(
+            select(RegistrationTicket).where(
+                RegistrationTicket.student_id == student.id,
+                RegistrationTicket.exam_id == exam_id,
+                RegistrationTicket.status.in_((*OPEN_STATUSES, TicketStatus.prijavljen))
+            ).order_by(RegistrationTicket.id).limit(1)
+        ).scalars().first()
+        if existing is not None:
+            return _ticket_response(db, existing)
+
+        ticket = RegistrationTicket(student_id=student.id, exam_id=exam_id, status=TicketStatus.u_redu)
+        db.add(ticket)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Spoljni ključ - ispit ne postoji
+            db.rollback()
+            raise TicketError(404, "Ispit ne postoji")
+        db.refresh(ticket)
+        self.wake()
+        return _ticket_response(db, ticket)
+
+    def get_ticket(self, db: Session, ticket_id: int, student_id: int) -> dict:
+        ticket = db.get(RegistrationTicket, ticket_id)
+        if ticket is None or ticket.student_id != student_id:
+            raise TicketError(404, "Tiket ne postoji")
+        return _ticket_response(db, ticket)
+
+    def withdraw(self, db: Session, ticket_id: int, student_id: int) -> dict:
+        """
+        Otkazuje tiket. Prijava dobijena kroz red se briše dok nije ocenjena,
+        a oslobođeno mesto preuzima lista čekanja.
+        """
+        ticket = db.execute(
+            select(RegistrationTicket).where(RegistrationTicket.id == ticket_id).with_for_update()
+        ).scalars().first()
+        if ticket is None or ticket.student_id != student_id:
+            db.rollback()
+            raise TicketError(404, "Tiket ne postoji")
+        if ticket.status in (TicketStatus.odbijen, TicketStatus.otkazan):
+            db.rollback()
+            raise TicketError(400, "Tiket je već zatvoren")
+
+        if ticket.status == TicketStatus.prijavljen:
+            registration = db.get(ExamRegistration, ticket.registration_id, with_for_update=True)
+            if registration is not None:
+                if registration.status != ExamStatus.prijavljen:
+                    db.rollback()
+                    raise TicketError(400, "Ispit je već ocenjen - prijava ne može da se otkaže")
+                capacity = db.execute(select(Exam.capacity).where(Exam.id == ticket.exam_id)).scalar()
+                ticket.registration_id = None
+                db.flush()
+                db.delete(registration)
+                release_seat(db, ticket.exam_id, capacity)
+
+        ticket.status = TicketStatus.otkazan
+        ticket.detail = "Prijava je otkazana"
+        ticket.processed_at = datetime.utcnow()
+        db.commit()
+        tickets_processed.inc(TicketStatus.otkazan.value)
+        self.wake()
+        return _ticket_response(db, ticket)
+
+    def read_ticket(self, ticket_id: int, student_id: int) -> dict:
+        """get_ticket sa sopstvenom sesijom (SSE stream nema request sesiju)"""
+        db = SessionLocal()
+        try:
+            return self.get_ticket(db, ticket_id, student_id)
+        finally:
+            db.close()
+
+    # --- worker ---
+
+    def wake(self) -> None:
+        """Budi worker ovog procesa (poziva se i iz threadpool-a)"""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self) -> None:
+        """Startup (lifespan): pokreće worker ako je red uključen"""
+        if not REGISTRATION_QUEUE_ENABLED or self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        self._wakeup = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await asyncio.to_thread(self.process_once)
+            except Exception:
+                logger.exception("Greška u obradi reda prijava")
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def process_once(self) -> int:
+        """Jedan prolaz: ispiti sa tiketima u redu ili listom čekanja i slobodnim mestima"""
+        db = SessionLocal()
+        try:
+            processed = 0
+            for exam_id in self._pending_exams(db):
+                processed += self.process_exam(db, exam_id)
+            return processed
+        finally:
+            db.close()
+
+    def _pending_exams(self, db: Session) -> list:
+        queued = select(RegistrationTicket.exam_id).where(RegistrationTicket.status == TicketStatus.u_redu)
+        promotable = (
+            select(RegistrationTicket.exam_id)
+            .join(Exam, Exam.id == RegistrationTicket.exam_id)
+            .join(ExamSeats, ExamSeats.exam_id == Exam.id)
+            .where(RegistrationTicket.status == TicketStatus.lista_cekanja, ExamSeats.seats_taken < Exam.capacity)
+        )
+        exam_ids = db.execute(union(queued, promotable).limit(EXAMS_PER_PASS)).scalars().all()
+        db.rollback()
+        return exam_ids
+
+    def process_exam(self, db: Session, exam_id: int) -> int:
+        """Obrađuje do batch_size otvorenih tiketa jednog ispita u jednoj transakciji"""
+        started = time.perf_counter()
+        if db.get_bind().dialect.name == "postgresql":
+            # Drugi worker proces već obrađuje ovaj ispit
+            if not db.execute(select(func.pg_try_advisory_xact_lock(QUEUE_LOCK_KEY, exam_id))).scalar():
+                db.rollback()
+                return 0
+
+        target = db.execute(
+            select(Exam.capacity, Subject.id, Subject.department, Subject.year, Subject.espb)
+            .join(Subject, Subject.id == Exam.subject_id)
+            .where(Exam.id == exam_id)
+        ).first()
+        seats_taken = db.execute(select(ExamSeats.seats_taken).where(ExamSeats.exam_id == exam_id)).scalar()
+        full = target is not None and target.capacity is not None and (seats_taken or 0) >= target.capacity
+        # Pun ispit - lista čekanja se ne obilazi ponovo, obrađuju se samo novi tiketi
+        statuses = (TicketStatus.u_redu,) if full else OPEN_STATUSES
+        tickets = db.execute(
+            select(RegistrationTicket.id, RegistrationTicket.student_id, RegistrationTicket.status)
+            .where(RegistrationTicket.exam_id == exam_id, RegistrationTicket.status.in_(statuses))
+            .order_by(RegistrationTicket.id)
+            .limit(self.batch_size)
+            .with_for_update()
+        ).all()
+        if not tickets:
+            db.rollback()
+            return 0
+
+        results = self._decide(db, exam_id, target, tickets)
+        now = datetime.utcnow()
+        changed = [
+            {"b_id": ticket_id, "b_status": status, "b_detail": detail, "b_registration": registration_id,
+             "b_processed": now}
+            for ticket_id, (status, detail, registration_id) in results.items()
+        ]
+        if changed:
+            table = RegistrationTicket.__table__
+            db.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(
+                    status=bindparam("b_status", type_=table.c.status.type),
+                    detail=bindparam("b_detail"),
+                    registration_id=bindparam("b_registration"),
+                    processed_at=bindparam("b_processed"),
+                ),
+                changed
+            )
+        db.commit()
+
+        for status, _, _ in results.values():
+            tickets_processed.inc(status.value)
+        with self._stats_lock:
+            self.batches += 1
+            self.processed += len(tickets)
+            self.last_batch_seconds = time.perf_counter() - started
+        return len(tickets)
+
+    def _decide(self, db: Session, exam_id: int, target, tickets: list) -> Optional[dict]:
+        """
+        Ishod za svaki tiket {ticket_id: (status, poruka, registration_id)} i upis
+        prihvaćenih prijava. Tiket na listi čekanja koji i dalje čeka se ne menja.
+        """
+        if target is None:
+            return {t.id: (TicketStatus.odbijen, "Ispit ne postoji", None) for t in tickets}
+
+        student_ids = sorted({t.student_id for t in tickets})
+        # Isti redosled zaključavanja kao direktna prijava: studenti, pa brojač mesta
+        students = db.execute(
+            select(Student.id, Student.department, Student.age_of_study)
+            .where(Student.id.in_(student_ids))
+            .order_by(Student.id)
+            .with_for_update()
+        ).all()
+        free = None
+        if target.capacity is not None:
+            taken = db.execute(
+                select(ExamSeats.seats_taken).where(ExamSeats.exam_id == exam_id).with_for_update()
+            ).scalar()
+            free = target.capacity - (taken or 0)
+
+        catalog = catalog_cache.get(db)
+        reasons = eligibility.registration_reasons(
+            db, students, exam_id, target, lambda student: catalog.cohort(cohort_of(student))
+        )
+        existing: dict[int, list] = {}
+        for row in db.execute(
+            select(ExamRegistration.student_id, ExamRegistration.exam_id, ExamRegistration.status)
+            .join(Exam, Exam.id == ExamRegistration.exam_id)
+            .where(ExamRegistration.student_id.in_(student_ids), Exam.subject_id == target.id)
+        ):
+            existing.setdefault(row.student_id, []).append(row)
+
+        known = {student.id for student in students}
+        accepted: dict[int, int] = {}  # student_id -> ticket_id
+        results = {}
+        rows = []
+        for ticket in tickets:
+            student_id = ticket.student_id
+            previous = existing.get(student_id, ())
+            if student_id not in known:
+                results[ticket.id] = (TicketStatus.odbijen, "Student ne postoji", None)
+            elif student_id in reasons:
+                results[ticket.id] = (TicketStatus.odbijen, reasons[student_id], None)
+            elif student_id in accepted:
+                results[ticket.id] = (TicketStatus.odbijen, "Već ste prijavljeni na ovaj ispitni rok", None)
+            elif is_blocking(previous, exam_id):
+                results[ticket.id] = (TicketStatus.odbijen, rejection_message(previous, exam_id), None)
+            elif free is not None and free <= 0:
+                if ticket.status != TicketStatus.lista_cekanja:
+                    results[ticket.id] = (
+                        TicketStatus.lista_cekanja, "Nema slobodnih mesta - na listi čekanja ste", None
+                    )
+            else:
+                if free is not None:
+                    free -= 1
+                accepted[student_id] = ticket.id
+                rows.append({
+                    "student_id": student_id, "exam_id": exam_id, "num_of_applications": len(previous) + 1,
+                    "grade": 0, "points": 0, "status": ExamStatus.prijavljen,
+                })
+
+        if rows:
+            created = db.execute(
+                insert(ExamRegistration).returning(ExamRegistration.id, ExamRegistration.student_id), rows
+            ).all()
+            for registration_id, student_id in created:
+                results[accepted[student_id]] = (TicketStatus.prijavljen, None, registration_id)
+            if target.capacity is not None:
+                db.execute(
+                    update(ExamSeats)
+                    .where(ExamSeats.exam_id == exam_id)
+                    .values(seats_taken=ExamSeats.seats_taken + len(rows))
+                    .execution_options(synchronize_session=False)
+                )
+        return results
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            return {
+                "enabled": REGISTRATION_QUEUE_ENABLED,
+                "running": self.running,
+                "batches": self.batches,
+                "processed": self.processed,
+                "last_batch_seconds": self.last_batch_seconds,
+            }
+
+
+def delete_exam_tickets(db: Session, exam_id: int) -> None:
+    """Tiketi ispita koji se briše (bez commit-a)"""
+    db.execute(delete(RegistrationTicket).where(RegistrationTicket.exam_id == exam_id))
+
+
+registration_queue = RegistrationQueue()
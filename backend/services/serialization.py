@@ -0,0 +1,106 @@
+# services/serialization.py
+"""
+Brza serijalizacija velikih listi
+Upit vraća samo kolone iz response šeme (Row tuple-ovi), a redovi se
+kodiraju direktno u JSON bajtove preko orjson-a - bez Pydantic validacije
+po redu. Umesto validacije, ugovor kolona <-> šema se proverava jednom,
+pri kreiranju RowSerializer-a (tj. pri importu rute): ista imena, kompatibilni
+tipovi i nullability.
+"""
+import enum
+import types
+import typing
+from typing import Optional
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from config import NDJSON_BATCH_SIZE
+
+
+class SerializationContractError(TypeError):
+    """Kolone upita ne odgovaraju response šemi"""
+
+
+def _field_type(annotation) -> tuple[type, bool]:
+    """(osnovni tip, da li je None dozvoljen) za anotaciju polja šeme"""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _column_type(column) -> type:
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None:
+        return enum_class
+    return column.type.python_type
+
+
+def check_contract(schema: type[BaseModel], columns) -> None:
+    """Proverava da kolone mogu da se serijalizuju kao `schema` bez validacije"""
+    keys = [column.key for column in columns]
+    fields = schema.model_fields
+    if sorted(keys) != sorted(fields):
+        raise SerializationContractError(
+            f"{schema.__name__}: kolone {sorted(keys)} != polja {sorted(fields)}"
+        )
+
+    for column in columns:
+        field_type, optional = _field_type(fields[column.key].annotation)
+        column_type = _column_type(column)
+        if isinstance(field_type, type) and issubclass(field_type, enum.Enum):
+            compatible = column_type is field_type
+        else:
+            # bool je podklasa int-a, ali se u JSON-u razlikuje
+            compatible = column_type is field_type or (
+                isinstance(field_type, type) and issubclass(column_type, field_type) and column_type is not bool
+            )
+        if not compatible:
+            raise SerializationContractError(
+                f"{schema.__name__}.{column.key}: kolona je {column_type.__name__}, polje {field_type}"
+            )
+        # NULL u bazi bi prošao bez validacije - default ne pomaže (UPDATE može upisati NULL),
+        # pa kolona mora biti NOT NULL ili polje Optional
+        expression = getattr(column, "expression", column)
+        nullable = getattr(expression, "nullable", True)
+        if nullable and not optional:
+            raise SerializationContractError(
+                f"{schema.__name__}.{column.key}: kolona dozvoljava NULL, a polje ne"
+            )
+
+
+class RowSerializer:
+    """Kolone jedne response šeme i njihovo kodiranje u JSON"""
+
+    def __init__(self, schema: type[BaseModel], columns):
+        check_contract(schema, columns)
+        self.schema = schema
+        self.columns = tuple(columns)
+        self.keys = tuple(column.key for column in columns)
+
+    def dumps(self, rows) -> bytes:
+        """JSON niz objekata, isti oblik kao response_model=list[schema]"""
+        keys = self.keys
+        return orjson.dumps([dict(zip(keys, row)) for row in rows])
+
+    def response(self, rows, response: Response) -> Response:
+        """Gotov JSON odgovor; headeri postavljeni na `response` (cursor, ETag) se prenose"""
+        return Response(content=self.dumps(rows), media_type="application/json", headers=dict(response.headers))
+
+    def ndjson(self, query, headers: Optional[dict] = None) -> StreamingResponse:
+        keys = self.keys
+
+        def generate():
+            # Jedan chunk po batch-u redova umesto po redu
+            lines = []
+            for row in query.yield_per(NDJSON_BATCH_SIZE):
+                lines.append(orjson.dumps(dict(zip(keys, row))))
+                if len(lines) >= NDJSON_BATCH_SIZE:
+                    yield b"\n".join(lines) + b"\n"
+                    lines = []
+            if lines:
+                yield b"\n".join(lines) + b"\n"
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
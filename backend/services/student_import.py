@@ -0,0 +1,204 @@
+# services/student_import.py
+"""
+Masovni uvoz studenata (CSV / NDJSON)
+Redovi se validiraju u batch-evima kroz StudentCreate, duplikati se traže jednim
+set-based upitom po batch-u, a upis ide preko PostgreSQL COPY-ja
+(na SQLite-u i drugim bazama - multi-row INSERT).
+"""
+import io
+import csv
+import json
+import time
+from typing import AsyncIterator, Optional
+from pydantic import ValidationError
+from sqlalchemy import select, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import Student
+from schemas import StudentCreate
+from services.table_versions import mark_tables_changed
+from config import IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS
+
+STUDENT_COLUMNS = ["name", "username", "email", "index_number", "age_of_study", "department"]
+UNIQUE_FIELDS = ("email", "username", "index_number")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Deli stream bajtova na linije bez učitavanja celog tela zahteva"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_records(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[tuple[int, object]]:
+    """
+    Vraća (broj_reda, zapis) - zapis je dict ili poruka greške (str) za neispravnu liniju.
+    CSV mora imati header; polja sa novim redom unutar navodnika nisu podržana.
+    """
+    header: Optional[list] = None
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [value.strip() for value in values]
+                continue
+            row_number += 1
+            if len(values) != len(header):
+                yield row_number, f"Očekivano {len(header)} kolona, dobijeno {len(values)}"
+                continue
+            yield row_number, {key: (value if value != "" else None) for key, value in zip(header, values)}
+        else:
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield row_number, "Neispravan JSON"
+                continue
+            if not isinstance(record, dict):
+                yield row_number, "Očekivan JSON objekat"
+                continue
+            yield row_number, record
+
+
+class StudentImporter:
+    """Stanje jednog uvoza: izveštaj i već viđene jedinstvene vrednosti iz fajla"""
+
+    def __init__(self, db: Session, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.received = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        self._seen = {field: set() for field in UNIQUE_FIELDS}
+        self._started = time.perf_counter()
+
+    def error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def process_batch(self, batch: list[tuple[int, object]]) -> None:
+        """Validacija, provera duplikata i upis jednog batch-a (jedna transakcija)"""
+        self.received += len(batch)
+        valid = []
+        for row, record in batch:
+            if isinstance(record, str):
+                self.error(row, record)
+                continue
+            try:
+                valid.append((row, StudentCreate(**record)))
+            except ValidationError as e:
+                self.error(row, "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+
+        accepted = self._drop_duplicates(valid)
+        if not accepted:
+            return
+
+        try:
+            self._load(accepted)
+        except IntegrityError:
+            # Neko je u međuvremenu upisao isti email/username/indeks - ponovi proveru
+            self.db.rollback()
+            for field in UNIQUE_FIELDS:
+                self._seen[field].difference_update(getattr(student, field) for _row, student in accepted)
+            accepted = self._drop_duplicates(accepted)
+            if not accepted:
+                return
+            try:
+                self._load(accepted)
+            except IntegrityError:
+                # Ponovni konflikt (paralelni uvoz istih podataka) - upis red po red
+                self.db.rollback()
+                accepted = self._load_rows(accepted)
+        self.imported += len(accepted)
+
+    def _drop_duplicates(self, rows: list) -> list:
+        """Jedan upit za ceo batch + duplikati unutar samog fajla"""
+        if not rows:
+            return []
+        values = {field: {getattr(student, field) for _row, student in rows} for field in UNIQUE_FIELDS}
+        existing = {field: set() for field in UNIQUE_FIELDS}
+        for found in self.db.execute(
+            select(Student.email, Student.username, Student.index_number).where(or_(
+                Student.email.in_(values["email"]),
+                Student.username.in_(values["username"]),
+                Student.index_number.in_(values["index_number"]),
+            ))
+        ):
+            for field in UNIQUE_FIELDS:
+                existing[field].add(getattr(found, field))
+
+        accepted = []
+        for row, student in rows:
+            conflict = next(
+                (field for field in UNIQUE_FIELDS
+                 if getattr(student, field) in existing[field] or getattr(student, field) in self._seen[field]),
+                None
+            )
+            if conflict:
+                self.error(row, f"{conflict} već postoji: {getattr(student, conflict)}")
+                continue
+            for field in UNIQUE_FIELDS:
+                self._seen[field].add(getattr(student, field))
+            accepted.append((row, student))
+        return accepted
+
+    def _load(self, rows: list) -> None:
+        """COPY na PostgreSQL-u, multi-row INSERT na ostalim bazama; commit batch-a"""
+        connection = self.db.connection()
+        if connection.dialect.name == "postgresql":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for _row, student in rows:
+                # Prazno polje bez navodnika je NULL u COPY CSV formatu
+                writer.writerow(["" if getattr(student, c) is None else getattr(student, c) for c in STUDENT_COLUMNS])
+            buffer.seek(0)
+            statement = f'COPY "{Student.__tablename__}" ({", ".join(STUDENT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)'
+            raw = connection.connection.driver_connection
+            try:
+                with raw.cursor() as cursor:
+                    cursor.copy_expert(statement, buffer)
+            except connection.dialect.dbapi.IntegrityError as e:
+                # COPY ide mimo SQLAlchemy-ja - greška se prevodi u isti tip kao kod INSERT-a
+                raise IntegrityError(statement, None, e)
+            # COPY ne prolazi kroz Session.execute - verzija tabele se prijavljuje ručno
+            mark_tables_changed(self.db, [Student.__tablename__])
+        else:
+            self.db.execute(insert(Student), [student.model_dump() for _row, student in rows])
+        self.db.commit()
+
+    def _load_rows(self, rows: list) -> list:
+        """Upis red po red (savepoint po redu) - red u konfliktu ide u greške, ostali se upisuju"""
+        loaded = []
+        for row, student in rows:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(Student), [student.model_dump()])
+            except IntegrityError:
+                self.error(row, "email, username ili indeks već postoji")
+                continue
+            loaded.append((row, student))
+        self.db.commit()
+        return loaded
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda e: e["row"]),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.received / elapsed, 1) if elapsed > 0 else 0.0,
+        }
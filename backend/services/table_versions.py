@@ -0,0 +1,63 @@
+# services/table_versions.py
+"""
+Verzije tabela - podižu se posle svakog commit-a koji je menjao tabelu
+Session događaji beleže tabele izmenjene kroz ORM (flush) i kroz
+insert/update/delete naredbe (Session.execute); posle commit-a se za svaku
+podiže brojač u version store-u. Upisi mimo Session-a (npr. COPY)
+prijavljuju se ručno preko mark_tables_changed.
+"""
+from typing import Iterable
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from services.version_store import version_store
+from services.read_routing import record_commit
+
+CHANGED_TABLES_KEY = "changed_tables"
+
+
+def table_key(table: str) -> str:
+    return f"table:{table}"
+
+
+def mark_tables_changed(session: Session, tables: Iterable[str]) -> None:
+    """Tabele čija se verzija podiže posle commit-a ove sesije"""
+    session.info.setdefault(CHANGED_TABLES_KEY, set()).update(tables)
+
+
+def table_versions(tables: Iterable[str]) -> dict:
+    """Trenutne verzije tabela {tabela: verzija} (bez upita ka bazi)"""
+    tables = list(tables)
+    versions = version_store.get_many(table_key(table) for table in tables)
+    return {table: versions[table_key(table)] for table in tables}
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    changed = {
+        type(instance).__tablename__
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(type(instance), "__tablename__")
+    }
+    if changed:
+        mark_tables_changed(session, changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_tables_changed(orm_execute_state.session, [orm_execute_state.statement.table.name])
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session):
+    tables = session.info.pop(CHANGED_TABLES_KEY, ())
+    for table in tables:
+        version_store.bump(table_key(table))
+    if tables:
+        # info["writer"] postavlja get_db (Authorization header zahteva)
+        record_commit(tables, session.info.get("writer"))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(CHANGED_TABLES_KEY, None)
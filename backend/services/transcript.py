@@ -0,0 +1,141 @@
+# services/transcript.py
+"""
+Održavanje materijalizovanog transkripta (Transcript_Entries + Student_Transcripts)
+Posle izmene ocene/statusa preračunavaju se samo redovi pogođenih studenata
+za pogođeni predmet, set-based upitima u istoj transakciji kao i izmena.
+Redovi studenata se prvo zaključavaju (SELECT ... FOR UPDATE, po id-ju, kao u
+prijavi ispita) - dve transakcije ne mogu istovremeno obrisati i ponovo upisati
+transkript istog studenta (npr. dva profesora ocenjuju istog studenta).
+"""
+from typing import Iterable, Optional
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.orm import Session
+from models import Exam, Subject, Professor, ExamRegistration, Student
+from models.enums import ExamStatus
+from models.transcript import StudentTranscript, TranscriptEntry
+
+
+def sync_transcript(db: Session, student_ids: Optional[Iterable[int]] = None, subject_id: Optional[int] = None) -> None:
+    """
+    Preračunava transkript za date studente i predmet.
+    None znači "svi" (koristi se za rebuild). Ne radi commit.
+    """
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        if not student_ids:
+            return
+
+    def scoped(statement, student_column, subject_column=None):
+        if student_ids is not None:
+            statement = statement.where(student_column.in_(student_ids))
+        if subject_id is not None and subject_column is not None:
+            statement = statement.where(subject_column == subject_id)
+        return statement
+
+    # Zaključavanje studenata u rastućem redosledu id-ja - bez deadlock-a između grupnih ocenjivanja
+    db.execute(scoped(select(Student.id), Student.id).order_by(Student.id).with_for_update())
+
+    # 1. Redovi po položenom predmetu
+    db.execute(scoped(delete(TranscriptEntry), TranscriptEntry.student_id, TranscriptEntry.subject_id))
+
+    # Ako postoji više "položio" prijava za isti predmet, važi poslednja
+    latest_passed = scoped(
+        select(func.max(ExamRegistration.id))
+        .join(Exam, ExamRegistration.exam_id == Exam.id)
+        .where(ExamRegistration.status == ExamStatus.polozio)
+        .group_by(ExamRegistration.student_id, Exam.subject_id),
+        ExamRegistration.student_id, Exam.subject_id
+    )
+    db.execute(
+        insert(TranscriptEntry).from_select(
+            ["student_id", "subject_id", "registration_id", "subject_name", "espb",
+             "grade", "points", "exam_date", "exam_type", "professor_name"],
+            select(
+                ExamRegistration.student_id, Subject.id, ExamRegistration.id, Subject.name, Subject.espb,
+                ExamRegistration.grade, ExamRegistration.points, Exam.date, Exam.type, Professor.name
+            )
+            .select_from(ExamRegistration)
+            .join(Exam, ExamRegistration.exam_id == Exam.id)
+            .join(Subject, Exam.subject_id == Subject.id)
+            .join(Professor, Subject.professor_id == Professor.id)
+            .where(ExamRegistration.id.in_(latest_passed))
+        )
+    )
+
+    # 2. Zbirni podaci - samo za pogođene studente
+    db.execute(scoped(delete(StudentTranscript), StudentTranscript.student_id))
+
+    passed = scoped(
+        select(
+            TranscriptEntry.student_id,
+            func.count(TranscriptEntry.id).label("passed_count"),
+            func.sum(TranscriptEntry.espb).label("total_espb"),
+            func.sum(TranscriptEntry.grade * TranscriptEntry.espb).label("weighted_grade_sum"),
+        )
+        .group_by(TranscriptEntry.student_id),
+        TranscriptEntry.student_id
+    ).subquery()
+    attempts = scoped(
+        select(
+            ExamRegistration.student_id,
+            func.count(ExamRegistration.id).label("attempts"),
+        )
+        .where(ExamRegistration.status.in_([ExamStatus.polozio, ExamStatus.pao]))
+        .group_by(ExamRegistration.student_id),
+        ExamRegistration.student_id
+    ).subquery()
+    db.execute(
+        insert(StudentTranscript).from_select(
+            ["student_id", "passed_count", "total_espb", "weighted_grade_sum", "attempts"],
+            scoped(
+                select(
+                    Student.id,
+                    func.coalesce(passed.c.passed_count, 0),
+                    func.coalesce(passed.c.total_espb, 0),
+                    func.coalesce(passed.c.weighted_grade_sum, 0),
+                    func.coalesce(attempts.c.attempts, 0),
+                )
+                .outerjoin(passed, passed.c.student_id == Student.id)
+                .outerjoin(attempts, attempts.c.student_id == Student.id),
+                Student.id
+            )
+        )
+    )
+
+
+def rebuild_transcripts(db: Session) -> None:
+    """Potpuna izgradnja transkripta za sve studente (i commit)"""
+    sync_transcript(db)
+    db.commit()
+
+
+def delete_student_transcript(db: Session, student_id: int) -> None:
+    """Briše transkript studenta (pre brisanja studenta). Ne radi commit."""
+    db.execute(delete(TranscriptEntry).where(TranscriptEntry.student_id == student_id))
+    db.execute(delete(StudentTranscript).where(StudentTranscript.student_id == student_id))
+
+
+def get_student_transcript(db: Session, student_id: int) -> dict:
+    """Transkript studenta - jedan upit po indeksiranom student_id"""
+    rows = db.execute(
+        select(StudentTranscript, TranscriptEntry)
+        .select_from(StudentTranscript)
+        .outerjoin(TranscriptEntry, TranscriptEntry.student_id == StudentTranscript.student_id)
+        .where(StudentTranscript.student_id == student_id)
+        .order_by(TranscriptEntry.exam_date.desc())
+    ).all()
+
+    if not rows:
+        return {"average_grade": None, "total_espb": 0, "passed_count": 0, "attempts": 0, "subjects": []}
+
+    summary = rows[0][0]
+    average = (
+        round(summary.weighted_grade_sum / summary.total_espb, 2) if summary.total_espb else None
+    )
+    return {
+        "average_grade": average,
+        "total_espb": summary.total_espb,
+        "passed_count": summary.passed_count,
+        "attempts": summary.attempts,
+        "subjects": [entry for _summary, entry in rows if entry is not None],
+    }
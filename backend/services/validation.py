@@ -1,28 +1,51 @@
 # services/validation.py
 """
 Validacioni servisi
+Pravila prijave su u services/eligibility.py; ovde su provera za jedan ispit
+i SQL uslovi istih pravila kohorte (za upite i EXPLAIN proveru indeksa)
 """
 from sqlalchemy.orm import Session
 from models import Student, Exam, Subject
+from services.catalog_cache import catalog_cache
+from services.eligibility import eligibility
 
 def can_student_register_for_exam(student: Student, exam: Exam, db: Session) -> tuple[bool, str]:
     """
     Provera da li student ispunjava uslove za prijavu ispita.
     Vraća (True/False, poruka)
     """
-    subject = db.query(Subject).filter(Subject.id == exam.subject_id).first()
+    catalog = catalog_cache.get(db)
+    subject = catalog.subjects.get(exam.subject_id)
+    if subject is None:
+        # Predmet još nije u kešu kataloga (novi predmet u drugom worker-u)
+        subject = db.query(Subject).filter(Subject.id == exam.subject_id).first()
     
     if not subject:
         return False, "Predmet ne postoji"
     
-    # Provera departmana
-    if subject.department and student.department:
-        if subject.department != student.department:
-            return False, f"Ovaj predmet je samo za smer '{subject.department}'. Vi ste na smeru '{student.department}'."
+    message = eligibility.registration_reason(
+        db, student, exam.id, subject, catalog_cache.eligible_for(db, student)
+    )
+    if message:
+        return False, message
+    return True, "OK"
+
+def student_subject_filters(student: Student) -> list:
+    """
+    SQL uslovi za predmete relevantne za studenta (departman i godina) -
+    ista pravila kao DepartmentRule i YearRule iz services/eligibility.py.
+    Koriste se i u db.query(...).filter(*uslovi) i u select(...).where(*uslovi).
+    """
+    filters = []
     
-    # Provera godine studija
-    if subject.year:
-        if student.age_of_study < subject.year:
-            return False, f"Ovaj predmet je za {subject.year}. godinu studija. Vi ste na {student.age_of_study}. godini."
+    # Filtriraj po departmanu ako student ima definisan departman
+    if student.department:
+        filters.append(
+            (Subject.department == student.department) | (Subject.department == None)
+        )
     
-    return True, "OK"
\ No newline at end of file
+    # Filtriraj po godini - student vidi samo predmete svoje ili nižih godina
+    filters.append(
+        (Subject.year <= student.age_of_study) | (Subject.year == None)
+    )
+    return filters
@@ -0,0 +1,92 @@
+# services/version_store.py
+"""
+Brojači verzija za invalidaciju keševa
+MemoryVersionStore važi za jedan proces (development, testovi, jedan worker).
+Sa više uvicorn worker-a treba postaviti CACHE_REDIS_URL, da bi se svi
+worker-i slagali oko verzije (potreban je paket `redis`).
+`shared` kaže da li verzije važe za sve procese aplikacije: memorija procesa
+samo uz SINGLE_PROCESS=true. Keševi bez zajedničkih verzija imaju rok trajanja.
+"""
+import time
+import uuid
+import threading
+from config import CACHE_REDIS_URL, SINGLE_PROCESS
+
+# Verzija kataloga (services/catalog_cache.py) - podižu je i izmene grafa preduslova
+CATALOG_VERSION_KEY = "catalog"
+
+
+class MemoryVersionStore:
+    """Verzije u memoriji procesa"""
+
+    shared = SINGLE_PROCESS
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._markers: dict[str, float] = {}
+        # Brojači kreću od nule pri svakom startu - epoha razlikuje verzije dva procesa
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def get(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def get_many(self, keys) -> dict:
+        return {key: self._versions.get(key, 0) for key in keys}
+
+    def bump(self, key: str) -> int:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+
+    # Markeri sa rokom trajanja (read-your-writes, skorašnje izmene tabela)
+    def set_marker(self, key: str, seconds: float) -> None:
+        now = time.monotonic()
+        if len(self._markers) > 10000:
+            # Istekli markeri se čiste povremeno, da rečnik ne raste sa brojem tokena
+            self._markers = {k: expires for k, expires in self._markers.items() if expires > now}
+        self._markers[key] = now + seconds
+
+    def has_marker(self, *keys) -> bool:
+        now = time.monotonic()
+        return any(self._markers.get(key, 0) > now for key in keys)
+
+
+class RedisVersionStore:
+    """Verzije u Redis-u - zajedničke za sve worker-e i instance"""
+
+    PREFIX = "school:version:"
+    epoch = ""
+    shared = True
+
+    def __init__(self, url: str):
+        import redis  # opciona zavisnost - samo kada je CACHE_REDIS_URL postavljen
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> int:
+        return int(self._redis.get(self.PREFIX + key) or 0)
+
+    def get_many(self, keys) -> dict:
+        keys = list(keys)
+        found = self._redis.mget([self.PREFIX + key for key in keys])
+        return {key: int(value or 0) for key, value in zip(keys, found)}
+
+    def bump(self, key: str) -> int:
+        return int(self._redis.incr(self.PREFIX + key))
+
+    def set_marker(self, key: str, seconds: float) -> None:
+        self._redis.set(self.PREFIX + "marker:" + key, 1, px=max(int(seconds * 1000), 1))
+
+    def has_marker(self, *keys) -> bool:
+        return bool(self._redis.exists(*(self.PREFIX + "marker:" + key for key in keys)))
+
+
+def create_version_store():
+    """Redis ako je konfigurisan, inače memorija procesa"""
+    if CACHE_REDIS_URL:
+        return RedisVersionStore(CACHE_REDIS_URL)
+    return MemoryVersionStore()
+
+
+version_store = create_version_store()